@@ -0,0 +1,380 @@
+"""Benchmark the MineMonitor coordinator and sensors against the stub server.
+
+Starts benchmarks/stub_server.py in-process, sets up a coordinator and the
+sensor platform on a bare Home Assistant instance, and runs a number of
+refresh cycles. Every endpoint is refreshed on every cycle. Reported per
+cycle:
+
+    wall     refresh wall time, from the first request to the last listener
+    blocked  total time the event loop was late by more than the lag threshold
+    max lag  longest single delay of the event loop
+    writes   entity state writes caused by the refresh
+    failed   endpoints whose request failed
+
+Memory is reported as the peak RSS of the process, and with --tracemalloc
+as the Python allocations made by the setup and the refresh cycles
+(tracemalloc slows everything down, don't compare its wall times).
+
+Requires Home Assistant, run it from the repository root:
+
+    python benchmarks/bench_coordinator.py --addresses 500 --workers 50
+    python benchmarks/bench_coordinator.py --latency 50 --error-rate 0.02 --no-batch
+    python benchmarks/bench_coordinator.py --static --json  # unchanged payloads
+    python benchmarks/bench_coordinator.py --no-batch --workers 2000 --offload thread
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.minemonitor import (  # noqa: E402
+    CONF_ADAPTIVE_POLLING,
+    CONF_BTC_ADDRESSES,
+    CONF_MAX_CONCURRENCY,
+    CONF_OFFLOAD_MODE,
+    CONF_OFFLOAD_THRESHOLD,
+    CONF_STATISTICS_WINDOW,
+    CONF_WORKER_STATISTICS,
+    DEFAULT_OFFLOAD_THRESHOLD,
+    DOMAIN,
+    OFFLOAD_MODES,
+    BitcoinMiningUpdateCoordinator,
+    async_get_pool_host,
+)
+from custom_components.minemonitor import sensor  # noqa: E402
+from stub_server import create_app  # noqa: E402
+
+# Interval of the event loop lag monitor and the lag counted as blocking
+LAG_INTERVAL = 0.005
+LAG_THRESHOLD = 0.01
+
+
+class BenchEntry:
+    """Config entry stand-in with what the sensor platform uses."""
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        """Initialize the entry."""
+        self.entry_id = "benchmark"
+        self.data = data
+        self.options: Dict[str, Any] = {}
+        self._on_unload: List[Callable[[], Any]] = []
+
+    def async_on_unload(self, func: Callable[[], Any]) -> None:
+        """Remember a function to call when the benchmark ends."""
+        self._on_unload.append(func)
+
+    def async_unload(self) -> None:
+        """Call the unload functions."""
+        while self._on_unload:
+            self._on_unload.pop()()
+
+
+class LoopMonitor:
+    """Measure how late the event loop runs a task that sleeps in short steps."""
+
+    def __init__(self) -> None:
+        """Initialize the monitor."""
+        self.blocked = 0.0
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start measuring, resetting the counters."""
+        self.blocked = 0.0
+        self.max_lag = 0.0
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop measuring."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + LAG_INTERVAL
+            await asyncio.sleep(LAG_INTERVAL)
+            lag = time.perf_counter() - expected
+            self.max_lag = max(self.max_lag, lag)
+            if lag > LAG_THRESHOLD:
+                self.blocked += lag
+
+
+def make_hass(config_dir: str) -> HomeAssistant:
+    """Create a bare Home Assistant instance."""
+    try:
+        hass = HomeAssistant(config_dir)
+    except TypeError:
+        # Before 2024.2 the config directory was set afterwards
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+    hass.data.setdefault(DOMAIN, {})
+    return hass
+
+
+async def async_add_sensors(
+    hass: HomeAssistant, entry: BenchEntry, entities: List[Any], writes: List[int]
+) -> None:
+    """Set up the sensor platform, counting the state writes of its entities."""
+
+    def add_entities(new_entities, update_before_add: bool = False) -> None:
+        for entity in new_entities:
+            entity.hass = hass
+            entity.entity_id = f"sensor.benchmark_{len(entities)}"
+
+            def write_state() -> None:
+                writes[0] += 1
+
+            entity.async_write_ha_state = write_state
+            entities.append(entity)
+            hass.async_create_task(entity.async_added_to_hass())
+
+    await sensor.async_setup_entry(hass, entry, add_entities)
+    await hass.async_block_till_done()
+
+
+async def async_run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the benchmark and return the results."""
+    app = create_app(
+        args.workers, not args.no_batch, args.latency / 1000, args.error_rate, not args.static
+    )
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    addresses = [f"bc1qbenchmark{index:06d}" for index in range(args.addresses)]
+    config_dir = tempfile.mkdtemp(prefix="minemonitor-bench-")
+    hass = make_hass(config_dir)
+    entry = BenchEntry(
+        {
+            CONF_HOST: "127.0.0.1",
+            CONF_PORT: port,
+            CONF_BTC_ADDRESSES: addresses,
+            CONF_SCAN_INTERVAL: args.scan_interval,
+            CONF_MAX_CONCURRENCY: args.max_concurrency,
+            CONF_ADAPTIVE_POLLING: False,
+            CONF_WORKER_STATISTICS: args.statistics,
+            CONF_STATISTICS_WINDOW: args.statistics_window,
+            CONF_OFFLOAD_MODE: args.offload,
+            CONF_OFFLOAD_THRESHOLD: args.offload_threshold,
+        }
+    )
+    monitor = LoopMonitor()
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    pool_host = async_get_pool_host(hass, "127.0.0.1", port, args.max_concurrency)
+    coordinator = BitcoinMiningUpdateCoordinator(
+        hass,
+        entry.data,
+        entry_id=entry.entry_id,
+        pool_host=pool_host,
+    )
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+
+    entities: List[Any] = []
+    writes = [0]
+    cycles = []
+    try:
+        monitor.start()
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            raise RuntimeError("The first refresh failed, is the stub server reachable?")
+        await async_add_sensors(hass, entry, entities, writes)
+        setup = {
+            "wall_s": time.perf_counter() - start,
+            "blocked_s": monitor.blocked,
+            "max_lag_s": monitor.max_lag,
+            "entities": len(entities),
+        }
+        await monitor.stop()
+
+        for _ in range(args.cycles):
+            for schedule in coordinator.schedules.values():
+                schedule.reset()
+            writes[0] = 0
+            monitor.start()
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            # Let the dispatched tasks, like new entities, run
+            await hass.async_block_till_done()
+            wall = time.perf_counter() - start
+            await monitor.stop()
+            cycles.append(
+                {
+                    "wall_s": wall,
+                    "blocked_s": monitor.blocked,
+                    "max_lag_s": monitor.max_lag,
+                    "writes": writes[0],
+                    "loop_time_s": coordinator.loop_time,
+                    "offload_time_s": coordinator.offload_time,
+                    "success": coordinator.last_update_success,
+                    "failed": sum(
+                        changed is None for changed in coordinator.last_fetched.values()
+                    ),
+                }
+            )
+            if args.interval:
+                await asyncio.sleep(args.interval)
+
+        memory = {"peak_rss_mb": _peak_rss_mb()}
+        if args.tracemalloc:
+            current, peak = tracemalloc.get_traced_memory()
+            memory.update(traced_mb=current / 2**20, traced_peak_mb=peak / 2**20)
+    finally:
+        await monitor.stop()
+        if args.tracemalloc:
+            tracemalloc.stop()
+        entry.async_unload()
+        for entity in entities:
+            await entity.async_will_remove_from_hass()
+        await coordinator.async_shutdown()
+        await pool_host.async_close()
+        await hass.async_stop(force=True)
+        await runner.cleanup()
+
+    return {
+        "parameters": {
+            "addresses": args.addresses,
+            "workers": args.workers,
+            "batch": not args.no_batch,
+            "latency_ms": args.latency,
+            "error_rate": args.error_rate,
+            "static": args.static,
+            "max_concurrency": args.max_concurrency,
+            "statistics": args.statistics,
+            "offload": args.offload,
+            "offload_threshold_kib": args.offload_threshold,
+        },
+        "setup": setup,
+        "cycles": cycles,
+        "memory": memory,
+    }
+
+
+def _peak_rss_mb() -> float:
+    """Return the peak resident memory of the process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def summarize(results: Dict[str, Any]) -> str:
+    """Return a human readable summary of the results."""
+    params = results["parameters"]
+    setup = results["setup"]
+    cycles = results["cycles"]
+    lines = [
+        f"{params['addresses']} addresses x {params['workers']} workers, "
+        f"{'bulk' if params['batch'] else 'per-address'} endpoint, "
+        f"{params['latency_ms']:g} ms latency, {params['error_rate']:.0%} errors"
+        f"{', static payloads' if params['static'] else ''}, "
+        f"offload {params['offload']}",
+        f"setup: {setup['wall_s'] * 1000:.0f} ms, {setup['entities']} entities, "
+        f"{setup['blocked_s'] * 1000:.0f} ms blocked",
+    ]
+    if cycles:
+        lines.append(f"{'':8}{'mean':>10}{'median':>10}{'max':>10}")
+        for key, label, scale in (
+            ("wall_s", "wall ms", 1000),
+            ("blocked_s", "blocked ms", 1000),
+            ("max_lag_s", "max lag ms", 1000),
+            ("loop_time_s", "loop ms", 1000),
+            ("offload_time_s", "offload ms", 1000),
+            ("writes", "writes", 1),
+            ("failed", "failed", 1),
+        ):
+            values = [cycle[key] * scale for cycle in cycles]
+            lines.append(
+                f"{label:<10}{statistics.mean(values):>8.1f}"
+                f"{statistics.median(values):>10.1f}{max(values):>10.1f}"
+            )
+        failed = sum(not cycle["success"] for cycle in cycles)
+        if failed:
+            lines.append(f"{failed} of {len(cycles)} refreshes failed")
+    memory = results["memory"]
+    line = f"peak RSS: {memory['peak_rss_mb']:.1f} MiB"
+    if "traced_mb" in memory:
+        line += (
+            f", traced: {memory['traced_mb']:.1f} MiB "
+            f"(peak {memory['traced_peak_mb']:.1f} MiB)"
+        )
+    lines.append(line)
+    return "\n".join(lines)
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--addresses", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=5, help="workers per address")
+    parser.add_argument("--cycles", type=int, default=10, help="refresh cycles")
+    parser.add_argument(
+        "--interval", type=float, default=0, help="seconds to wait between cycles"
+    )
+    parser.add_argument("--latency", type=float, default=0, help="latency in ms")
+    parser.add_argument(
+        "--error-rate", type=float, default=0, help="fraction of requests that fail"
+    )
+    parser.add_argument(
+        "--static", action="store_true", help="serve the same data on every request"
+    )
+    parser.add_argument(
+        "--no-batch", action="store_true", help="don't serve the bulk clients endpoint"
+    )
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--scan-interval", type=int, default=60)
+    parser.add_argument(
+        "--statistics", action="store_true", help="enable the worker statistics"
+    )
+    parser.add_argument("--statistics-window", type=int, default=60, help="minutes")
+    parser.add_argument("--offload", choices=OFFLOAD_MODES, default=OFFLOAD_MODES[0])
+    parser.add_argument(
+        "--offload-threshold", type=int, default=DEFAULT_OFFLOAD_THRESHOLD, help="KiB"
+    )
+    parser.add_argument(
+        "--tracemalloc", action="store_true", help="trace the Python allocations"
+    )
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    args = parse_args()
+    # The errors logged for failing requests would drown the results, they
+    # are counted in the results instead
+    logging.basicConfig(level=logging.ERROR)
+    logging.getLogger("custom_components.minemonitor").setLevel(logging.CRITICAL)
+    results = asyncio.run(async_run(args))
+    print(json.dumps(results, indent=2) if args.json else summarize(results))
+
+
+if __name__ == "__main__":
+    main()
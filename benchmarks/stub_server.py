@@ -0,0 +1,151 @@
+"""Local stub of a public-pool API server for exercising MineMonitor.
+
+Serves synthetic data for any BTC address on the endpoints used by the
+integration, plus the optional bulk clients endpoint:
+
+    GET /api/client/{address}
+    GET /api/clients?addresses=addr1,addr2,...
+    GET /api/network
+    GET /api/info
+
+Run it and point the integration at the printed host and port:
+
+    python benchmarks/stub_server.py --port 3334 --workers 4
+    python benchmarks/stub_server.py --no-batch  # per-address endpoint only
+    python benchmarks/stub_server.py --latency 50 --error-rate 0.05
+
+The latency and error rate apply to every request. With --static the
+hashrates don't change between requests, like an idle pool.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from typing import Any, Dict
+
+from aiohttp import web
+
+
+def client_payload(address: str, workers: int, jitter: bool = True) -> Dict[str, Any]:
+    """Return the client payload of an address, with jittered hashrates."""
+    rng = random.Random(zlib.crc32(address.encode()))
+    now = (
+        time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+        if jitter
+        else "2024-01-01T00:00:00.000Z"
+    )
+    worker_list = []
+    for index in range(workers):
+        base_hashrate = rng.uniform(0.4e12, 1.2e12)
+        worker_list.append(
+            {
+                "sessionId": f"{rng.getrandbits(32):08x}",
+                "name": f"worker{index + 1}",
+                "bestDifficulty": f"{rng.uniform(1e5, 1e9):.2f}",
+                "hashRate": base_hashrate * (random.uniform(0.9, 1.1) if jitter else 1),
+                "startTime": "2024-01-01T00:00:00.000Z",
+                "lastSeen": now,
+            }
+        )
+    return {
+        "bestDifficulty": max(
+            (float(worker["bestDifficulty"]) for worker in worker_list), default=0
+        ),
+        "workersCount": workers,
+        "workers": worker_list,
+    }
+
+
+def create_app(
+    workers: int,
+    batch: bool = True,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    jitter: bool = True,
+) -> web.Application:
+    """Create the stub application.
+
+    latency is in seconds, error_rate is the fraction of requests answered
+    with a 500 error.
+    """
+
+    @web.middleware
+    async def conditions(request: web.Request, handler) -> web.StreamResponse:
+        if latency:
+            await asyncio.sleep(latency)
+        if error_rate and random.random() < error_rate:
+            raise web.HTTPInternalServerError()
+        return await handler(request)
+
+    async def client(request: web.Request) -> web.Response:
+        return web.json_response(
+            client_payload(request.match_info["address"], workers, jitter)
+        )
+
+    async def clients(request: web.Request) -> web.Response:
+        addresses = [
+            addr for addr in request.query.get("addresses", "").split(",") if addr
+        ]
+        return web.json_response(
+            {addr: client_payload(addr, workers, jitter) for addr in addresses}
+        )
+
+    async def network(request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "blocks": 850000 + int(time.time() // 600) % 1000,
+                "difficulty": 83148355189239.77,
+                "networkhashps": 6.1e20,
+                "pooledtx": random.randint(1000, 5000) if jitter else 3000,
+            }
+        )
+
+    async def info(request: web.Request) -> web.Response:
+        return web.json_response(
+            {"highScores": [{"bestDifficulty": 4.2e12, "updatedAt": "2024-01-01"}]}
+        )
+
+    app = web.Application(middlewares=[conditions])
+    app.router.add_get("/api/client/{address}", client)
+    if batch:
+        app.router.add_get("/api/clients", clients)
+    app.router.add_get("/api/network", network)
+    app.router.add_get("/api/info", info)
+    return app
+
+
+def main() -> None:
+    """Parse the arguments and run the server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3334)
+    parser.add_argument("--workers", type=int, default=2, help="workers per address")
+    parser.add_argument(
+        "--no-batch", action="store_true", help="don't serve the bulk clients endpoint"
+    )
+    parser.add_argument("--latency", type=float, default=0, help="latency in ms")
+    parser.add_argument(
+        "--error-rate", type=float, default=0, help="fraction of requests that fail"
+    )
+    parser.add_argument(
+        "--static", action="store_true", help="serve the same data on every request"
+    )
+    args = parser.parse_args()
+    web.run_app(
+        create_app(
+            args.workers,
+            not args.no_batch,
+            args.latency / 1000,
+            args.error_rate,
+            not args.static,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
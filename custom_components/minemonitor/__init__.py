@@ -2,12 +2,23 @@
 MineMonitor integration for Home Assistant.
 """
 import asyncio
+import hashlib
 import logging
+import math
+import multiprocessing
+import time
 import aiohttp
 import async_timeout
 import voluptuous as vol
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from aiohttp.hdrs import USER_AGENT
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -15,20 +26,59 @@ from homeassistant.const import (
     CONF_PORT,
     CONF_SCAN_INTERVAL,
     CONF_RESOURCES,
+    EVENT_HOMEASSISTANT_CLOSE,
+    EVENT_HOMEASSISTANT_STOP,
     Platform
 )
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.auth.permissions.const import POLICY_CONTROL
+from homeassistant.exceptions import (
+    ConfigEntryNotReady,
+    HomeAssistantError,
+    Unauthorized,
+    UnknownUser,
+)
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
     UpdateFailed,
 )
+import homeassistant.util.dt as dt_util
+from homeassistant.util import ssl as ssl_util
+from homeassistant.util.json import json_loads
+
+from .address import is_valid_btc_address
+from .history import HashrateHistory, worker_series
+from .host import PoolHost
+from .models import (
+    AddressTotals,
+    AggregateSnapshot,
+    EndpointMetrics,
+    EndpointStatus,
+    FetchResult,
+    FetchTiming,
+    PollSchedule,
+    WORKER_RECORD_FIELDS,
+    WorkerDelta,
+    WorkerRecord,
+)
+from .parser import ClientPayloadParser, decode_body, project_client
+from .stats import RollingStats
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,10 +86,201 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = "minemonitor"
 DEFAULT_PORT = 3334
 DEFAULT_SCAN_INTERVAL = 60  # seconds
+DEFAULT_NETWORK_SCAN_INTERVAL = 60  # seconds
+DEFAULT_INFO_SCAN_INTERVAL = 300  # seconds
+DEFAULT_ADAPTIVE_POLLING = True
+# Unchanged endpoints back off to at most this multiple of their interval
+MAX_POLL_BACKOFF = 8
+# Entries refreshed at once by the refresh_data service
+REFRESH_CONCURRENCY = 4
+# Manual refreshes of an entry within this time return the previous result
+MANUAL_REFRESH_COOLDOWN = 5  # seconds
+# Hashrate history kept in memory, and its averaging windows in seconds
+HISTORY_HOURS = 24
+HISTORY_WINDOWS = {"1h": 3600, "24h": 86400}
+# Shortest interval between two history samples, bounds its memory
+HISTORY_SAMPLE_INTERVAL = 60  # seconds
+HISTORY_STORAGE_VERSION = 1
+# Last good payload of every endpoint, restored at startup
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 300  # seconds
+DEFAULT_WORKER_STATISTICS = False
+DEFAULT_STATISTICS_WINDOW = 60  # minutes
+# Time constant of the smoothed (EMA) worker hashrate
+EMA_TIME_CONSTANT = 900  # seconds
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_REQUEST_TIMEOUT = 10  # seconds
+DEFAULT_STALE_TIMEOUT = 600  # seconds
+DEFAULT_WORKER_REMOVAL_GRACE = 24  # hours
+DEFAULT_HASHRATE_TOLERANCE = 0.0  # percent
+# Workers not seen by the pool for this long are in the warning state, then offline
+DEFAULT_WORKER_WARNING_AFTER = 10  # minutes
+DEFAULT_WORKER_OFFLINE_AFTER = 30  # minutes
+WORKER_ONLINE = "online"
+WORKER_WARNING = "warning"
+WORKER_OFFLINE = "offline"
+WORKER_STATES = (WORKER_ONLINE, WORKER_WARNING, WORKER_OFFLINE)
+# Worker fields reported by public-pool, added as attributes of worker sensors
+DEFAULT_WORKER_ATTRIBUTES = [
+    "name",
+    "sessionId",
+    "bestDifficulty",
+    "hashRate",
+    "startTime",
+    "lastSeen",
+]
+# Worker fields that change on every poll, they don't cause a state write by themselves
+VOLATILE_WORKER_ATTRIBUTES = frozenset({"hashRate", "lastSeen"})
+DEFAULT_ATTRIBUTES_ON_HASHRATE_ONLY = True
+# hass.data key of the resources shared per mining server
+DATA_POOL_HOSTS = f"{DOMAIN}_pool_hosts"
+# How long the session of a server stays open after its last user left
+POOL_HOST_LINGER = 60  # seconds
 CONF_BTC_ADDRESSES = "btc_addresses"
+CONF_NETWORK_SCAN_INTERVAL = "network_scan_interval"
+CONF_INFO_SCAN_INTERVAL = "info_scan_interval"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_STALE_TIMEOUT = "stale_timeout"
+CONF_WORKER_REMOVAL_GRACE = "worker_removal_grace"
+CONF_HASHRATE_TOLERANCE = "hashrate_tolerance"
+CONF_WORKER_ATTRIBUTES = "worker_attributes"
+CONF_ATTRIBUTES_ON_HASHRATE_ONLY = "attributes_on_hashrate_only"
+CONF_WORKER_STATISTICS = "worker_statistics"
+CONF_STATISTICS_WINDOW = "statistics_window"
+CONF_WORKER_WARNING_AFTER = "worker_warning_after"
+CONF_WORKER_OFFLINE_AFTER = "worker_offline_after"
+CONF_OFFLOAD_MODE = "offload_mode"
+CONF_OFFLOAD_THRESHOLD = "offload_threshold"
+
+# Endpoint keys used to track the result of each request
+ENDPOINT_NETWORK = "network"
+ENDPOINT_INFO = "info"
+# Optional bulk endpoint returning the clients of several addresses at once
+ENDPOINT_CLIENTS = "clients"
+CLIENT_BATCH_SIZE = 50
+# How long to wait before probing a server without bulk endpoint again
+BATCH_REPROBE_INTERVAL = timedelta(hours=6)
+# Client bodies larger than this are hashed as they are received, and only
+# decoded, chunk by chunk, when they changed
+STREAM_THRESHOLD = 64 * 1024  # bytes
+STREAM_CHUNK_SIZE = 16 * 1024  # bytes
+# Statuses of a server that doesn't implement an endpoint
+UNSUPPORTED_STATUSES = (404, 405, 501)
+# Where large client bodies are decoded: on the event loop, in the executor
+# threads of Home Assistant or in a separate process
+OFFLOAD_OFF = "off"
+OFFLOAD_THREAD = "thread"
+OFFLOAD_PROCESS = "process"
+OFFLOAD_MODES = [OFFLOAD_OFF, OFFLOAD_THREAD, OFFLOAD_PROCESS]
+DEFAULT_OFFLOAD_MODE = OFFLOAD_OFF
+# Client bodies of at least this size are offloaded
+DEFAULT_OFFLOAD_THRESHOLD = 256  # KiB
+# hass.data key of the process pool shared by all entries
+DATA_PROCESS_POOL = f"{DOMAIN}_process_pool"
+
+
+class EndpointNotSupported(UpdateFailed):
+    """Error to indicate the server doesn't implement an endpoint."""
+
+
+def signal_workers_changed(entry_id: str) -> str:
+    """Return the dispatcher signal sent with the WorkerDelta of an entry."""
+    return f"{DOMAIN}_workers_changed_{entry_id}"
+
+
+def signal_metrics_updated(entry_id: str) -> str:
+    """Return the dispatcher signal sent after every update of an entry."""
+    return f"{DOMAIN}_metrics_updated_{entry_id}"
+
+
+def _parse_last_seen(last_seen: Any) -> Optional[datetime]:
+    """Return the time a worker was last seen, None if unknown or unreadable."""
+    if not isinstance(last_seen, str):
+        return None
+    try:
+        parsed = dt_util.parse_datetime(last_seen)
+    except ValueError:
+        return None
+    if parsed is not None and parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.UTC)
+    return parsed
+
+
+def client_endpoint(btc_address: str) -> str:
+    """Return the endpoint key for the client data of a BTC address."""
+    return f"client/{btc_address}"
+
+
+def parse_max_age(cache_control: Optional[str]) -> Optional[float]:
+    """Return the max-age of a Cache-Control header, if any."""
+    if not cache_control:
+        return None
+    for directive in cache_control.split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-age":
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+def build_worker_index(
+    clients: Dict[str, Dict[str, Any]]
+) -> Dict[Tuple[str, str], WorkerRecord]:
+    """Index the workers of every address by (address, worker key).
+
+    The worker key is the worker name, which stays stable when the pool
+    reorders or drops workers. Unnamed workers, and workers sharing the name
+    of one already indexed, are keyed by their sessionId instead.
+    """
+    index: Dict[Tuple[str, str], WorkerRecord] = {}
+    for btc_address, client_data in clients.items():
+        for worker in client_data.get("workers", []):
+            key = worker.name
+            if not key or (btc_address, key) in index:
+                key = worker.session_id
+            if key:
+                index[(btc_address, str(key))] = worker
+    return index
+
+
+def build_aggregates(
+    clients: Dict[str, Dict[str, Any]], network: Dict[str, Any]
+) -> AggregateSnapshot:
+    """Compute the hashrate totals and worker counts of all addresses."""
+    snapshot = AggregateSnapshot()
+    for btc_address, client_data in clients.items():
+        totals = AddressTotals()
+        for worker in client_data.get("workers", []):
+            totals.total_workers += 1
+            worker_hashrate = worker.hashrate
+            if worker_hashrate is None:
+                continue
+            totals.hashrate += worker_hashrate
+            # Consider a worker active if it has a non-zero hashrate
+            if worker_hashrate > 0:
+                totals.active_workers += 1
+        
+        snapshot.addresses[btc_address] = totals
+        snapshot.hashrate += totals.hashrate
+        snapshot.active_workers += totals.active_workers
+        snapshot.total_workers += totals.total_workers
+    
+    # Calculate network share if network hashrate is available
+    try:
+        network_hashrate = float(network["networkhashps"])
+    except (KeyError, ValueError, TypeError):
+        network_hashrate = 0.0
+    if network_hashrate > 0:
+        snapshot.network_share = (snapshot.hashrate / network_hashrate) * 100
+    
+    return snapshot
 
 # Supported sensor platforms
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
 
 # Configuration schema
 CONFIG_SCHEMA = vol.Schema(
@@ -52,116 +293,204 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(
                     CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
                 ): cv.positive_int,
+                vol.Optional(
+                    CONF_NETWORK_SCAN_INTERVAL, default=DEFAULT_NETWORK_SCAN_INTERVAL
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_INFO_SCAN_INTERVAL, default=DEFAULT_INFO_SCAN_INTERVAL
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_ADAPTIVE_POLLING, default=DEFAULT_ADAPTIVE_POLLING
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_REQUEST_TIMEOUT, default=DEFAULT_REQUEST_TIMEOUT
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_STALE_TIMEOUT, default=DEFAULT_STALE_TIMEOUT
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_WORKER_REMOVAL_GRACE, default=DEFAULT_WORKER_REMOVAL_GRACE
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_HASHRATE_TOLERANCE, default=DEFAULT_HASHRATE_TOLERANCE
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_WORKER_ATTRIBUTES, default=DEFAULT_WORKER_ATTRIBUTES
+                ): vol.All(cv.ensure_list, [cv.string]),
+                vol.Optional(
+                    CONF_ATTRIBUTES_ON_HASHRATE_ONLY,
+                    default=DEFAULT_ATTRIBUTES_ON_HASHRATE_ONLY,
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_WORKER_STATISTICS, default=DEFAULT_WORKER_STATISTICS
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_STATISTICS_WINDOW, default=DEFAULT_STATISTICS_WINDOW
+                ): vol.All(cv.positive_int, vol.Range(max=HISTORY_HOURS * 60)),
             }
         )
     },
     extra=vol.ALLOW_EXTRA,
 )
 
+async def async_check_admin(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Raise if a service call was made by a user who isn't an admin.
+
+    Same check as async_register_admin_service, for services that need
+    hass.services.async_register to return a response.
+    """
+    if not call.context.user_id:
+        return
+    user = await hass.auth.async_get_user(call.context.user_id)
+    if user is None:
+        raise UnknownUser(
+            context=call.context,
+            permission=POLICY_CONTROL,
+            user_id=call.context.user_id,
+        )
+    if not user.is_admin:
+        raise Unauthorized(context=call.context)
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Bitcoin Mining component."""
     hass.data.setdefault(DOMAIN, {})
     
     # Register services
-    async def refresh_data_service(call: ServiceCall) -> None:
-        """Service to force an immediate update of the data."""
+    async def refresh_data_service(call: ServiceCall) -> ServiceResponse:
+        """Service to force an immediate update of the data.
+
+        Entries are refreshed concurrently, a few at a time, and the response
+        reports the result of each of them.
+        """
+        # Only admins may make every entry poll the server
+        await async_check_admin(hass, call)
         config_entry_id = call.data.get("config_entry_id")
         
         if config_entry_id:
-            if config_entry_id in hass.data[DOMAIN]:
-                coordinator = hass.data[DOMAIN][config_entry_id]
-                await coordinator.async_refresh()
-                _LOGGER.debug("Manually refreshed data for entry %s", config_entry_id)
-            else:
-                _LOGGER.error("Config entry ID %s not found", config_entry_id)
+            if config_entry_id not in hass.data[DOMAIN]:
+                raise HomeAssistantError(f"Config entry ID {config_entry_id} not found")
+            coordinators = {config_entry_id: hass.data[DOMAIN][config_entry_id]}
         else:
             # Refresh all entries
-            for entry_id, coordinator in hass.data[DOMAIN].items():
-                await coordinator.async_refresh()
-            _LOGGER.debug("Manually refreshed data for all entries")
+            coordinators = dict(hass.data[DOMAIN])
+        
+        semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+        
+        async def refresh(coordinator: BitcoinMiningUpdateCoordinator) -> Dict[str, Any]:
+            async with semaphore:
+                return await coordinator.async_refresh_all()
+        
+        results = dict(zip(coordinators, await asyncio.gather(
+            *(refresh(coordinator) for coordinator in coordinators.values())
+        )))
+        _LOGGER.debug("Manually refreshed data for entries %s", ", ".join(results))
+        
+        if call.return_response:
+            return {"entries": results}
+        return None
+    
+    def _get_entry_coordinator(config_entry_id: str):
+        """Return the config entry and coordinator of a service call."""
+        entry = hass.config_entries.async_get_entry(config_entry_id)
+        if entry is None or config_entry_id not in hass.data[DOMAIN]:
+            raise HomeAssistantError(f"Config entry ID {config_entry_id} not found")
+        return entry, hass.data[DOMAIN][config_entry_id]
     
     async def add_btc_address_service(call: ServiceCall) -> None:
-        """Service to add a new Bitcoin address to monitor."""
+        """Service to add one or more Bitcoin addresses to monitor."""
         config_entry_id = call.data["config_entry_id"]
-        btc_address = call.data["btc_address"]
+        entry, coordinator = _get_entry_coordinator(config_entry_id)
         
-        if config_entry_id not in hass.data[DOMAIN]:
-            _LOGGER.error("Config entry ID %s not found", config_entry_id)
-            return
-            
-        entry = hass.config_entries.async_get_entry(config_entry_id)
-        if not entry:
-            _LOGGER.error("Config entry ID %s not found", config_entry_id)
+        invalid = [addr for addr in call.data["btc_address"] if not is_valid_btc_address(addr)]
+        if invalid:
+            raise HomeAssistantError(f"Invalid Bitcoin addresses: {', '.join(invalid)}")
+        
+        current_addresses = list(coordinator.btc_addresses)
+        new_addresses = []
+        for btc_address in call.data["btc_address"]:
+            # Check if address already exists
+            if btc_address in current_addresses or btc_address in new_addresses:
+                _LOGGER.warning("Bitcoin address %s already exists", btc_address)
+                continue
+            new_addresses.append(btc_address)
+        if not new_addresses:
             return
-            
-        # Get current addresses
-        current_addresses = list(entry.data.get(CONF_BTC_ADDRESSES, []))
         
-        # Check if address already exists
-        if btc_address in current_addresses:
-            _LOGGER.warning("Bitcoin address %s already exists", btc_address)
+        # Apply the addresses to the running coordinator, then store them;
+        # the update listener finds nothing left to change and doesn't reload
+        addresses = current_addresses + new_addresses
+        await coordinator.async_set_addresses(addresses)
+        async_update_addresses(hass, entry, addresses)
+        _LOGGER.info("Added Bitcoin addresses %s to entry %s",
+                     ", ".join(new_addresses), config_entry_id)
+    
+    async def remove_btc_address_service(call: ServiceCall) -> None:
+        """Service to remove one or more Bitcoin addresses from monitoring."""
+        config_entry_id = call.data["config_entry_id"]
+        entry, coordinator = _get_entry_coordinator(config_entry_id)
+        
+        removed = []
+        for btc_address in call.data["btc_address"]:
+            # Check if address exists
+            if btc_address not in coordinator.btc_addresses:
+                _LOGGER.warning("Bitcoin address %s does not exist in entry %s",
+                                btc_address, config_entry_id)
+                continue
+            removed.append(btc_address)
+        if not removed:
             return
-            
-        # Add new address
-        current_addresses.append(btc_address)
         
-        # Update config entry
-        new_data = dict(entry.data)
-        new_data[CONF_BTC_ADDRESSES] = current_addresses
-        hass.config_entries.async_update_entry(entry, data=new_data)
+        addresses = [addr for addr in coordinator.btc_addresses if addr not in removed]
+        # Ensure we have at least one address
+        if not addresses:
+            raise HomeAssistantError(
+                f"Cannot remove the last Bitcoin address from entry {config_entry_id}"
+            )
         
-        # Reload the entry to apply changes
-        await hass.config_entries.async_reload(config_entry_id)
-        _LOGGER.info("Added Bitcoin address %s to entry %s", btc_address, config_entry_id)
+        await coordinator.async_set_addresses(addresses)
+        async_update_addresses(hass, entry, addresses)
+        _LOGGER.info("Removed Bitcoin addresses %s from entry %s",
+                     ", ".join(removed), config_entry_id)
     
-    async def remove_btc_address_service(call: ServiceCall) -> None:
-        """Service to remove a Bitcoin address from monitoring."""
+    async def get_history_service(call: ServiceCall) -> ServiceResponse:
+        """Service to return recent hashrate samples from the in-memory history."""
         config_entry_id = call.data["config_entry_id"]
         btc_address = call.data["btc_address"]
+        worker = call.data.get("worker")
         
         if config_entry_id not in hass.data[DOMAIN]:
-            _LOGGER.error("Config entry ID %s not found", config_entry_id)
-            return
-            
-        entry = hass.config_entries.async_get_entry(config_entry_id)
-        if not entry:
-            _LOGGER.error("Config entry ID %s not found", config_entry_id)
-            return
-            
-        # Get current addresses
-        current_addresses = list(entry.data.get(CONF_BTC_ADDRESSES, []))
+            raise HomeAssistantError(f"Config entry ID {config_entry_id} not found")
+        coordinator = hass.data[DOMAIN][config_entry_id]
         
-        # Check if address exists
-        if btc_address not in current_addresses:
-            _LOGGER.warning("Bitcoin address %s does not exist in entry %s", 
-                           btc_address, config_entry_id)
-            return
-            
-        # Remove address
-        current_addresses.remove(btc_address)
+        series = worker_series(btc_address, worker) if worker else btc_address
+        if series not in coordinator.history:
+            raise HomeAssistantError(f"No hashrate history for {series}")
         
-        # Ensure we have at least one address
-        if not current_addresses:
-            _LOGGER.error("Cannot remove the last Bitcoin address from entry %s", 
-                         config_entry_id)
-            return
-            
-        # Update config entry
-        new_data = dict(entry.data)
-        new_data[CONF_BTC_ADDRESSES] = current_addresses
-        hass.config_entries.async_update_entry(entry, data=new_data)
-        
-        # Reload the entry to apply changes
-        await hass.config_entries.async_reload(config_entry_id)
-        _LOGGER.info("Removed Bitcoin address %s from entry %s", 
-                    btc_address, config_entry_id)
+        since = dt_util.utcnow().timestamp() - call.data["hours"] * 3600
+        return {
+            "unit_of_measurement": "TH/s",
+            "samples": [
+                {
+                    "time": dt_util.utc_from_timestamp(timestamp).isoformat(),
+                    # Convert from H/s to TH/s, like the sensors
+                    "hashrate": round(value / 1_000_000_000_000, 2),
+                }
+                for timestamp, value in coordinator.history.samples(series, since)
+            ],
+        }
     
     # Register the services
-    async_register_admin_service(
-        hass,
+    hass.services.async_register(
         DOMAIN,
         "refresh_data",
         refresh_data_service,
+        vol.Schema({
+            vol.Optional("config_entry_id"): cv.string,
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
     )
     
     async_register_admin_service(
@@ -171,7 +500,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         add_btc_address_service,
         vol.Schema({
             vol.Required("config_entry_id"): cv.string,
-            vol.Required("btc_address"): cv.string,
+            vol.Required("btc_address"): vol.All(cv.ensure_list_csv, [cv.string]),
         }),
     )
     
@@ -180,45 +509,227 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         DOMAIN,
         "remove_btc_address",
         remove_btc_address_service,
+        vol.Schema({
+            vol.Required("config_entry_id"): cv.string,
+            vol.Required("btc_address"): vol.All(cv.ensure_list_csv, [cv.string]),
+        }),
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        "get_history",
+        get_history_service,
         vol.Schema({
             vol.Required("config_entry_id"): cv.string,
             vol.Required("btc_address"): cv.string,
+            vol.Optional("worker"): cv.string,
+            vol.Optional("hours", default=1): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=HISTORY_HOURS)
+            ),
         }),
+        supports_response=SupportsResponse.ONLY,
     )
     
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Bitcoin Mining from a config entry."""
-    host = entry.data[CONF_HOST]
-    port = entry.data.get(CONF_PORT, DEFAULT_PORT)
-    btc_addresses = entry.data[CONF_BTC_ADDRESSES]
-    scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    # Options set through the options flow take precedence over the initial data
+    config = {**entry.data, **entry.options}
+    host = config[CONF_HOST]
+    port = config.get(CONF_PORT, DEFAULT_PORT)
+    max_concurrency = config.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
 
-    session = async_get_clientsession(hass)
+    pool_host = async_get_pool_host(hass, host, port, max_concurrency)
+    entry.async_on_unload(lambda: async_release_pool_host(hass, pool_host))
+    
     coordinator = BitcoinMiningUpdateCoordinator(
-        hass,
-        session,
-        host,
-        port,
-        btc_addresses,
-        scan_interval,
-        entry.entry_id
+        hass, config, entry_id=entry.entry_id, pool_host=pool_host
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    await coordinator.async_load_history()
+    # With a snapshot of the previous run, the entities are created from it
+    # and the server is polled in the background
+    restored = await coordinator.async_restore_snapshot()
+    if not restored:
+        await coordinator.async_config_entry_first_refresh()
 
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady(
-            f"Failed to retrieve data from mining server at {host}:{port}"
-        )
+        if not coordinator.last_update_success:
+            raise ConfigEntryNotReady(
+                f"Failed to retrieve data from mining server at {host}:{port}"
+            )
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
+    # Keep the hashrate history across restarts
+    async def _async_save_history(_event: Event) -> None:
+        await coordinator.async_save_history()
+    
+    entry.async_on_unload(coordinator.async_save_history)
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_save_history)
+    )
+    
+    # Start the removal grace period of workers that are gone since last run
+    coordinator.async_track_registered_workers()
+    
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Reload the entry when its options are changed
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} {entry.entry_id} first refresh"
+        )
     
     return True
 
+@callback
+def async_get_pool_host(
+    hass: HomeAssistant, host: str, port: int, max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+) -> PoolHost:
+    """Return the shared resources for a mining server, creating them if needed.
+
+    The sessions send the user agent of Home Assistant, use its SSL context
+    and are closed when Home Assistant closes, like the sessions of
+    async_create_clientsession. That helper detaches a session when the
+    entry creating it is unloaded, while these are shared by entries.
+    """
+    if DATA_POOL_HOSTS not in hass.data:
+        hass.data[DATA_POOL_HOSTS] = {}
+
+        async def close_all(_event: Event) -> None:
+            for pool_host in hass.data.pop(DATA_POOL_HOSTS, {}).values():
+                if pool_host.cancel_close is not None:
+                    pool_host.cancel_close()
+                    pool_host.cancel_close = None
+                await pool_host.async_close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, close_all)
+    pool_hosts = hass.data[DATA_POOL_HOSTS]
+    base_url = f"http://{host}:{port}/api"
+    if base_url not in pool_hosts:
+        pool_hosts[base_url] = PoolHost(
+            base_url,
+            headers={USER_AGENT: SERVER_SOFTWARE},
+            ssl_context=ssl_util.get_default_context(),
+        )
+    pool_host = pool_hosts[base_url]
+    retired = pool_host.request_limit(max_concurrency)
+    if retired is not None:
+        if pool_host.users > 0:
+            # The other entries keep their requests in flight on the retired
+            # session, new requests use one with the higher limit
+
+            @callback
+            def close_retired(_now: datetime) -> None:
+                hass.async_create_task(pool_host.async_close_retired(retired))
+
+            async_call_later(hass, POOL_HOST_LINGER, close_retired)
+        else:
+            hass.async_create_task(pool_host.async_close_retired(retired))
+    pool_host.users += 1
+    if pool_host.cancel_close is not None:
+        pool_host.cancel_close()
+        pool_host.cancel_close = None
+    return pool_host
+
+@callback
+def async_release_pool_host(hass: HomeAssistant, pool_host: PoolHost) -> None:
+    """Release the shared resources of a mining server once no entry uses them.
+
+    The session stays open for a little while, so that the entry created
+    after a config flow, or reloaded, reuses the connections.
+    """
+    pool_host.users -= 1
+    if pool_host.users > 0:
+        return
+    
+    @callback
+    def close(_now: Optional[datetime] = None) -> None:
+        pool_host.cancel_close = None
+        if pool_host.users <= 0:
+            hass.data.get(DATA_POOL_HOSTS, {}).pop(pool_host.base_url, None)
+            hass.async_create_task(pool_host.async_close())
+    
+    if hass.is_stopping:
+        close()
+    else:
+        pool_host.cancel_close = async_call_later(hass, POOL_HOST_LINGER, close)
+
+@callback
+def async_get_process_pool(hass: HomeAssistant) -> ProcessPoolExecutor:
+    """Return the process pool decoding large bodies, creating it if needed.
+
+    A single process is shared by all entries and shut down with Home
+    Assistant. It is spawned rather than forked, as forking a process with
+    running threads isn't safe.
+    """
+    if DATA_PROCESS_POOL not in hass.data:
+        pool = ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        )
+        hass.data[DATA_PROCESS_POOL] = pool
+
+        @callback
+        def shutdown(_event: Event) -> None:
+            hass.data.pop(DATA_PROCESS_POOL, None)
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, shutdown)
+    return hass.data[DATA_PROCESS_POOL]
+
+@callback
+def async_discard_process_pool(hass: HomeAssistant, pool: ProcessPoolExecutor) -> None:
+    """Shut down a broken process pool, the next request starts a new one."""
+    if hass.data.get(DATA_PROCESS_POOL) is pool:
+        hass.data.pop(DATA_PROCESS_POOL)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply the updated configuration of a config entry.
+
+    Address changes are applied to the running coordinator, any other change
+    reloads the entry.
+    """
+    config = {**entry.data, **entry.options}
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is not None and _without_addresses(config) == _without_addresses(
+        coordinator.config
+    ):
+        await coordinator.async_set_addresses(config[CONF_BTC_ADDRESSES])
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _without_addresses(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a configuration without its BTC addresses."""
+    return {key: value for key, value in config.items() if key != CONF_BTC_ADDRESSES}
+
+
+@callback
+def async_update_addresses(
+    hass: HomeAssistant, entry: ConfigEntry, btc_addresses: List[str]
+) -> None:
+    """Store the BTC addresses of an entry where its configuration keeps them."""
+    if CONF_BTC_ADDRESSES in entry.options:
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, CONF_BTC_ADDRESSES: btc_addresses}
+        )
+    else:
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_BTC_ADDRESSES: btc_addresses}
+        )
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the data stored for a deleted config entry."""
+    for key, version in (
+        ("history", HISTORY_STORAGE_VERSION),
+        ("snapshot", SNAPSHOT_STORAGE_VERSION),
+    ):
+        await Store(hass, version, f"{DOMAIN}.{entry.entry_id}.{key}").async_remove()
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -234,78 +745,995 @@ class BitcoinMiningUpdateCoordinator(DataUpdateCoordinator):
     def __init__(
         self,
         hass: HomeAssistant,
-        session: aiohttp.ClientSession,
-        host: str,
-        port: int,
-        btc_addresses: List[str],
-        scan_interval: int,
+        config: Dict[str, Any],
+        *,
         entry_id: str,
+        pool_host: PoolHost,
     ) -> None:
-        """Initialize."""
-        self.session = session
+        """Initialize from the configuration of an entry.
+
+        The configuration is the entry data merged with its options, the
+        options it doesn't have take their default value.
+        """
+        host = config[CONF_HOST]
+        port = config.get(CONF_PORT, DEFAULT_PORT)
+        scan_interval = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        worker_attributes = config.get(CONF_WORKER_ATTRIBUTES, DEFAULT_WORKER_ATTRIBUTES)
         self.host = host
         self.port = port
-        self.btc_addresses = btc_addresses
+        self.btc_addresses = list(config[CONF_BTC_ADDRESSES])
         self.base_url = f"http://{host}:{port}/api"
         self.entry_id = entry_id
+        self.request_timeout = config.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT)
+        self.stale_timeout = timedelta(
+            seconds=config.get(CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT)
+        )
+        # Result of the latest fetches, keyed by endpoint
+        self.endpoints: Dict[str, EndpointStatus] = {}
+        # Workers of the latest update keyed by (address, worker key)
+        self.worker_index: Dict[Tuple[str, str], WorkerRecord] = {}
+        # Last time each known worker was reported by the pool
+        self._worker_last_present: Dict[Tuple[str, str], datetime] = {}
+        # Workers gone for longer than this are removed, 0 keeps them forever
+        self.worker_removal_grace = timedelta(
+            hours=config.get(CONF_WORKER_REMOVAL_GRACE, DEFAULT_WORKER_REMOVAL_GRACE)
+        )
+        # State of every known worker and their count per address, computed
+        # on every update from the last time the pool saw each worker
+        self.worker_warning_after = timedelta(
+            minutes=config.get(CONF_WORKER_WARNING_AFTER, DEFAULT_WORKER_WARNING_AFTER)
+        )
+        self.worker_offline_after = timedelta(
+            minutes=config.get(CONF_WORKER_OFFLINE_AFTER, DEFAULT_WORKER_OFFLINE_AFTER)
+        )
+        self.worker_states: Dict[Tuple[str, str], str] = {}
+        self.worker_state_counts: Dict[str, Dict[str, int]] = {}
+        self._worker_last_seen: Dict[Tuple[str, str], Optional[datetime]] = {}
+        # Compact summary of the workers of each address, built once per generation
+        self._worker_summaries: Dict[str, Dict[str, Any]] = {}
+        self._summaries_generation: Optional[int] = None
+        # Incremented when the data changed, lets entities cache derived values
+        self.generation = 0
+        self._last_notified: Optional[Tuple[int, bool]] = None
+        # Hashrate totals and worker counts of the latest update
+        self.aggregates = AggregateSnapshot()
+        # Session of the server, and cache of the network and info endpoints,
+        # shared with other entries
+        self.pool_host = pool_host
+        # Base polling interval of each endpoint class
+        self._poll_intervals = {
+            "client": timedelta(seconds=scan_interval),
+            ENDPOINT_NETWORK: timedelta(
+                seconds=config.get(CONF_NETWORK_SCAN_INTERVAL, DEFAULT_NETWORK_SCAN_INTERVAL)
+            ),
+            ENDPOINT_INFO: timedelta(
+                seconds=config.get(CONF_INFO_SCAN_INTERVAL, DEFAULT_INFO_SCAN_INTERVAL)
+            ),
+        }
+        self.adaptive_polling = config.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+        self.schedules: Dict[str, PollSchedule] = {}
+        # Hashrate samples of every worker and address, one per tick but at
+        # most one per sample interval
+        tick = min(self._poll_intervals.values()).total_seconds()
+        self._history_interval = max(tick, HISTORY_SAMPLE_INTERVAL)
+        self._history_windows = list(HISTORY_WINDOWS)
+        self.history = HashrateHistory(
+            math.ceil(HISTORY_HOURS * 3600 / self._history_interval) + 1,
+            HISTORY_WINDOWS.values(),
+        )
+        self._history_values: Dict[str, float] = {}
+        self._history_store = Store(
+            hass, HISTORY_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.history"
+        )
+        self._snapshot_store = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        # Rolling statistics of every worker, only kept when enabled
+        self.worker_statistics = config.get(CONF_WORKER_STATISTICS, DEFAULT_WORKER_STATISTICS)
+        self.statistics_window = (
+            config.get(CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW) * 60
+        )
+        self.statistics: Dict[Tuple[str, str], RollingStats] = {}
+        self._worker_hashrates: Dict[Tuple[str, str], float] = {}
+        self._fresh_addresses: Set[str] = set()
+        # Workers are stored as records, with the attribute fields that
+        # don't have a slot of their own
+        self._make_worker = partial(
+            WorkerRecord.from_payload,
+            extra_fields=[
+                field for field in worker_attributes
+                if field not in WORKER_RECORD_FIELDS
+            ],
+        )
+        # Result of each endpoint fetched by the last update
+        self.last_fetched: Dict[str, Optional[bool]] = {}
+        # Request measurements per endpoint, and of the last update as a whole
+        self.metrics: Dict[str, EndpointMetrics] = {}
+        self.last_update_duration: Optional[float] = None
+        self.workers_processed = 0
+        # Large client bodies are decoded away from the event loop when enabled
+        self.offload_mode = config.get(CONF_OFFLOAD_MODE, DEFAULT_OFFLOAD_MODE)
+        self.offload_threshold = (
+            config.get(CONF_OFFLOAD_THRESHOLD, DEFAULT_OFFLOAD_THRESHOLD) * 1024
+        )
+        # Time the last update spent processing on the event loop, and
+        # decoding in an executor, so that the modes can be compared
+        self.loop_time: Optional[float] = None
+        self.offload_time: Optional[float] = None
+        self._loop_time = 0.0
+        self._offload_time = 0.0
+        # Manual refresh in progress, and the time and result of the last one
+        self._manual_refresh: Optional[asyncio.Task] = None
+        self._last_manual_refresh: Optional[Tuple[float, Dict[str, Any]]] = None
+        # Configuration the entry was set up with, see async_update_options
+        self.config: Dict[str, Any] = {**config, CONF_BTC_ADDRESSES: self.btc_addresses}
+        # Whether the server has the bulk clients endpoint, None until probed
+        self.batch_supported: Optional[bool] = None
+        self._batch_probe_after: Optional[datetime] = None
+        # Last bulk response of each address chunk, without its payload, and
+        # the addresses it contained
+        self._batch_results: Dict[Tuple[str, ...], Tuple[FetchResult, FrozenSet[str]]] = {}
+        # Serializes the refreshes with the address changes, so that a refresh
+        # never fetches or records an address removed while it runs
+        self._update_lock = asyncio.Lock()
+        # Limits the number of requests in flight against the mining server
+        self._semaphore = asyncio.Semaphore(
+            config.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+        )
         
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=scan_interval),
+            # Tick at the shortest interval, each update only fetches the due endpoints
+            update_interval=min(self._poll_intervals.values()),
         )
 
+    def address_device_identifier(self, btc_address: str) -> str:
+        """Return the device registry identifier of a BTC address."""
+        return f"{self.host}:{self.port}_{btc_address}"
+
+    def worker_device_identifier(self, btc_address: str, worker_key: str) -> str:
+        """Return the device registry identifier of a worker."""
+        return f"{self.address_device_identifier(btc_address)}_{worker_key}"
+
+    @callback
+    def async_track_registered_workers(self) -> None:
+        """Track registered worker devices that the pool no longer reports.
+
+        Without this, workers that disappeared while Home Assistant was stopped
+        would never reach the end of their removal grace period.
+        """
+        now = dt_util.utcnow()
+        device_registry = dr.async_get(self.hass)
+        prefixes = [
+            (btc_address, f"{self.host}:{self.port}_{btc_address}_")
+            for btc_address in self.btc_addresses
+        ]
+        for device in dr.async_entries_for_config_entry(device_registry, self.entry_id):
+            for domain, identifier in device.identifiers:
+                if domain != DOMAIN:
+                    continue
+                for btc_address, prefix in prefixes:
+                    if identifier.startswith(prefix):
+                        key = (btc_address, identifier[len(prefix):])
+                        self._worker_last_present.setdefault(key, now)
+
+    @callback
+    def _async_diff_workers(
+        self, worker_index: Dict[Tuple[str, str], WorkerRecord]
+    ) -> Set[Tuple[str, str]]:
+        """Return the workers added since the previous update."""
+        now = dt_util.utcnow()
+        added = set()
+        for key in worker_index:
+            if key not in self._worker_last_present:
+                added.add(key)
+            self._worker_last_present[key] = now
+        return added
+
+    @callback
+    def _async_expire_workers(self) -> None:
+        """Remove the workers gone for longer than the removal grace period."""
+        if not self.worker_removal_grace:
+            return
+        now = dt_util.utcnow()
+        removed = {
+            key
+            for key, last_present in self._worker_last_present.items()
+            if key not in self.worker_index and now - last_present > self.worker_removal_grace
+        }
+        if not removed:
+            return
+        for key in removed:
+            del self._worker_last_present[key]
+            self.history.remove(worker_series(*key))
+            self.statistics.pop(key, None)
+        _LOGGER.info("Removing workers gone for more than %s: %s",
+                     self.worker_removal_grace,
+                     ", ".join(f"{key} ({addr})" for addr, key in sorted(removed)))
+        self._async_remove_worker_devices(removed)
+        async_dispatcher_send(
+            self.hass, signal_workers_changed(self.entry_id), WorkerDelta(removed=removed)
+        )
+
+    @callback
+    def _async_remove_worker_devices(self, workers: Set[Tuple[str, str]]) -> None:
+        """Remove the devices, and with them the entities, of removed workers."""
+        device_registry = dr.async_get(self.hass)
+        for btc_address, worker_key in workers:
+            device = device_registry.async_get_device(
+                identifiers={(DOMAIN, self.worker_device_identifier(btc_address, worker_key))}
+            )
+            if device is not None:
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=self.entry_id
+                )
+
+    async def async_set_addresses(self, btc_addresses: List[str]) -> None:
+        """Change the monitored addresses without reloading the entry.
+
+        Only the new addresses are fetched, and only the devices and entities
+        of the removed addresses are removed. A refresh in progress finishes
+        first.
+        """
+        async with self._update_lock:
+            added = [addr for addr in btc_addresses if addr not in self.btc_addresses]
+            removed = {addr for addr in self.btc_addresses if addr not in btc_addresses}
+            if not added and not removed:
+                return
+            self.btc_addresses = list(btc_addresses)
+            self.config[CONF_BTC_ADDRESSES] = self.btc_addresses
+            
+            removed_workers = self._async_forget_addresses(removed) if removed else set()
+            if added:
+                _LOGGER.info("Adding Bitcoin addresses %s", ", ".join(added))
+                await self._fetch_clients(added)
+            
+            self.async_set_updated_data(self._async_build_data())
+        
+        # The platforms add the sensors of new addresses, even without workers
+        async_dispatcher_send(
+            self.hass,
+            signal_workers_changed(self.entry_id),
+            WorkerDelta(
+                removed=removed_workers,
+                added_addresses=set(added),
+                removed_addresses=removed,
+            ),
+        )
+
+    @callback
+    def _async_forget_addresses(self, btc_addresses: Set[str]) -> Set[Tuple[str, str]]:
+        """Drop the state, devices and entities of removed addresses.
+
+        Returns the workers of the removed addresses.
+        """
+        _LOGGER.info("Removing Bitcoin addresses %s", ", ".join(sorted(btc_addresses)))
+        workers = {
+            key for key in self._worker_last_present.keys() | self.worker_index.keys()
+            if key[0] in btc_addresses
+        }
+        for key in workers:
+            self._worker_last_present.pop(key, None)
+            self.history.remove(worker_series(*key))
+            self.statistics.pop(key, None)
+        for btc_address in btc_addresses:
+            endpoint = client_endpoint(btc_address)
+            self.endpoints.pop(endpoint, None)
+            self.schedules.pop(endpoint, None)
+            self.history.remove(btc_address)
+        # The address chunks of the bulk endpoint changed
+        self._batch_results.clear()
+        
+        self._async_remove_worker_devices(workers)
+        device_registry = dr.async_get(self.hass)
+        for btc_address in btc_addresses:
+            device = device_registry.async_get_device(
+                identifiers={(DOMAIN, self.address_device_identifier(btc_address))}
+            )
+            if device is not None:
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=self.entry_id
+                )
+        return workers
+
+    def worker_summary(self, btc_address: str) -> Optional[Dict[str, Any]]:
+        """Return the totals and the compact list of workers of an address."""
+        if self._summaries_generation != self.generation:
+            self._worker_summaries = self._build_worker_summaries()
+            self._summaries_generation = self.generation
+        return self._worker_summaries.get(btc_address)
+
+    def _build_worker_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Summarize the workers of every address in a single pass."""
+        clients = self.data["client"] if self.data else {}
+        summaries = {}
+        for btc_address, client_data in clients.items():
+            totals = self.aggregates.addresses.get(btc_address)
+            summaries[btc_address] = {
+                "total_hashrate": totals.hashrate if totals else None,
+                "best_difficulty": client_data.get("bestDifficulty"),
+                **{
+                    f"workers_{state}": count
+                    for state, count in self.worker_state_counts.get(btc_address, {}).items()
+                },
+                "workers": [],
+            }
+        # Known workers the pool no longer reports are listed as offline
+        for key, state in sorted(self.worker_states.items()):
+            summary = summaries.get(key[0])
+            if summary is None:
+                continue
+            worker = self.worker_index.get(key)
+            summary["workers"].append(
+                {
+                    "key": key[1],
+                    "name": (worker and worker.name) or key[1],
+                    "status": state,
+                    "hashrate": worker.hashrate if worker else None,
+                    "best_difficulty": worker.best_difficulty if worker else None,
+                    "last_seen": worker.last_seen if worker else None,
+                }
+            )
+        return summaries
+
+    def get_worker(self, btc_address: str, worker_key: str) -> Optional[WorkerRecord]:
+        """Return the latest data of a worker, or None if it's gone."""
+        return self.worker_index.get((btc_address, worker_key))
+
+    def endpoint_status(self, endpoint: str) -> Optional[EndpointStatus]:
+        """Return the fetch status of an endpoint."""
+        return self.endpoints.get(endpoint)
+
+    def is_endpoint_available(self, endpoint: str) -> bool:
+        """Return True if the endpoint has data that isn't stale for too long."""
+        status = self.endpoints.get(endpoint)
+        return status is not None and status.is_available(
+            dt_util.utcnow(), self.stale_timeout
+        )
+
+    def _schedule(self, endpoint: str) -> PollSchedule:
+        """Return the polling schedule of an endpoint."""
+        if endpoint not in self.schedules:
+            interval = self._poll_intervals.get(endpoint, self._poll_intervals["client"])
+            self.schedules[endpoint] = PollSchedule(
+                interval, interval * MAX_POLL_BACKOFF, self.adaptive_polling
+            )
+        return self.schedules[endpoint]
+
+    async def async_refresh_all(self) -> Dict[str, Any]:
+        """Refresh every endpoint now, regardless of its polling schedule.
+
+        Calls made while a manual refresh is running wait for it, and calls
+        made shortly after it return its result, so repeated service calls
+        don't hammer the server. Returns the outcome of the refresh.
+        """
+        if self._manual_refresh is None:
+            last = self._last_manual_refresh
+            if last is not None and time.monotonic() - last[0] < MANUAL_REFRESH_COOLDOWN:
+                return last[1]
+            self._manual_refresh = self.hass.async_create_task(self._async_manual_refresh())
+        # Shield the shared refresh from the cancellation of a single caller
+        return await asyncio.shield(self._manual_refresh)
+
+    async def _async_manual_refresh(self) -> Dict[str, Any]:
+        """Refresh every endpoint and describe the outcome."""
+        try:
+            for schedule in self.schedules.values():
+                schedule.reset()
+            start = time.monotonic()
+            await self.async_refresh()
+            result = {
+                "success": self.last_update_success,
+                "latency": round(time.monotonic() - start, 3),
+                "endpoints_fetched": sorted(
+                    endpoint for endpoint, changed in self.last_fetched.items()
+                    if changed is not None
+                ),
+                "endpoints_failed": sorted(
+                    endpoint for endpoint, changed in self.last_fetched.items()
+                    if changed is None
+                ),
+            }
+            self._last_manual_refresh = (time.monotonic(), result)
+            return result
+        finally:
+            self._manual_refresh = None
+
+    async def _fetch_json(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[bytes] = None,
+        parser: Optional[ClientPayloadParser] = None,
+    ) -> FetchResult:
+        """Fetch and decode a single endpoint.
+
+        The timeout applies to each request individually and only starts once
+        a concurrency slot is available, so one slow endpoint cannot fail the
+        whole update. With an ETag or Last-Modified value the request is
+        conditional, and the server can answer 304 without a body. A body with
+        the same hash as the previous one isn't decoded at all.
+
+        Large bodies of the client endpoints are hashed as they arrive, and
+        only decoded by the parser, chunk by chunk, when the hash changed, so
+        the complete payload with every worker field is never built. The raw
+        chunks are kept until the hash is known, so the memory used peaks at
+        the size of the body, as when it is read whole.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        async with self._semaphore:
+            # Waiting for a slot isn't part of the request duration
+            start = time.monotonic()
+            async with async_timeout.timeout(self.request_timeout):
+                # The session of the server is replaced when its limit grows
+                session = self.pool_host.get_session()
+                async with session.get(url, headers=headers or None) as resp:
+                    max_age = parse_max_age(resp.headers.get("Cache-Control"))
+                    if resp.status == 304 and headers:
+                        return FetchResult(
+                            etag=etag,
+                            last_modified=last_modified,
+                            content_hash=content_hash,
+                            max_age=max_age,
+                            not_modified=True,
+                            timing=FetchTiming(time.monotonic() - start, 0, 0.0),
+                        )
+                    if resp.status in UNSUPPORTED_STATUSES:
+                        raise EndpointNotSupported(f"HTTP status {resp.status}")
+                    if resp.status != 200:
+                        raise UpdateFailed(f"HTTP status {resp.status}")
+                    result = FetchResult(
+                        etag=resp.headers.get("ETag"),
+                        last_modified=resp.headers.get("Last-Modified"),
+                        max_age=max_age,
+                    )
+                    # Bodies that may be offloaded are read whole
+                    offload = (
+                        parser is not None
+                        and self.offload_mode != OFFLOAD_OFF
+                        and (
+                            resp.content_length is None
+                            or resp.content_length >= self.offload_threshold
+                        )
+                    )
+                    if not offload and parser is not None and (
+                        resp.content_length is None
+                        or resp.content_length > STREAM_THRESHOLD
+                    ):
+                        # The body is hashed as it arrives, an unchanged
+                        # body isn't decoded at all
+                        hasher = hashlib.blake2b(digest_size=16)
+                        chunks = []
+                        async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                            hasher.update(chunk)
+                            chunks.append(chunk)
+                        size = sum(len(chunk) for chunk in chunks)
+                        result.content_hash = hasher.digest()
+                        decode_time = 0.0
+                        if result.content_hash != content_hash:
+                            decode_start = time.perf_counter()
+                            # Chunks are released as soon as they are decoded
+                            chunks.reverse()
+                            while chunks:
+                                parser.feed(chunks.pop())
+                            result.data = parser.close()
+                            decode_time = time.perf_counter() - decode_start
+                        raw = None
+                    else:
+                        raw = await resp.read()
+                        size = len(raw)
+                        decode_time = 0.0
+        
+        offloaded = False
+        if raw is not None:
+            decode_start = time.perf_counter()
+            args = (
+                raw,
+                content_hash,
+                json_loads,
+                *((parser.make_worker, parser.batch) if parser is not None else ()),
+            )
+            if offload and size >= self.offload_threshold:
+                result.content_hash, result.data = await self._async_offload(
+                    decode_body, *args
+                )
+                offloaded = True
+            else:
+                result.content_hash, result.data = decode_body(*args)
+            decode_time = time.perf_counter() - decode_start
+        if result.content_hash == content_hash:
+            result.not_modified = True
+            result.data = None
+        result.timing = FetchTiming(
+            time.monotonic() - start, size, decode_time, offloaded
+        )
+        return result
+
+    async def _async_offload(self, func, *args) -> Any:
+        """Run a function in the executor of the offload mode.
+
+        When the executor can't run it, because it was shut down by an unload
+        or its process died, the function runs on the event loop instead, and
+        a broken process pool is replaced for the next request.
+        """
+        pool = None
+        try:
+            if self.offload_mode == OFFLOAD_PROCESS:
+                pool = async_get_process_pool(self.hass)
+                future = self.hass.loop.run_in_executor(pool, func, *args)
+            else:
+                future = self.hass.async_add_executor_job(func, *args)
+        except (BrokenProcessPool, RuntimeError) as err:
+            error: Exception = err
+        else:
+            try:
+                return await future
+            except BrokenProcessPool as err:
+                error = err
+        _LOGGER.warning("Decoding in the %s executor failed, decoding on the event loop: %s",
+                        self.offload_mode, str(error) or type(error).__name__)
+        if pool is not None and isinstance(error, BrokenProcessPool):
+            async_discard_process_pool(self.hass, pool)
+        return func(*args)
+
+    def _record_timing(self, endpoint: str, result: FetchResult) -> None:
+        """Add the measurements of a request to the metrics of its endpoint."""
+        if result.timing is not None:
+            self.metrics.setdefault(endpoint, EndpointMetrics()).record(result.timing)
+            if result.timing.offloaded:
+                self._offload_time += result.timing.decode_time
+            else:
+                self._loop_time += result.timing.decode_time
+
+    async def _fetch_endpoint(self, endpoint: str) -> Optional[bool]:
+        """Fetch an endpoint and record the result.
+
+        Returns whether the payload changed, or None if the request failed.
+        """
+        status = self.endpoints.setdefault(endpoint, EndpointStatus())
+        schedule = self._schedule(endpoint)
+        url = f"{self.base_url}/{endpoint}"
+        try:
+            if endpoint in (ENDPOINT_NETWORK, ENDPOINT_INFO):
+                # Shared payloads younger than this are recent enough for this entry
+                max_age = schedule.base_interval.total_seconds() * 0.9
+                result = await self.pool_host.async_fetch(
+                    endpoint,
+                    lambda cached: self._fetch_json(
+                        url,
+                        *((cached.etag, cached.last_modified, cached.content_hash) if cached else ()),
+                    ),
+                    max_age,
+                )
+            else:
+                result = await self._fetch_json(
+                    url,
+                    status.etag,
+                    status.last_modified,
+                    status.content_hash,
+                    ClientPayloadParser(self._make_worker),
+                )
+        except asyncio.TimeoutError:
+            error = f"Timeout connecting to {self.host}:{self.port}"
+        except (aiohttp.ClientError, ValueError, UpdateFailed) as err:
+            error = str(err) or type(err).__name__
+        else:
+            now = dt_util.utcnow()
+            # Shared responses are the same object when they didn't change
+            changed = status.stale or not (
+                result.not_modified or result.data is status.data
+            )
+            status.record_success(status.data if result.not_modified else result.data, now)
+            status.etag = result.etag
+            status.last_modified = result.last_modified
+            status.content_hash = result.content_hash
+            schedule.record(now, changed, result.max_age)
+            self._record_timing(endpoint, result)
+            return changed
+        
+        status.record_failure(error)
+        schedule.record_failure(dt_util.utcnow())
+        _LOGGER.error("Failed to fetch %s data (%s consecutive errors): %s",
+                      endpoint, status.consecutive_errors, error)
+        return None
+
+    async def _fetch_endpoints(self, endpoints: List[str]) -> Dict[str, Optional[bool]]:
+        """Fetch endpoints concurrently, bounded by the semaphore."""
+        return dict(zip(endpoints, await asyncio.gather(
+            *(self._fetch_endpoint(endpoint) for endpoint in endpoints)
+        )))
+
+    def _batch_usable(self) -> bool:
+        """Return True if the bulk clients endpoint should be tried."""
+        if self.batch_supported is not False:
+            return True
+        return dt_util.utcnow() >= self._batch_probe_after
+
+    @callback
+    def _async_batch_unsupported(self, reason: str) -> None:
+        """Fall back to per-address requests until the next probe."""
+        if self.batch_supported is not False:
+            _LOGGER.debug("No bulk clients endpoint on %s:%s (%s), "
+                          "fetching each address separately", self.host, self.port, reason)
+        self.batch_supported = False
+        self._batch_probe_after = dt_util.utcnow() + BATCH_REPROBE_INTERVAL
+        self._batch_results.clear()
+
+    async def _fetch_client_batch(self, addresses: List[str]) -> Dict[str, Optional[bool]]:
+        """Fetch the clients of several addresses with a single request.
+
+        The bulk endpoint answers with an object mapping each address to the
+        payload of its client endpoint. Returns the result of every address
+        found in the response, like _fetch_endpoint; the addresses missing
+        from it are left to the per-address requests.
+        """
+        key = tuple(addresses)
+        previous = self._batch_results.get(key)
+        url = f"{self.base_url}/{ENDPOINT_CLIENTS}?{urlencode({'addresses': ','.join(addresses)})}"
+        try:
+            result = await self._fetch_json(
+                url,
+                *((previous[0].etag, previous[0].last_modified, previous[0].content_hash)
+                  if previous else (None, None, None)),
+                ClientPayloadParser(self._make_worker, batch=True),
+            )
+        except EndpointNotSupported as err:
+            self._async_batch_unsupported(str(err))
+            return {}
+        except (asyncio.TimeoutError, aiohttp.ClientError, ValueError, UpdateFailed) as err:
+            _LOGGER.debug("Bulk clients request failed, fetching each address separately: %s",
+                          str(err) or type(err).__name__)
+            return {}
+        
+        if result.not_modified and previous is not None:
+            found = previous[1]
+        elif isinstance(result.data, dict):
+            found = frozenset(
+                addr for addr in addresses if isinstance(result.data.get(addr), dict)
+            )
+        else:
+            # Something else answers on that path
+            self._async_batch_unsupported("unexpected response")
+            return {}
+        
+        if not self.batch_supported:
+            _LOGGER.debug("Fetching the clients of %s:%s with the bulk endpoint",
+                          self.host, self.port)
+        self.batch_supported = True
+        self._batch_results[key] = (replace(result, data=None), found)
+        self._record_timing(ENDPOINT_CLIENTS, result)
+        
+        now = dt_util.utcnow()
+        results = {}
+        for addr in found:
+            endpoint = client_endpoint(addr)
+            status = self.endpoints.setdefault(endpoint, EndpointStatus())
+            client = status.data if result.not_modified else result.data[addr]
+            changed = status.stale or client != status.data
+            status.record_success(client, now)
+            # The validators of the address endpoint don't match this payload
+            status.etag = status.last_modified = status.content_hash = None
+            self._schedule(endpoint).record(now, changed, result.max_age)
+            results[endpoint] = changed
+        return results
+
+    async def _fetch_clients(self, addresses: List[str]) -> Dict[str, Optional[bool]]:
+        """Fetch the clients of the addresses, in bulk when the server allows it."""
+        results: Dict[str, Optional[bool]] = {}
+        if len(addresses) > 1 and self._batch_usable():
+            chunks = [
+                addresses[i:i + CLIENT_BATCH_SIZE]
+                for i in range(0, len(addresses), CLIENT_BATCH_SIZE)
+            ]
+            for chunk_results in await asyncio.gather(
+                *(self._fetch_client_batch(chunk) for chunk in chunks)
+            ):
+                results.update(chunk_results)
+            # Forget the chunks of addresses that are no longer due together
+            for key in self._batch_results.keys() - set(map(tuple, chunks)):
+                del self._batch_results[key]
+        
+        results.update(await self._fetch_endpoints([
+            client_endpoint(addr) for addr in addresses
+            if client_endpoint(addr) not in results
+        ]))
+        return results
+
     async def _async_update_data(self) -> Dict[str, Any]:
         """Fetch data from the mining server."""
+        async with self._update_lock:
+            start = time.monotonic()
+            self._loop_time = self._offload_time = 0.0
+            try:
+                return await self._async_fetch_data()
+            finally:
+                self.last_update_duration = time.monotonic() - start
+                self.loop_time = self._loop_time
+                self.offload_time = self._offload_time
+
+    async def _async_fetch_data(self) -> Dict[str, Any]:
+        """Fetch the due endpoints and build the data."""
+        # Only fetch the endpoints due before the next tick
+        due_before = dt_util.utcnow() + self.update_interval / 2
+        addresses = [
+            addr for addr in self.btc_addresses
+            if self._schedule(client_endpoint(addr)).is_due(due_before)
+        ]
+        endpoints = [
+            endpoint for endpoint in (ENDPOINT_NETWORK, ENDPOINT_INFO)
+            if self._schedule(endpoint).is_due(due_before)
+        ]
+        
+        client_results, results = await asyncio.gather(
+            self._fetch_clients(addresses), self._fetch_endpoints(endpoints)
+        )
+        results.update(client_results)
+        self.last_fetched = results
+        processing_start = time.perf_counter()
+        
+        if results and all(changed is None for changed in results.values()):
+            if not any(status.has_data for status in self.endpoints.values()):
+                raise UpdateFailed(
+                    f"Error fetching data from mining server at {self.host}:{self.port}"
+                )
+            _LOGGER.warning("All requests to %s:%s failed, keeping the last good data",
+                            self.host, self.port)
+        
+        # Remove workers whose grace period ended, even if nothing changed
+        self._async_expire_workers()
+        
+        # Failed requests change the stale attributes, so they count as changes
+        if self.data is not None and not any(
+            changed is not False for changed in results.values()
+        ):
+            # Returning the same data leaves the generation, and therefore the
+            # listeners, untouched
+            data = self.data
+            # Unless workers changed state, which also happens as time passes
+            if self._async_update_worker_states():
+                self.generation += 1
+        else:
+            data = self._async_build_data()
+            self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+        
+        # Sample at a steady pace so that the averages are evenly weighted,
+        # ticks a little early still count
+        now = dt_util.utcnow().timestamp()
+        last_sample = self.history.last_time
+        if last_sample is None or now - last_sample >= self._history_interval * 0.9:
+            self.history.append(now, self._history_values)
+        if self.worker_statistics:
+            self._async_update_statistics(now)
+        
+        self._loop_time += time.perf_counter() - processing_start
+        return data
+
+    @callback
+    def _async_build_data(self) -> Dict[str, Any]:
+        """Build the data from the last good payload of every endpoint."""
         data = {
             "client": {},
             "network": {},
             "info": {}
         }
+        for btc_address in self.btc_addresses:
+            # Addresses added in place have no status until their first fetch
+            status = self.endpoints.get(client_endpoint(btc_address))
+            if status is not None and status.has_data:
+                data["client"][btc_address] = status.data
         
+        for endpoint in (ENDPOINT_NETWORK, ENDPOINT_INFO):
+            if self.endpoints[endpoint].has_data:
+                data[endpoint] = self.endpoints[endpoint].data
+        
+        # Rebuilt once per update so sensors don't walk the payloads
+        if self.data is None or data["client"] != self.data["client"]:
+            worker_index = build_worker_index(data["client"])
+            
+            # Only the workers that changed are passed on to the platforms
+            added = self._async_diff_workers(worker_index)
+            self.worker_index = worker_index
+            self.workers_processed = len(worker_index)
+            self._worker_last_seen = {
+                key: _parse_last_seen(worker.last_seen)
+                for key, worker in worker_index.items()
+            }
+            if self.data and added:
+                _LOGGER.info("New workers detected: %s",
+                             ", ".join(f"{key} ({addr})" for addr, key in sorted(added)))
+                async_dispatcher_send(
+                    self.hass, signal_workers_changed(self.entry_id), WorkerDelta(added=added)
+                )
+        self.aggregates = build_aggregates(data["client"], data["network"])
+        self.generation += 1
+        
+        # Stale addresses are left out of the history rather than repeated
+        fresh = {
+            btc_address
+            for btc_address in data["client"]
+            if not self.endpoints[client_endpoint(btc_address)].stale
+        }
+        history_values = {
+            btc_address: totals.hashrate
+            for btc_address, totals in self.aggregates.addresses.items()
+            if btc_address in fresh
+        }
+        worker_hashrates = {}
+        for key, worker in self.worker_index.items():
+            if key[0] not in fresh:
+                continue
+            if worker.hashrate is None:
+                continue
+            worker_hashrates[key] = worker.hashrate
+            history_values[worker_series(*key)] = worker.hashrate
+        self._history_values = history_values
+        self._worker_hashrates = worker_hashrates
+        self._fresh_addresses = fresh
+        self._async_update_worker_states()
+        
+        return data
+
+    @callback
+    def _async_update_worker_states(self) -> bool:
+        """Work out whether each known worker is online, warning or offline.
+
+        Workers reported by the pool are classified by the time since the pool
+        last saw them, or by their hashrate when it doesn't say. Workers the
+        pool no longer reports are offline until they are removed. Returns
+        True if any state changed.
+        """
+        now = dt_util.utcnow()
+        states = {}
+        counts = {
+            btc_address: dict.fromkeys(WORKER_STATES, 0)
+            for btc_address in self.btc_addresses
+        }
+        for key in self._worker_last_present.keys() | self.worker_index.keys():
+            worker = self.worker_index.get(key)
+            last_seen = self._worker_last_seen.get(key)
+            if worker is None:
+                state = WORKER_OFFLINE
+            elif last_seen is None:
+                state = WORKER_ONLINE if worker.hashrate else WORKER_OFFLINE
+            elif now - last_seen < self.worker_warning_after:
+                state = WORKER_ONLINE
+            elif now - last_seen < self.worker_offline_after:
+                state = WORKER_WARNING
+            else:
+                state = WORKER_OFFLINE
+            states[key] = state
+            if key[0] in counts:
+                counts[key[0]][state] += 1
+        
+        if states == self.worker_states and counts == self.worker_state_counts:
+            return False
+        self.worker_states = states
+        self.worker_state_counts = counts
+        return True
+
+    @callback
+    def _async_update_statistics(self, timestamp: float) -> None:
+        """Add a sample to the rolling statistics of every worker.
+
+        Known workers the pool stopped reporting count as down, while the
+        workers of stale addresses are skipped.
+        """
+        for key in self.worker_index.keys() - self.statistics.keys():
+            self.statistics[key] = RollingStats(self.statistics_window, EMA_TIME_CONSTANT)
+        for key, stats in self.statistics.items():
+            if key[0] in self._fresh_addresses:
+                stats.add(timestamp, self._worker_hashrates.get(key, 0.0))
+
+    def get_worker_statistics(
+        self, btc_address: str, worker_key: str
+    ) -> Optional[RollingStats]:
+        """Return the rolling statistics of a worker."""
+        return self.statistics.get((btc_address, worker_key))
+
+    def average_hashrate(self, series: str, window: str) -> Optional[float]:
+        """Return the average hashrate in H/s of a history series over a window."""
+        return self.history.mean(series, self._history_windows.index(window))
+
+    async def async_load_history(self) -> None:
+        """Restore the hashrate history saved by the previous run."""
+        stored = await self._history_store.async_load()
+        if not stored:
+            return
         try:
-            async with async_timeout.timeout(10):
-                # Fetch client data for each BTC address
-                for btc_address in self.btc_addresses:
-                    client_url = f"{self.base_url}/client/{btc_address}"
-                    async with self.session.get(client_url) as resp:
-                        if resp.status == 200:
-                            client_data = await resp.json()
-                            data["client"][btc_address] = client_data
-                            
-                            # Check for new workers and trigger a reload if needed
-                            if self.data and "client" in self.data and btc_address in self.data["client"]:
-                                current_workers = set(w["name"] for w in self.data["client"][btc_address].get("workers", []))
-                                new_workers = set(w["name"] for w in client_data.get("workers", []))
-                                
-                                if new_workers - current_workers:
-                                    _LOGGER.info(f"New workers detected for {btc_address}: {new_workers - current_workers}")
-                                    # Schedule a reload to create entities for new workers
-                                    async_dispatcher_send(self.hass, f"{DOMAIN}_new_workers", self.entry_id)
-                        else:
-                            _LOGGER.error("Failed to fetch client data for %s: %s", 
-                                          btc_address, resp.status)
-                
-                # Fetch network data
-                network_url = f"{self.base_url}/network"
-                async with self.session.get(network_url) as resp:
-                    if resp.status == 200:
-                        data["network"] = await resp.json()
-                    else:
-                        _LOGGER.error("Failed to fetch network data: %s", resp.status)
-                
-                # Fetch info data
-                info_url = f"{self.base_url}/info"
-                async with self.session.get(info_url) as resp:
-                    if resp.status == 200:
-                        data["info"] = await resp.json()
-                    else:
-                        _LOGGER.error("Failed to fetch info data: %s", resp.status)
-                
-                return data
-                
-        except asyncio.TimeoutError:
-            raise UpdateFailed(f"Timeout connecting to mining server at {self.host}:{self.port}")
-        except (aiohttp.ClientError, ValueError) as error:
-            raise UpdateFailed(f"Error fetching data: {error}")
+            # Nothing uses the history before the first refresh, so the
+            # arrays of a large fleet are rebuilt away from the event loop
+            await self.hass.async_add_executor_job(self.history.restore, stored)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Discarding unreadable hashrate history: %s", err)
+
+    async def async_save_history(self) -> None:
+        """Save the hashrate history to disk."""
+        await self._history_store.async_save(self.history.as_dict())
+
+    @callback
+    def _snapshot_data(self) -> Dict[str, Any]:
+        """Return the last good payload of every endpoint, for the snapshot."""
+        endpoints = {}
+        for btc_address in self.btc_addresses:
+            status = self.endpoints.get(client_endpoint(btc_address))
+            if status is not None and status.has_data:
+                endpoints[client_endpoint(btc_address)] = {
+                    "data": project_client(status.data, WorkerRecord.as_payload),
+                    "last_success": status.last_success.isoformat(),
+                }
+        for endpoint in (ENDPOINT_NETWORK, ENDPOINT_INFO):
+            status = self.endpoints.get(endpoint)
+            if status is not None and status.has_data:
+                endpoints[endpoint] = {
+                    "data": status.data,
+                    "last_success": status.last_success.isoformat(),
+                }
+        return {"endpoints": endpoints}
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the payloads saved by the previous run, flagged as stale.
+
+        Returns True if the data of at least one address was restored, in
+        which case the coordinator has data to create the entities from.
+        """
+        try:
+            stored = await self._snapshot_store.async_load()
+        except HomeAssistantError as err:
+            # Older versions of Home Assistant raise on a corrupt file
+            _LOGGER.warning("Discarding unreadable snapshot: %s", err)
+            return False
+        if not stored:
+            return False
+        endpoints = {}
+        try:
+            for btc_address in self.btc_addresses:
+                saved = stored["endpoints"].get(client_endpoint(btc_address))
+                if saved is not None:
+                    endpoints[client_endpoint(btc_address)] = (
+                        project_client(saved["data"], self._make_worker),
+                        saved["last_success"],
+                    )
+            for endpoint in (ENDPOINT_NETWORK, ENDPOINT_INFO):
+                saved = stored["endpoints"].get(endpoint)
+                if saved is not None:
+                    endpoints[endpoint] = (saved["data"], saved["last_success"])
+            # Payloads without a readable time are left out
+            endpoints = {
+                endpoint: (data, parsed)
+                for endpoint, (data, last_success) in endpoints.items()
+                if (parsed := dt_util.parse_datetime(last_success)) is not None
+            }
+        except (AttributeError, KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Discarding unreadable snapshot: %s", err)
+            return False
+        if not any(endpoint.startswith("client/") for endpoint in endpoints):
+            return False
+        
+        for endpoint, (data, last_success) in endpoints.items():
+            status = self.endpoints.setdefault(endpoint, EndpointStatus())
+            status.record_success(data, last_success)
+            status.restored = True
+        for endpoint in (ENDPOINT_NETWORK, ENDPOINT_INFO):
+            self.endpoints.setdefault(endpoint, EndpointStatus())
+        self.data = self._async_build_data()
+        _LOGGER.debug("Restored the data of %s addresses from the snapshot",
+                      len(self.data["client"]))
+        return True
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners only when the data or the update status changed."""
+        # The measurements change with every update
+        async_dispatcher_send(self.hass, signal_metrics_updated(self.entry_id))
+        notified = (self.generation, self.last_update_success)
+        if notified == self._last_notified:
+            return
+        self._last_notified = notified
+        super().async_update_listeners()
@@ -0,0 +1,105 @@
+"""Bitcoin address validation for the MineMonitor integration."""
+from __future__ import annotations
+
+import hashlib
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BECH32_ALPHABET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+# Version bytes of P2PKH and P2SH addresses on mainnet and testnet
+BASE58_VERSIONS = (0x00, 0x05, 0x6F, 0xC4)
+# Human readable parts of segwit addresses on mainnet, testnet and regtest
+BECH32_HRPS = ("bc", "tb", "bcrt")
+
+BECH32_CONST = 1
+BECH32M_CONST = 0x2BC830A3
+
+
+def _base58_decode(address: str) -> bytes:
+    """Decode a Base58 string, raising ValueError on an invalid character."""
+    number = 0
+    for char in address:
+        index = BASE58_ALPHABET.find(char)
+        if index < 0:
+            raise ValueError(f"Invalid Base58 character {char!r}")
+        number = number * 58 + index
+    # Leading ones encode leading zero bytes
+    zeros = len(address) - len(address.lstrip("1"))
+    return b"\0" * zeros + number.to_bytes((number.bit_length() + 7) // 8, "big")
+
+
+def _is_valid_base58check(address: str) -> bool:
+    """Return True for a P2PKH or P2SH address with a valid checksum."""
+    try:
+        raw = _base58_decode(address)
+    except ValueError:
+        return False
+    if len(raw) != 25 or raw[0] not in BASE58_VERSIONS:
+        return False
+    payload, checksum = raw[:-4], raw[-4:]
+    return hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] == checksum
+
+
+def _bech32_polymod(values: list) -> int:
+    """Compute the Bech32 checksum of a list of 5-bit values (BIP 173)."""
+    generator = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+    checksum = 1
+    for value in values:
+        top = checksum >> 25
+        checksum = (checksum & 0x1FFFFFF) << 5 ^ value
+        for bit in range(5):
+            checksum ^= generator[bit] if (top >> bit) & 1 else 0
+    return checksum
+
+
+def _convert_bits(data: list, from_bits: int, to_bits: int) -> list | None:
+    """Regroup bits without padding, None if the input has leftover bits."""
+    accumulator = 0
+    bits = 0
+    result = []
+    for value in data:
+        accumulator = (accumulator << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            result.append((accumulator >> bits) & ((1 << to_bits) - 1))
+    if bits >= from_bits or (accumulator << (to_bits - bits)) & ((1 << to_bits) - 1):
+        return None
+    return result
+
+
+def _is_valid_segwit(address: str) -> bool:
+    """Return True for a segwit address with a valid Bech32 or Bech32m checksum."""
+    if address.lower() != address and address.upper() != address:
+        return False
+    address = address.lower()
+    hrp, separator, data_part = address.rpartition("1")
+    if not separator or hrp not in BECH32_HRPS or len(data_part) < 7 or len(address) > 90:
+        return False
+    if any(char not in BECH32_ALPHABET for char in data_part):
+        return False
+    data = [BECH32_ALPHABET.index(char) for char in data_part]
+
+    expanded_hrp = [ord(char) >> 5 for char in hrp] + [0] + [ord(char) & 31 for char in hrp]
+    constant = _bech32_polymod(expanded_hrp + data)
+    witness_version = data[0]
+    # Version 0 programs use Bech32, later versions Bech32m (BIP 350)
+    if constant != (BECH32_CONST if witness_version == 0 else BECH32M_CONST):
+        return False
+
+    program = _convert_bits(data[1:-6], 5, 8)
+    if program is None or witness_version > 16 or not 2 <= len(program) <= 40:
+        return False
+    return witness_version != 0 or len(program) in (20, 32)
+
+
+def is_valid_btc_address(address: str) -> bool:
+    """Return True if the address is a well-formed Bitcoin address.
+
+    Legacy addresses are checked with their Base58Check checksum and segwit
+    addresses with their Bech32 or Bech32m checksum, without any network
+    access.
+    """
+    if address[:3].lower() in ("bc1", "tb1") or address[:5].lower() == "bcrt1":
+        return _is_valid_segwit(address)
+    return _is_valid_base58check(address)
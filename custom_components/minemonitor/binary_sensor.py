@@ -0,0 +1,138 @@
+"""Binary sensor platform for MineMonitor integration."""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from . import DOMAIN, WORKER_OFFLINE, client_endpoint, signal_workers_changed
+from .entity import MinemonitorEntity
+from .models import WorkerDelta
+
+# Whether a worker is connected, with its online, warning or offline state
+WORKER_ONLINE_SENSOR = BinarySensorEntityDescription(
+    key="online",
+    name="Online",
+    device_class=BinarySensorDeviceClass.CONNECTIVITY,
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up MineMonitor binary sensors based on a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    # Workers that already have a binary sensor
+    worker_tracker = set()
+
+    def setup_binary_sensors(workers):
+        """Add a binary sensor for each of the given workers."""
+        entities = []
+        for (btc_address, worker_key) in workers:
+            if (btc_address, worker_key) not in worker_tracker:
+                worker_tracker.add((btc_address, worker_key))
+                entities.append(
+                    MinemonitorWorkerBinarySensor(
+                        coordinator, WORKER_ONLINE_SENSOR, entry, btc_address, worker_key
+                    )
+                )
+        if entities:
+            async_add_entities(entities)
+
+    setup_binary_sensors(coordinator.worker_index)
+
+    async def handle_workers_changed(delta: WorkerDelta):
+        # The coordinator removed their devices, allow them to come back
+        worker_tracker.difference_update(delta.removed)
+        worker_tracker.difference_update(
+            {key for key in worker_tracker if key[0] in delta.removed_addresses}
+        )
+        setup_binary_sensors(delta.added)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, signal_workers_changed(entry.entry_id), handle_workers_changed
+        )
+    )
+
+
+class MinemonitorWorkerBinarySensor(MinemonitorEntity, BinarySensorEntity):
+    """Binary sensor reporting whether a worker is connected to the pool."""
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        description: BinarySensorEntityDescription,
+        entry: ConfigEntry,
+        btc_address: str,
+        worker_key: str,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._btc_address = btc_address
+        self._worker_key = worker_key
+        self._endpoint = client_endpoint(btc_address)
+
+        worker_data = coordinator.get_worker(btc_address, worker_key)
+        worker_name = (worker_data and worker_data.name) or worker_key
+        self._attr_unique_id = f"{entry.entry_id}_{btc_address}_{worker_key}_{description.key}"
+        self._attr_name = f"{worker_name} {description.name}"
+
+        # Same device as the sensors of the worker
+        host = entry.data[CONF_HOST]
+        port = entry.data.get(CONF_PORT)
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.worker_device_identifier(btc_address, worker_key))},
+            name=f"Worker {worker_name}",
+            manufacturer="MineMonitor",
+            model="Mining Worker",
+            via_device=(DOMAIN, f"{host}:{port}"),
+            configuration_url=f"http://{host}:{port}/api/client/{btc_address}",
+        )
+
+    @property
+    def _worker_state(self) -> Optional[str]:
+        """Return the online, warning or offline state computed by the coordinator."""
+        return self.coordinator.worker_states.get((self._btc_address, self._worker_key))
+
+    @property
+    def is_on(self) -> Optional[bool]:
+        """Return True unless the worker is offline."""
+        state = self._worker_state
+        return state != WORKER_OFFLINE if state is not None else None
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return (
+            self.coordinator.last_update_success
+            and self.coordinator.is_endpoint_available(self._endpoint)
+            and self._worker_state is not None
+        )
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the worker state and its address."""
+        attributes = {
+            "status": self._worker_state,
+            "btc_address": self._btc_address,
+        }
+        status = self.coordinator.endpoint_status(self._endpoint)
+        if status is not None:
+            attributes.update(status.as_attributes())
+        return attributes
@@ -5,7 +5,7 @@ import logging
 import voluptuous as vol
 import aiohttp
 import asyncio
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from urllib.parse import urlparse
 
 from homeassistant import config_entries
@@ -18,12 +18,104 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from . import DOMAIN, CONF_BTC_ADDRESSES, DEFAULT_PORT, DEFAULT_SCAN_INTERVAL
+from . import (
+    DOMAIN,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ATTRIBUTES_ON_HASHRATE_ONLY,
+    CONF_BTC_ADDRESSES,
+    CONF_HASHRATE_TOLERANCE,
+    CONF_INFO_SCAN_INTERVAL,
+    CONF_MAX_CONCURRENCY,
+    CONF_NETWORK_SCAN_INTERVAL,
+    CONF_OFFLOAD_MODE,
+    CONF_OFFLOAD_THRESHOLD,
+    CONF_REQUEST_TIMEOUT,
+    CONF_STALE_TIMEOUT,
+    CONF_STATISTICS_WINDOW,
+    CONF_WORKER_ATTRIBUTES,
+    CONF_WORKER_OFFLINE_AFTER,
+    CONF_WORKER_REMOVAL_GRACE,
+    CONF_WORKER_STATISTICS,
+    CONF_WORKER_WARNING_AFTER,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_ATTRIBUTES_ON_HASHRATE_ONLY,
+    DEFAULT_HASHRATE_TOLERANCE,
+    DEFAULT_INFO_SCAN_INTERVAL,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_NETWORK_SCAN_INTERVAL,
+    DEFAULT_OFFLOAD_MODE,
+    DEFAULT_OFFLOAD_THRESHOLD,
+    DEFAULT_PORT,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_TIMEOUT,
+    DEFAULT_STATISTICS_WINDOW,
+    DEFAULT_WORKER_ATTRIBUTES,
+    DEFAULT_WORKER_OFFLINE_AFTER,
+    DEFAULT_WORKER_REMOVAL_GRACE,
+    DEFAULT_WORKER_STATISTICS,
+    DEFAULT_WORKER_WARNING_AFTER,
+    HISTORY_HOURS,
+    OFFLOAD_MODES,
+)
+from .address import is_valid_btc_address
 
 _LOGGER = logging.getLogger(__name__)
 
+# Addresses probed at once while validating them
+PROBE_CONCURRENCY = 32
+
+
+async def async_test_connection(
+    hass: HomeAssistant,
+    host: str,
+    port: int,
+    btc_addresses: List[str],
+    known_addresses: Iterable[str] = (),
+) -> None:
+    """Test connection to the server and verify BTC addresses.
+
+    Every address is checked locally first, then the addresses that aren't
+    known yet are queried on the server concurrently, along with the info
+    endpoint. The probe uses a short-lived session of its own, so that the
+    connection pool shared by the entries of the server keeps the size of
+    their concurrency setting.
+    """
+    invalid = [addr for addr in btc_addresses if not is_valid_btc_address(addr)]
+    if invalid:
+        raise InvalidBTCAddress(invalid)
+    
+    known = set(known_addresses)
+    to_probe = [addr for addr in dict.fromkeys(btc_addresses) if addr not in known]
+    
+    base_url = f"http://{host}:{port}/api"
+    timeout = aiohttp.ClientTimeout(total=DEFAULT_REQUEST_TIMEOUT)
+    
+    try:
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=PROBE_CONCURRENCY), timeout=timeout
+        ) as session:
+            
+            async def probe(url: str) -> int:
+                async with session.get(url) as response:
+                    return response.status
+            
+            # The info endpoint verifies server connectivity
+            statuses = await asyncio.gather(
+                probe(f"{base_url}/info"),
+                *(probe(f"{base_url}/client/{addr}") for addr in to_probe),
+            )
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        raise CannotConnect from err
+    
+    if statuses[0] != 200:
+        raise CannotConnect
+    rejected = [addr for addr, status in zip(to_probe, statuses[1:]) if status != 200]
+    if rejected:
+        raise RejectedBTCAddress(rejected)
+
+
 class MinemonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Bitcoin Mining."""
 
@@ -32,6 +124,7 @@ class MinemonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(self, user_input=None) -> FlowResult:
         """Handle the initial step."""
         errors = {}
+        placeholders = {"invalid_addresses": ""}
 
         if user_input is not None:
             host = user_input[CONF_HOST]
@@ -50,15 +143,16 @@ class MinemonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             
             # Validate connection and BTC addresses
             try:
-                await self._test_connection(host, port, btc_addresses)
+                await async_test_connection(self.hass, host, port, btc_addresses)
                 return self.async_create_entry(
                     title=f"Mining Server at {host}:{port}",
                     data=user_input,
                 )
             except CannotConnect:
                 errors["base"] = "cannot_connect"
-            except InvalidBTCAddress:
-                errors["base"] = "invalid_btc_address"
+            except InvalidBTCAddress as err:
+                errors[CONF_BTC_ADDRESSES] = err.error
+                placeholders["invalid_addresses"] = ", ".join(err.addresses)
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -75,35 +169,9 @@ class MinemonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 }
             ),
             errors=errors,
+            description_placeholders=placeholders,
         )
 
-    @staticmethod
-    async def _test_connection(host: str, port: int, btc_addresses: List[str]) -> None:
-        """Test connection to the server and verify BTC addresses."""
-        # Simple validation of BTC addresses (very basic check)
-        for addr in btc_addresses:
-            if not addr.startswith(("1", "3", "bc1")) or len(addr) < 26 or len(addr) > 42:
-                raise InvalidBTCAddress
-        
-        session = aiohttp.ClientSession()
-        try:
-            # Try to connect to the info endpoint first to verify server connectivity
-            url = f"http://{host}:{port}/api/info"
-            async with session.get(url, timeout=10) as response:
-                if response.status != 200:
-                    raise CannotConnect
-                
-            # Try to query at least one BTC address to verify it's valid and accessible
-            url = f"http://{host}:{port}/api/client/{btc_addresses[0]}"
-            async with session.get(url, timeout=10) as response:
-                if response.status != 200:
-                    raise InvalidBTCAddress
-                
-        except (aiohttp.ClientError, asyncio.TimeoutError):
-            raise CannotConnect
-        finally:
-            await session.close()
-
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -122,6 +190,10 @@ class BitcoinMiningOptionsFlow(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Manage the options."""
+        errors = {}
+        placeholders = {"invalid_addresses": ""}
+        config = {**self.config_entry.data, **self.config_entry.options}
+        
         if user_input is not None:
             # Process comma-separated BTC addresses
             if CONF_BTC_ADDRESSES in user_input:
@@ -131,10 +203,40 @@ class BitcoinMiningOptionsFlow(config_entries.OptionsFlow):
                         addr.strip() for addr in btc_addresses.split(",")
                     ]
 
-            return self.async_create_entry(title="", data=user_input)
+            # Process comma-separated worker attributes
+            if CONF_WORKER_ATTRIBUTES in user_input:
+                user_input[CONF_WORKER_ATTRIBUTES] = [
+                    attr.strip()
+                    for attr in user_input[CONF_WORKER_ATTRIBUTES].split(",")
+                    if attr.strip()
+                ]
+
+            if user_input.get(
+                CONF_WORKER_OFFLINE_AFTER, DEFAULT_WORKER_OFFLINE_AFTER
+            ) <= user_input.get(CONF_WORKER_WARNING_AFTER, DEFAULT_WORKER_WARNING_AFTER):
+                errors[CONF_WORKER_OFFLINE_AFTER] = "offline_before_warning"
+            else:
+                # Only the addresses that aren't monitored yet are queried
+                try:
+                    await async_test_connection(
+                        self.hass,
+                        config[CONF_HOST],
+                        config.get(CONF_PORT, DEFAULT_PORT),
+                        user_input[CONF_BTC_ADDRESSES],
+                        config.get(CONF_BTC_ADDRESSES, []),
+                    )
+                    return self.async_create_entry(title="", data=user_input)
+                except CannotConnect:
+                    errors["base"] = "cannot_connect"
+                except InvalidBTCAddress as err:
+                    errors[CONF_BTC_ADDRESSES] = err.error
+                    placeholders["invalid_addresses"] = ", ".join(err.addresses)
+            
+            # Show the submitted values again
+            config = {**config, **user_input}
 
         # Prepare BTC addresses for display
-        btc_addresses = self.config_entry.data.get(CONF_BTC_ADDRESSES, [])
+        btc_addresses = config.get(CONF_BTC_ADDRESSES, [])
         if isinstance(btc_addresses, list):
             btc_addresses_str = ", ".join(btc_addresses)
         else:
@@ -146,11 +248,84 @@ class BitcoinMiningOptionsFlow(config_entries.OptionsFlow):
             ): str,
             vol.Optional(
                 CONF_SCAN_INTERVAL,
-                default=self.config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                default=config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
             ): int,
+            vol.Optional(
+                CONF_NETWORK_SCAN_INTERVAL,
+                default=config.get(CONF_NETWORK_SCAN_INTERVAL, DEFAULT_NETWORK_SCAN_INTERVAL),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_INFO_SCAN_INTERVAL,
+                default=config.get(CONF_INFO_SCAN_INTERVAL, DEFAULT_INFO_SCAN_INTERVAL),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_ADAPTIVE_POLLING,
+                default=config.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+            ): bool,
+            vol.Optional(
+                CONF_MAX_CONCURRENCY,
+                default=config.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_REQUEST_TIMEOUT,
+                default=config.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_STALE_TIMEOUT,
+                default=config.get(CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT),
+            ): vol.All(int, vol.Range(min=0)),
+            vol.Optional(
+                CONF_WORKER_REMOVAL_GRACE,
+                default=config.get(CONF_WORKER_REMOVAL_GRACE, DEFAULT_WORKER_REMOVAL_GRACE),
+            ): vol.All(int, vol.Range(min=0)),
+            vol.Optional(
+                CONF_HASHRATE_TOLERANCE,
+                default=config.get(CONF_HASHRATE_TOLERANCE, DEFAULT_HASHRATE_TOLERANCE),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            vol.Optional(
+                CONF_WORKER_ATTRIBUTES,
+                default=", ".join(
+                    config.get(CONF_WORKER_ATTRIBUTES, DEFAULT_WORKER_ATTRIBUTES)
+                ),
+            ): str,
+            vol.Optional(
+                CONF_ATTRIBUTES_ON_HASHRATE_ONLY,
+                default=config.get(
+                    CONF_ATTRIBUTES_ON_HASHRATE_ONLY, DEFAULT_ATTRIBUTES_ON_HASHRATE_ONLY
+                ),
+            ): bool,
+            vol.Optional(
+                CONF_WORKER_WARNING_AFTER,
+                default=config.get(CONF_WORKER_WARNING_AFTER, DEFAULT_WORKER_WARNING_AFTER),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_WORKER_OFFLINE_AFTER,
+                default=config.get(CONF_WORKER_OFFLINE_AFTER, DEFAULT_WORKER_OFFLINE_AFTER),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_WORKER_STATISTICS,
+                default=config.get(CONF_WORKER_STATISTICS, DEFAULT_WORKER_STATISTICS),
+            ): bool,
+            vol.Optional(
+                CONF_STATISTICS_WINDOW,
+                default=config.get(CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW),
+            ): vol.All(int, vol.Range(min=1, max=HISTORY_HOURS * 60)),
+            vol.Optional(
+                CONF_OFFLOAD_MODE,
+                default=config.get(CONF_OFFLOAD_MODE, DEFAULT_OFFLOAD_MODE),
+            ): vol.In(OFFLOAD_MODES),
+            vol.Optional(
+                CONF_OFFLOAD_THRESHOLD,
+                default=config.get(CONF_OFFLOAD_THRESHOLD, DEFAULT_OFFLOAD_THRESHOLD),
+            ): vol.All(int, vol.Range(min=1)),
         }
 
-        return self.async_show_form(step_id="init", data_schema=vol.Schema(options))
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(options),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
 
 
 class CannotConnect(HomeAssistantError):
@@ -158,4 +333,17 @@ class CannotConnect(HomeAssistantError):
 
 
 class InvalidBTCAddress(HomeAssistantError):
-    """Error to indicate an invalid BTC address."""
+    """Error to indicate invalid BTC addresses."""
+
+    error = "invalid_btc_address"
+
+    def __init__(self, addresses: List[str]) -> None:
+        """Initialize with the offending addresses."""
+        super().__init__(", ".join(addresses))
+        self.addresses = addresses
+
+
+class RejectedBTCAddress(InvalidBTCAddress):
+    """Error to indicate BTC addresses the mining server doesn't accept."""
+
+    error = "rejected_btc_address"
@@ -0,0 +1,70 @@
+"""Diagnostics support for MineMonitor integration."""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import CONF_BTC_ADDRESSES, DOMAIN
+
+TO_REDACT = {CONF_BTC_ADDRESSES}
+
+
+def _redact_endpoint(endpoint: str) -> str:
+    """Shorten the BTC address of a client endpoint, like the device names."""
+    prefix, _, btc_address = endpoint.partition("/")
+    if not btc_address:
+        return endpoint
+    return f"{prefix}/{btc_address[:6]}...{btc_address[-6:]}"
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    endpoints = {}
+    for endpoint in coordinator.endpoints.keys() | coordinator.metrics.keys():
+        status = coordinator.endpoint_status(endpoint)
+        metrics = coordinator.metrics.get(endpoint)
+        schedule = coordinator.schedules.get(endpoint)
+        endpoints[_redact_endpoint(endpoint)] = {
+            "metrics": metrics.as_dict() if metrics else None,
+            "consecutive_errors": status.consecutive_errors if status else None,
+            "error_count": status.error_count if status else None,
+            "last_error": status.last_error if status else None,
+            "last_success": (
+                status.last_success.isoformat() if status and status.last_success else None
+            ),
+            "poll_interval": (
+                schedule.interval.total_seconds() if schedule else None
+            ),
+        }
+
+    return {
+        "config": async_redact_data({**entry.data, **entry.options}, TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "last_update_duration_ms": (
+            round(coordinator.last_update_duration * 1000, 1)
+            if coordinator.last_update_duration is not None
+            else None
+        ),
+        "loop_time_ms": (
+            round(coordinator.loop_time * 1000, 1)
+            if coordinator.loop_time is not None
+            else None
+        ),
+        "offload_mode": coordinator.offload_mode,
+        "offload_time_ms": (
+            round(coordinator.offload_time * 1000, 1)
+            if coordinator.offload_time is not None
+            else None
+        ),
+        "addresses": len(coordinator.btc_addresses),
+        "workers_processed": coordinator.workers_processed,
+        "bulk_endpoint_supported": coordinator.batch_supported,
+        "endpoints": dict(sorted(endpoints.items())),
+    }
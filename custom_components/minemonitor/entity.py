@@ -0,0 +1,93 @@
+"""Base entity for MineMonitor integration."""
+from __future__ import annotations
+
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import (
+    CONF_ATTRIBUTES_ON_HASHRATE_ONLY,
+    CONF_HASHRATE_TOLERANCE,
+    CONF_WORKER_ATTRIBUTES,
+    DEFAULT_ATTRIBUTES_ON_HASHRATE_ONLY,
+    DEFAULT_HASHRATE_TOLERANCE,
+    DEFAULT_WORKER_ATTRIBUTES,
+)
+
+
+def hashrate_tolerance(entry: ConfigEntry) -> float:
+    """Return the configured hashrate tolerance as a fraction."""
+    config = {**entry.data, **entry.options}
+    return config.get(CONF_HASHRATE_TOLERANCE, DEFAULT_HASHRATE_TOLERANCE) / 100
+
+
+def worker_attribute_policy(entry: ConfigEntry) -> Tuple[FrozenSet[str], bool]:
+    """Return the allowed worker attributes and whether only the hashrate sensor gets them."""
+    config = {**entry.data, **entry.options}
+    return (
+        frozenset(config.get(CONF_WORKER_ATTRIBUTES, DEFAULT_WORKER_ATTRIBUTES)),
+        config.get(CONF_ATTRIBUTES_ON_HASHRATE_ONLY, DEFAULT_ATTRIBUTES_ON_HASHRATE_ONLY),
+    )
+
+
+class MinemonitorEntity(CoordinatorEntity):
+    """Coordinator entity that only writes its state when it changed.
+
+    Most values, like the network difficulty or the best difficulties, stay
+    the same across refreshes. Skipping those writes keeps the event bus and
+    the recorder free of duplicate states.
+    """
+
+    # Relative change of a numeric value that is ignored, 0 writes every change
+    _state_tolerance: float = 0.0
+    # Attributes left out of the comparison, only written along with another change
+    _volatile_attributes: FrozenSet[str] = frozenset()
+    _last_written_state: Optional[Tuple[bool, Any, Optional[Dict[str, Any]]]] = None
+
+    def _comparable_value(self) -> Any:
+        """Return the value compared to detect a state change."""
+        return self.state
+
+    def _comparable_attributes(self) -> Optional[Dict[str, Any]]:
+        """Return the attributes compared to detect a state change."""
+        attributes = self.extra_state_attributes
+        if attributes and self._volatile_attributes:
+            return {
+                key: value
+                for key, value in attributes.items()
+                if key not in self._volatile_attributes
+            }
+        return attributes
+
+    def _within_tolerance(self, value: Any, last_value: Any) -> bool:
+        """Return True if a numeric value moved less than the tolerance."""
+        if not self._state_tolerance:
+            return False
+        if not all(
+            isinstance(v, (int, float)) and not isinstance(v, bool)
+            for v in (value, last_value)
+        ):
+            return False
+        return abs(value - last_value) <= abs(last_value) * self._state_tolerance
+
+    def _state_changed(self) -> bool:
+        """Return True and remember the state if it differs from the last write."""
+        state = (self.available, self._comparable_value(), self._comparable_attributes())
+        last = self._last_written_state
+        if (
+            last is not None
+            and state[0] == last[0]
+            and state[2] == last[2]
+            and (state[1] == last[1] or self._within_tolerance(state[1], last[1]))
+        ):
+            return False
+        self._last_written_state = state
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if it changed since the last refresh."""
+        if self._state_changed():
+            self.async_write_ha_state()
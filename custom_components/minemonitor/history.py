@@ -0,0 +1,192 @@
+"""In-memory hashrate history for the MineMonitor integration."""
+from __future__ import annotations
+
+import base64
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+NAN = float("nan")
+# Samples are single precision, timestamps and running sums double precision
+SAMPLE_TYPECODE = "f"
+
+
+def worker_series(btc_address: str, worker_key: str) -> str:
+    """Return the history series key of a worker."""
+    return f"{btc_address}/{worker_key}"
+
+
+def _encode(values: array) -> str:
+    """Encode an array for JSON storage."""
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode(typecode: str, encoded: str) -> array:
+    """Decode an array encoded by _encode."""
+    values = array(typecode)
+    values.frombytes(base64.b64decode(encoded))
+    return values
+
+
+class HashrateHistory:
+    """Ring buffer of hashrate samples for every worker and address of an entry.
+
+    All series are sampled at the same times, so one ring of timestamps is
+    shared by fixed-size float arrays, one per series, with NaN marking a
+    missing sample. Running sums over each averaging window are updated as
+    samples enter and leave the window, so averages cost O(1) per sample.
+
+    Samples are stored in single precision, which is plenty for hashrates
+    and halves the memory of large fleets.
+    """
+
+    def __init__(self, capacity: int, windows: Sequence[float]) -> None:
+        """Initialize with room for capacity samples and the window lengths in seconds."""
+        self.capacity = capacity
+        self.windows = list(windows)
+        self._reset()
+
+    def _reset(self) -> None:
+        """Drop all samples and series."""
+        self._times = array("d", [0.0]) * self.capacity
+        self._series: Dict[str, array] = {}
+        # Per series, the sum and the number of samples in each window
+        self._sums: Dict[str, array] = {}
+        # Sequence number of the oldest sample in each window
+        self._window_start = [0] * len(self.windows)
+        # Number of samples appended since the history was created
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples kept."""
+        return min(self._count, self.capacity)
+
+    @property
+    def last_time(self) -> Optional[float]:
+        """Return the timestamp of the newest sample, None without samples."""
+        if not self._count:
+            return None
+        return self._times[(self._count - 1) % self.capacity]
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if the history has a series for the key."""
+        return key in self._series
+
+    def append(self, timestamp: float, values: Mapping[str, float]) -> None:
+        """Add a sample for every series, series missing from values get NaN."""
+        seq = self._count
+        # Samples older than this are overwritten by this append
+        oldest_kept = seq + 1 - self.capacity
+        for window, seconds in enumerate(self.windows):
+            start = self._window_start[window]
+            while start < seq and (
+                start < oldest_kept
+                or self._times[start % self.capacity] <= timestamp - seconds
+            ):
+                self._evict(window, start % self.capacity)
+                start += 1
+            self._window_start[window] = start
+
+        idx = seq % self.capacity
+        self._times[idx] = timestamp
+        for key in values.keys() - self._series.keys():
+            self._add_series(key)
+        for key, series in self._series.items():
+            series[idx] = values.get(key, NAN)
+            # The sums get the rounded value, that is later evicted
+            value = series[idx]
+            if value == value:  # Not NaN
+                sums = self._sums[key]
+                for window in range(len(self.windows)):
+                    sums[2 * window] += value
+                    sums[2 * window + 1] += 1
+        self._count += 1
+
+    def _add_series(self, key: str) -> array:
+        """Add an empty series and its running sums."""
+        series = self._series[key] = array(SAMPLE_TYPECODE, [NAN]) * self.capacity
+        self._sums[key] = array("d", [0.0]) * (2 * len(self.windows))
+        return series
+
+    def _evict(self, window: int, idx: int) -> None:
+        """Remove the sample at idx from the running sums of a window."""
+        for key, series in self._series.items():
+            value = series[idx]
+            if value == value:  # Not NaN
+                sums = self._sums[key]
+                sums[2 * window] -= value
+                sums[2 * window + 1] -= 1
+
+    def remove(self, key: str) -> None:
+        """Drop the series of a worker or address."""
+        self._series.pop(key, None)
+        self._sums.pop(key, None)
+
+    def mean(self, key: str, window: int) -> Optional[float]:
+        """Return the average of a series over a window, None without samples."""
+        sums = self._sums.get(key)
+        if sums is None or not sums[2 * window + 1]:
+            return None
+        return max(sums[2 * window] / sums[2 * window + 1], 0.0)
+
+    def samples(self, key: str, since: float) -> List[Tuple[float, float]]:
+        """Return the (timestamp, value) samples of a series since a time."""
+        series = self._series.get(key)
+        if series is None:
+            return []
+        samples = []
+        for seq in range(max(self._count - self.capacity, 0), self._count):
+            idx = seq % self.capacity
+            value = series[idx]
+            if self._times[idx] >= since and value == value:
+                samples.append((self._times[idx], value))
+        return samples
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the samples in a compact form for storage."""
+        order = [seq % self.capacity for seq in range(max(self._count - self.capacity, 0), self._count)]
+        return {
+            "times": _encode(array("d", (self._times[idx] for idx in order))),
+            "typecode": SAMPLE_TYPECODE,
+            "series": {
+                key: _encode(array(SAMPLE_TYPECODE, (series[idx] for idx in order)))
+                for key, series in self._series.items()
+            },
+        }
+
+    def restore(self, stored: Dict[str, Any]) -> None:
+        """Load samples saved by as_dict, dropping any already appended.
+
+        The arrays and the running sums are rebuilt directly from the stored
+        samples, which are in chronological order, instead of appending them
+        one by one.
+        """
+        times = _decode("d", stored["times"])[-self.capacity:]
+        # Histories saved before single precision samples stored doubles
+        typecode = stored.get("typecode", "d")
+        count = len(times)
+        self._reset()
+        if not count:
+            return
+        self._times[:count] = times
+        self._count = count
+        newest = times[-1]
+        self._window_start = [
+            bisect_right(times, newest - seconds) for seconds in self.windows
+        ]
+        for key, encoded in stored.get("series", {}).items():
+            values = _decode(typecode, encoded)[-count:]
+            if typecode != SAMPLE_TYPECODE:
+                values = array(SAMPLE_TYPECODE, values)
+            present = [value == value for value in values]
+            if not any(present):
+                continue
+            series = self._add_series(key)
+            series[:len(values)] = values
+            sums = self._sums[key]
+            for window, start in enumerate(self._window_start):
+                in_window = [
+                    value for value, ok in zip(values[start:], present[start:]) if ok
+                ]
+                sums[2 * window] = sum(in_window)
+                sums[2 * window + 1] = len(in_window)
@@ -0,0 +1,144 @@
+"""Resources shared by all config entries polling the same mining server."""
+from __future__ import annotations
+
+import asyncio
+import ssl
+import time
+from dataclasses import replace
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+import aiohttp
+
+from .models import FetchResult
+
+# Idle connections are kept open across polls at the default scan interval
+KEEPALIVE_TIMEOUT = 75  # seconds
+DNS_CACHE_TTL = 300  # seconds
+
+
+class PoolHost:
+    """Connection pool and cache of the global endpoints of one mining server.
+
+    All requests of the coordinators and the services to the server go
+    through one keep-alive session whose connection limit is the highest
+    fetch concurrency of its users, so polls reuse open connections.
+
+    The network and info payloads don't depend on the BTC address, so config
+    entries pointing at the same server share them. A payload younger than the
+    caller's max age is returned from the cache, and concurrent callers of an
+    endpoint that is being fetched wait on the same in-flight request.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        """Initialize with the default headers and SSL context of the session."""
+        self.base_url = base_url
+        self.users = 0
+        # Highest fetch concurrency of the users, applied when the session is created
+        self.connection_limit = 0
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._headers = headers
+        self._ssl_context = ssl_context
+        # Sessions replaced by one with a higher limit, closed once their
+        # requests in flight are done
+        self._retired: List[aiohttp.ClientSession] = []
+        # Cancels the delayed close scheduled when the last user left
+        self.cancel_close: Optional[Callable[[], None]] = None
+        self._cache: Dict[str, Tuple[float, FetchResult]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def request_limit(self, limit: int) -> Optional[aiohttp.ClientSession]:
+        """Apply the fetch concurrency of a new user, before it is counted.
+
+        While the session is in use the limit can only grow, a lingering
+        session nobody uses anymore is sized for the new user instead. The
+        connection limit of a session can't change, so when the limit does,
+        the session is retired and the next get_session creates one with the
+        new limit. Returns the retired session, for the caller to close with
+        async_close_retired once its requests in flight are done.
+        """
+        if self.users > 0:
+            limit = max(self.connection_limit, limit)
+        if limit == self.connection_limit:
+            return None
+        self.connection_limit = limit
+        session, self.session = self.session, None
+        if session is not None:
+            self._retired.append(session)
+        return session
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Return the keep-alive session of the server, creating it if needed."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.connection_limit or 100,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=DNS_CACHE_TTL,
+                    ssl=self._ssl_context if self._ssl_context is not None else True,
+                ),
+                headers=self._headers,
+            )
+        return self.session
+
+    async def async_close_retired(self, session: aiohttp.ClientSession) -> None:
+        """Close a session retired by request_limit."""
+        if session in self._retired:
+            self._retired.remove(session)
+            await session.close()
+
+    async def async_close(self) -> None:
+        """Close the sessions and drop the cached payloads."""
+        for session in list(self._retired):
+            await self.async_close_retired(session)
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        self._cache.clear()
+
+    async def async_fetch(
+        self,
+        endpoint: str,
+        fetch: Callable[[Optional[FetchResult]], Awaitable[FetchResult]],
+        max_age: float,
+    ) -> FetchResult:
+        """Return the response of an endpoint, fetching it if the cache is too old.
+
+        The fetch callable receives the cached response, to make a conditional
+        request with its validators, and a not modified response refreshes
+        the cached one.
+        """
+        cached = self._cache.get(endpoint)
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+
+        task = self._inflight.get(endpoint)
+        if task is None:
+            task = asyncio.create_task(self._async_fetch(endpoint, fetch))
+            # Retrieve the exception in case every waiter has been cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[endpoint] = task
+
+        # Shield the shared request from the cancellation of a single waiter
+        return await asyncio.shield(task)
+
+    async def _async_fetch(
+        self,
+        endpoint: str,
+        fetch: Callable[[Optional[FetchResult]], Awaitable[FetchResult]],
+    ) -> FetchResult:
+        """Fetch an endpoint and store the result in the cache."""
+        cached = self._cache.get(endpoint)
+        try:
+            result = await fetch(cached[1] if cached else None)
+            if result.not_modified and cached is not None:
+                result = replace(cached[1], max_age=result.max_age, timing=result.timing)
+            # Cache hits didn't make a request, so they carry no timing
+            self._cache[endpoint] = (time.monotonic(), replace(result, timing=None))
+            return result
+        finally:
+            self._inflight.pop(endpoint, None)
@@ -0,0 +1,294 @@
+"""Data models for the MineMonitor integration."""
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterable, Optional, Set, Tuple
+
+# Number of recent fetches the duration percentiles are computed over
+METRICS_SAMPLES = 100
+
+
+@dataclass
+class EndpointStatus:
+    """Result of the most recent fetches of a single API endpoint.
+
+    The last good payload is kept when a fetch fails, so entities backed by
+    this endpoint can keep reporting it (flagged as stale) instead of
+    becoming unavailable on a single failed request.
+    """
+
+    data: Any = None
+    last_success: Optional[datetime] = None
+    last_error: Optional[str] = None
+    error_count: int = 0
+    consecutive_errors: int = 0
+    # Validators of the last response, used to make conditional requests
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[bytes] = None
+    # Payload restored from the snapshot of the previous run, not fetched yet
+    restored: bool = False
+
+    @property
+    def has_data(self) -> bool:
+        """Return True if the endpoint was fetched successfully at least once."""
+        return self.last_success is not None
+
+    @property
+    def stale(self) -> bool:
+        """Return True if the kept payload is older than the latest attempt."""
+        return self.consecutive_errors > 0 or self.restored
+
+    def record_success(self, data: Any, now: datetime) -> None:
+        """Store a freshly fetched payload."""
+        self.data = data
+        self.last_success = now
+        self.last_error = None
+        self.consecutive_errors = 0
+        self.restored = False
+
+    def record_failure(self, error: str) -> None:
+        """Record a failed fetch, keeping the last good payload."""
+        self.last_error = error
+        self.error_count += 1
+        self.consecutive_errors += 1
+
+    def is_available(self, now: datetime, stale_timeout: timedelta) -> bool:
+        """Return True if the payload is fresh or stale for less than the timeout."""
+        if self.last_success is None:
+            return False
+        # Restored payloads are kept until the first attempt to refresh them
+        if not self.consecutive_errors:
+            return True
+        return now - self.last_success <= stale_timeout
+
+    def as_attributes(self) -> Dict[str, Any]:
+        """Return state attributes describing a stale endpoint.
+
+        Nothing is reported while the endpoint is healthy so that successful
+        updates don't change the attributes of every entity.
+        """
+        if not self.stale:
+            return {}
+        attributes = {
+            "stale": True,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "consecutive_errors": self.consecutive_errors,
+            "error_count": self.error_count,
+        }
+        if self.restored:
+            attributes["restored"] = True
+        return attributes
+
+
+@dataclass
+class FetchResult:
+    """Response of a single request to the mining server."""
+
+    data: Any = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[bytes] = None  # Hash of the raw body
+    max_age: Optional[float] = None  # seconds, from the Cache-Control header
+    not_modified: bool = False
+    # Only set on the result of an actual request, not on cached results
+    timing: Optional[FetchTiming] = None
+
+
+@dataclass
+class FetchTiming:
+    """Measurements of a single request."""
+
+    duration: float  # seconds, from sending the request to the decoded body
+    size: int  # bytes of the body, 0 when not modified
+    decode_time: float  # seconds spent decoding the body
+    offloaded: bool = False  # decoded in an executor instead of the event loop
+
+
+@dataclass
+class EndpointMetrics:
+    """Measurements of the recent requests to an endpoint."""
+
+    durations: Deque[float] = field(default_factory=lambda: deque(maxlen=METRICS_SAMPLES))
+    last: Optional[FetchTiming] = None
+    requests: int = 0
+
+    def record(self, timing: FetchTiming) -> None:
+        """Add the measurements of a request."""
+        self.durations.append(timing.duration)
+        self.last = timing
+        self.requests += 1
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Return a percentile of the recent durations, in seconds."""
+        if not self.durations:
+            return None
+        durations = sorted(self.durations)
+        return durations[max(math.ceil(percent / 100 * len(durations)), 1) - 1]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the measurements, with the times in milliseconds."""
+        if self.last is None:
+            return {"requests": 0}
+        return {
+            "requests": self.requests,
+            "last_duration_ms": round(self.last.duration * 1000, 1),
+            "p50_duration_ms": round(self.percentile(50) * 1000, 1),
+            "p95_duration_ms": round(self.percentile(95) * 1000, 1),
+            "response_bytes": self.last.size,
+            "decode_time_ms": round(self.last.decode_time * 1000, 1),
+            "decode_offloaded": self.last.offloaded,
+        }
+
+
+@dataclass
+class PollSchedule:
+    """Polling interval of an endpoint that adapts to how often it changes.
+
+    The interval doubles, up to max_interval, every time the endpoint returns
+    the same payload, and drops back to base_interval as soon as it changes.
+    Failed requests are retried after base_interval, then after twice the
+    previous delay, up to max_interval, until a request succeeds.
+    """
+
+    base_interval: timedelta
+    max_interval: timedelta
+    adaptive: bool = True
+    interval: Optional[timedelta] = None
+    next_due: Optional[datetime] = None
+    # Delay before retrying after the last failed request, None after a success
+    retry_delay: Optional[timedelta] = None
+
+    def __post_init__(self) -> None:
+        """Start polling at the base interval."""
+        if self.interval is None:
+            self.interval = self.base_interval
+
+    def is_due(self, when: datetime) -> bool:
+        """Return True if the endpoint should be fetched at the given time."""
+        return self.next_due is None or when >= self.next_due
+
+    def record(self, now: datetime, changed: bool, max_age: Optional[float] = None) -> None:
+        """Schedule the next fetch after a successful request."""
+        self.retry_delay = None
+        if changed or not self.adaptive:
+            self.interval = self.base_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        delay = self.interval
+        # Don't poll again before the server says the response can change
+        if max_age:
+            delay = max(delay, timedelta(seconds=max_age))
+        self.next_due = now + delay
+
+    def record_failure(self, now: datetime) -> None:
+        """Schedule the next attempt after a failed request."""
+        if self.retry_delay is None or not self.adaptive:
+            self.retry_delay = self.base_interval
+        else:
+            self.retry_delay = min(self.retry_delay * 2, self.max_interval)
+        # Polling starts over at the base interval once the server answers
+        self.interval = self.base_interval
+        self.next_due = now + self.retry_delay
+
+    def reset(self) -> None:
+        """Fetch again on the next update, at the base interval."""
+        self.interval = self.base_interval
+        self.next_due = None
+        self.retry_delay = None
+
+
+@dataclass
+class AddressTotals:
+    """Hashrate and worker counts of a single BTC address."""
+
+    hashrate: float = 0.0  # H/s
+    active_workers: int = 0
+    total_workers: int = 0
+
+
+@dataclass
+class AggregateSnapshot:
+    """Totals across all addresses, computed once per update."""
+
+    hashrate: float = 0.0  # H/s
+    active_workers: int = 0
+    total_workers: int = 0
+    addresses: Dict[str, AddressTotals] = field(default_factory=dict)
+    network_share: Optional[float] = None  # Percentage of the network hashrate
+
+
+@dataclass
+class WorkerDelta:
+    """Workers that appeared or were removed during an update.
+
+    Workers are identified by their (address, worker key) index key. The
+    addresses added or removed in place are passed along as well.
+    """
+
+    added: Set[Tuple[str, str]] = field(default_factory=set)
+    removed: Set[Tuple[str, str]] = field(default_factory=set)
+    added_addresses: Set[str] = field(default_factory=set)
+    removed_addresses: Set[str] = field(default_factory=set)
+
+
+# API names of the worker fields stored in a slot of WorkerRecord
+WORKER_RECORD_FIELDS = ("name", "sessionId", "hashRate", "bestDifficulty", "lastSeen")
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Return a number of a payload as a float, None if it isn't one."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(slots=True)
+class WorkerRecord:
+    """Worker of a client payload, with its numbers already converted.
+
+    Only the fields used by the sensors get a slot, the other fields kept as
+    attributes are stored in extra under their API name.
+    """
+
+    name: Optional[str] = None
+    session_id: Optional[str] = None
+    hashrate: Optional[float] = None  # H/s
+    best_difficulty: Optional[float] = None
+    last_seen: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_payload(
+        cls, worker: Any, extra_fields: Iterable[str] = ()
+    ) -> Optional[WorkerRecord]:
+        """Create a record from a worker of a client payload."""
+        if not isinstance(worker, dict):
+            return None
+        extra = {key: worker[key] for key in extra_fields if key in worker}
+        return cls(
+            name=worker.get("name"),
+            session_id=worker.get("sessionId"),
+            hashrate=_to_float(worker.get("hashRate")),
+            best_difficulty=_to_float(worker.get("bestDifficulty")),
+            last_seen=worker.get("lastSeen"),
+            extra=extra or None,
+        )
+
+    def as_payload(self) -> Dict[str, Any]:
+        """Return the fields of the worker under their API name."""
+        payload = {
+            "name": self.name,
+            "sessionId": self.session_id,
+            "hashRate": self.hashrate,
+            "bestDifficulty": self.best_difficulty,
+            "lastSeen": self.last_seen,
+        }
+        payload = {key: value for key, value in payload.items() if value is not None}
+        if self.extra:
+            payload.update(self.extra)
+        return payload
@@ -0,0 +1,203 @@
+"""Incremental decoding of client payloads for the MineMonitor integration."""
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+from typing import Any, Callable, List, Optional, Tuple
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",]}" + _WHITESPACE
+
+
+# Turns a decoded worker into the object stored, None to drop it
+WorkerFactory = Callable[[Any], Any]
+
+
+def project_client(client: Any, make_worker: WorkerFactory) -> Any:
+    """Return a client payload whose workers went through make_worker."""
+    if isinstance(client, dict) and isinstance(client.get("workers"), list):
+        workers = (make_worker(worker) for worker in client["workers"])
+        client = {**client, "workers": [worker for worker in workers if worker is not None]}
+    return client
+
+
+def decode_body(
+    raw: bytes,
+    previous_hash: Optional[bytes],
+    loads: Callable[[bytes], Any],
+    make_worker: Optional[WorkerFactory] = None,
+    batch: bool = False,
+) -> Tuple[bytes, Any]:
+    """Hash and decode a whole body, converting the workers of client payloads.
+
+    Returns the hash of the body and its payload, None if the hash is
+    previous_hash. Only uses its arguments, so that it can run in an executor,
+    including a process pool when the arguments can be pickled.
+    """
+    content_hash = hashlib.blake2b(raw, digest_size=16).digest()
+    if content_hash == previous_hash:
+        return content_hash, None
+    payload = loads(raw)
+    if make_worker is not None:
+        payload = ClientPayloadParser(make_worker, batch).project(payload)
+    return content_hash, payload
+
+
+class _Frame:
+    """Object or array being decoded."""
+
+    __slots__ = ("role", "container", "key", "state")
+
+    def __init__(self, role: str, container: Any) -> None:
+        self.role = role
+        self.container = container
+        self.key: Optional[str] = None
+        self.state = "first"
+
+
+class ClientPayloadParser:
+    """Decode a client payload as its chunks arrive, converting each worker.
+
+    The workers array is decoded one worker at a time and each worker is
+    passed to make_worker straight away, so the complete payload with every
+    worker field is never built. The parser only buffers the text it hasn't
+    decoded yet; whoever feeds it decides how much of the raw body is kept.
+    With batch, the payload is an object mapping addresses to client
+    payloads.
+    """
+
+    def __init__(self, make_worker: WorkerFactory, batch: bool = False) -> None:
+        """Initialize with the function converting each worker."""
+        self.make_worker = make_worker
+        self.batch = batch
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._stack: List[_Frame] = []
+        self._result: Any = None
+        self._done = False
+
+    def project(self, payload: Any) -> Any:
+        """Convert the workers of a payload decoded in one go."""
+        if self.batch and isinstance(payload, dict):
+            return {
+                address: project_client(client, self.make_worker)
+                for address, client in payload.items()
+            }
+        return project_client(payload, self.make_worker)
+
+    def feed(self, chunk: bytes) -> None:
+        """Decode a chunk of the body."""
+        self._buffer += self._text.decode(chunk)
+        self._process(final=False)
+
+    def close(self) -> Any:
+        """Decode the rest of the body and return the payload.
+
+        Raises ValueError if the body isn't a complete JSON object.
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        self._process(final=True)
+        if not self._done or self._buffer.strip(_WHITESPACE):
+            raise ValueError("Incomplete or invalid client payload")
+        return self._result
+
+    def _decode(self, pos: int, final: bool) -> Optional[tuple]:
+        """Decode the value at pos, None if it may not be complete yet."""
+        try:
+            value, end = _DECODER.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError("Invalid client payload") from None
+            return None
+        # A number only ends at a delimiter, it may continue in the next chunk
+        if (
+            not final
+            and self._buffer[pos] not in '{["'
+            and (end == len(self._buffer) or self._buffer[end] not in _DELIMITERS)
+        ):
+            return None
+        return value, end
+
+    def _child_role(self, frame: _Frame, char: str) -> Optional[str]:
+        """Return the role of the container starting at char, None to decode it whole."""
+        if frame.role == "batch" and char == "{":
+            return "client"
+        if frame.role == "client" and frame.key == "workers" and char == "[":
+            return "workers"
+        return None
+
+    def _store(self, frame: _Frame, value: Any) -> None:
+        """Add a decoded value to a frame."""
+        if frame.role == "workers":
+            worker = self.make_worker(value)
+            if worker is not None:
+                frame.container.append(worker)
+        else:
+            frame.container[frame.key] = value
+        frame.state = "comma"
+
+    def _pop(self) -> None:
+        """Finish the innermost container."""
+        frame = self._stack.pop()
+        if self._stack:
+            self._store(self._stack[-1], frame.container)
+        else:
+            self._result = frame.container
+            self._done = True
+
+    def _process(self, final: bool) -> None:
+        """Decode as much of the buffer as possible."""
+        buffer = self._buffer
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer) or self._done:
+                break
+            char = buffer[pos]
+
+            if not self._stack:
+                if char != "{":
+                    raise ValueError("Client payload isn't an object")
+                self._stack.append(_Frame("batch" if self.batch else "client", {}))
+                pos += 1
+                continue
+
+            frame = self._stack[-1]
+            closing = "]" if frame.role == "workers" else "}"
+            if frame.state in ("first", "comma") and char == closing:
+                self._pop()
+                pos += 1
+            elif frame.state == "comma":
+                if char != ",":
+                    raise ValueError(f"Unexpected {char!r} in client payload")
+                frame.state = "next"
+                pos += 1
+            elif frame.role != "workers" and frame.state in ("first", "next"):
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    break
+                frame.key, pos = decoded
+                if not isinstance(frame.key, str):
+                    raise ValueError("Invalid key in client payload")
+                frame.state = "colon"
+            elif frame.state == "colon":
+                if char != ":":
+                    raise ValueError(f"Unexpected {char!r} in client payload")
+                frame.state = "value"
+                pos += 1
+            else:
+                role = self._child_role(frame, char)
+                if role is not None:
+                    self._stack.append(_Frame(role, [] if role == "workers" else {}))
+                    pos += 1
+                    continue
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    break
+                value, pos = decoded
+                self._store(frame, value)
+
+        self._buffer = buffer[pos:]
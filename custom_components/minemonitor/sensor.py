@@ -14,16 +14,29 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from . import DOMAIN  # Import just the DOMAIN constant
+from . import (
+    DOMAIN,
+    ENDPOINT_CLIENTS,
+    ENDPOINT_INFO,
+    ENDPOINT_NETWORK,
+    VOLATILE_WORKER_ATTRIBUTES,
+    WORKER_OFFLINE,
+    WORKER_ONLINE,
+    WORKER_WARNING,
+    client_endpoint,
+    signal_metrics_updated,
+    signal_workers_changed,
+)
+from .entity import MinemonitorEntity, hashrate_tolerance, worker_attribute_policy
+from .history import worker_series
+from .models import WorkerDelta
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,6 +58,26 @@ def format_difficulty(difficulty):
     except (ValueError, TypeError):
         return difficulty
 
+# Averaging window of the hashrate history used by each average sensor
+AVERAGE_HASHRATE_WINDOWS = {
+    "averageHashRate1h": "1h",
+    "averageHashRate24h": "24h",
+}
+
+# Percentile of the rolling statistics read by each percentile sensor
+HASHRATE_PERCENTILES = {
+    "hashRateP5": 5,
+    "hashRateP50": 50,
+    "hashRateP95": 95,
+}
+
+# Worker state counted by each worker count sensor of an address
+WORKER_STATE_COUNTS = {
+    "workersOnline": WORKER_ONLINE,
+    "workersWarning": WORKER_WARNING,
+    "workersOffline": WORKER_OFFLINE,
+}
+
 # Sensor types for client data
 CLIENT_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
     SensorEntityDescription(
@@ -59,6 +92,45 @@ CLIENT_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
         icon="mdi:account-group",
         state_class=SensorStateClass.MEASUREMENT,
     ),
+    SensorEntityDescription(
+        key="totalHashRate",
+        name="Total Hash Rate",
+        icon="mdi:lightning-bolt",
+        native_unit_of_measurement="TH/s",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="averageHashRate1h",
+        name="Average Hash Rate (1h)",
+        icon="mdi:chart-bell-curve-cumulative",
+        native_unit_of_measurement="TH/s",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="averageHashRate24h",
+        name="Average Hash Rate (24h)",
+        icon="mdi:chart-bell-curve-cumulative",
+        native_unit_of_measurement="TH/s",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="workersOnline",
+        name="Workers Online",
+        icon="mdi:lan-connect",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="workersWarning",
+        name="Workers Warning",
+        icon="mdi:lan-pending",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="workersOffline",
+        name="Workers Offline",
+        icon="mdi:lan-disconnect",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
 )
 
 # Total hashrate sensor
@@ -85,6 +157,66 @@ WORKER_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
         native_unit_of_measurement="TH/s",  # Changed from H/s to TH/s
         state_class=SensorStateClass.MEASUREMENT,
     ),
+    SensorEntityDescription(
+        key="averageHashRate1h",
+        name="Average Hash Rate (1h)",
+        icon="mdi:chart-bell-curve-cumulative",
+        native_unit_of_measurement="TH/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        # Two more entities per worker, enabled on demand
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="averageHashRate24h",
+        name="Average Hash Rate (24h)",
+        icon="mdi:chart-bell-curve-cumulative",
+        native_unit_of_measurement="TH/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+)
+
+# Sensor types for worker rolling statistics, only added when enabled
+WORKER_STATISTICS_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="hashRateEma",
+        name="Smoothed Hash Rate",
+        icon="mdi:chart-bell-curve",
+        native_unit_of_measurement="TH/s",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="hashRateP5",
+        name="Hash Rate 5th Percentile",
+        icon="mdi:chart-box-outline",
+        native_unit_of_measurement="TH/s",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="hashRateP50",
+        name="Median Hash Rate",
+        icon="mdi:chart-box-outline",
+        native_unit_of_measurement="TH/s",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="hashRateP95",
+        name="Hash Rate 95th Percentile",
+        icon="mdi:chart-box-outline",
+        native_unit_of_measurement="TH/s",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="uptime",
+        name="Uptime",
+        icon="mdi:timer-check-outline",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+WORKER_STATISTICS_KEYS = frozenset(
+    description.key for description in WORKER_STATISTICS_SENSOR_TYPES
 )
 
 # Sensor types for network data
@@ -126,6 +258,55 @@ INFO_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
     ),
 )
 
+# One per address, with all its workers in the attributes, for dashboards
+WORKER_SUMMARY_SENSOR = SensorEntityDescription(
+    key="workerSummary",
+    name="Worker Summary",
+    icon="mdi:format-list-bulleted",
+)
+
+# Diagnostic sensors describing the requests made to the mining server
+UPDATE_DURATION_SENSOR = SensorEntityDescription(
+    key="update_duration",
+    name="Update Duration",
+    icon="mdi:timer-outline",
+    native_unit_of_measurement="ms",
+    device_class=SensorDeviceClass.DURATION,
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
+WORKERS_PROCESSED_SENSOR = SensorEntityDescription(
+    key="workers_processed",
+    name="Workers Processed",
+    icon="mdi:counter",
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
+# Processing of the last update on the event loop, and in the executor
+LOOP_TIME_SENSOR = SensorEntityDescription(
+    key="loop_time",
+    name="Event Loop Time",
+    icon="mdi:timer-cog-outline",
+    native_unit_of_measurement="ms",
+    device_class=SensorDeviceClass.DURATION,
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
+# One per endpoint, their attributes change with every request
+FETCH_DURATION_SENSOR = SensorEntityDescription(
+    key="fetch_duration",
+    name="Fetch Duration",
+    icon="mdi:timer-sand",
+    native_unit_of_measurement="ms",
+    device_class=SensorDeviceClass.DURATION,
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    entity_registry_enabled_default=False,
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -138,13 +319,39 @@ async def async_setup_entry(
     # Create a set to track existing worker names
     worker_tracker = set()
     
-    def setup_sensors():
-        """Set up sensors from coordinator data."""
+    worker_sensor_types = WORKER_SENSOR_TYPES
+    if coordinator.worker_statistics:
+        worker_sensor_types += WORKER_STATISTICS_SENSOR_TYPES
+    
+    def setup_sensors(workers):
+        """Set up sensors from coordinator data for the given workers."""
         entities = []
         
         # Add client sensors for each BTC address
         for btc_address in coordinator.btc_addresses:
             if btc_address in coordinator.data["client"]:
+                entity_id = f"{entry.entry_id}_{btc_address}_{FETCH_DURATION_SENSOR.key}"
+                if entity_id not in worker_tracker:
+                    worker_tracker.add(entity_id)
+                    entities.append(
+                        MinemonitorDiagnosticSensor(
+                            coordinator,
+                            FETCH_DURATION_SENSOR,
+                            entry,
+                            client_endpoint(btc_address),
+                            btc_address,
+                        )
+                    )
+                
+                entity_id = f"{entry.entry_id}_{btc_address}_{WORKER_SUMMARY_SENSOR.key}"
+                if entity_id not in worker_tracker:
+                    worker_tracker.add(entity_id)
+                    entities.append(
+                        WorkerSummarySensor(
+                            coordinator, WORKER_SUMMARY_SENSOR, entry, btc_address
+                        )
+                    )
+                
                 # Add client level sensors (skipping if they already exist)
                 for description in CLIENT_SENSOR_TYPES:
                     entity_id = f"{entry.entry_id}_{btc_address}_{description.key}"
@@ -160,25 +367,23 @@ async def async_setup_entry(
                                 None,
                             )
                         )
-                
-                # Add worker level sensors
-                if "workers" in coordinator.data["client"][btc_address]:
-                    for worker_idx, worker in enumerate(coordinator.data["client"][btc_address]["workers"]):
-                        worker_name = worker.get("name", f"worker_{worker_idx}")
-                        for description in WORKER_SENSOR_TYPES:
-                            entity_id = f"{entry.entry_id}_{btc_address}_{worker_name}_{description.key}"
-                            if entity_id not in worker_tracker:
-                                worker_tracker.add(entity_id)
-                                entities.append(
-                                    MinemonitorSensor(
-                                        coordinator,
-                                        description,
-                                        entry,
-                                        btc_address,
-                                        "worker",
-                                        worker_idx,
-                                    )
-                                )
+        
+        # Add worker level sensors
+        for (btc_address, worker_key) in workers:
+            for description in worker_sensor_types:
+                entity_id = f"{entry.entry_id}_{btc_address}_{worker_key}_{description.key}"
+                if entity_id not in worker_tracker:
+                    worker_tracker.add(entity_id)
+                    entities.append(
+                        MinemonitorSensor(
+                            coordinator,
+                            description,
+                            entry,
+                            btc_address,
+                            "worker",
+                            worker_key,
+                        )
+                    )
         
         # Add network sensors (skipping if they already exist)
         if coordinator.data["network"]:
@@ -229,18 +434,45 @@ async def async_setup_entry(
             async_add_entities(entities)
     
     # Set up initial entities
-    setup_sensors()
+    setup_sensors(coordinator.worker_index)
+    
+    # Diagnostic sensors of the entry and of the endpoints shared by all addresses
+    async_add_entities(
+        [
+            MinemonitorDiagnosticSensor(coordinator, UPDATE_DURATION_SENSOR, entry),
+            MinemonitorDiagnosticSensor(coordinator, WORKERS_PROCESSED_SENSOR, entry),
+            MinemonitorDiagnosticSensor(coordinator, LOOP_TIME_SENSOR, entry),
+        ]
+        + [
+            MinemonitorDiagnosticSensor(coordinator, FETCH_DURATION_SENSOR, entry, endpoint)
+            for endpoint in (ENDPOINT_NETWORK, ENDPOINT_INFO, ENDPOINT_CLIENTS)
+        ]
+    )
     
-    # Register to handle new worker signals
-    async def handle_new_workers(entry_id):
-        if entry_id == entry.entry_id:
-            setup_sensors()
+    # Only the workers that changed since the previous update are handled
+    async def handle_workers_changed(delta: WorkerDelta):
+        for (btc_address, worker_key) in delta.removed:
+            # The coordinator removed their devices, allow them to come back
+            for description in worker_sensor_types:
+                worker_tracker.discard(
+                    f"{entry.entry_id}_{btc_address}_{worker_key}_{description.key}"
+                )
+        for btc_address in delta.removed_addresses:
+            for description in (
+                *CLIENT_SENSOR_TYPES, WORKER_SUMMARY_SENSOR, FETCH_DURATION_SENSOR
+            ):
+                worker_tracker.discard(f"{entry.entry_id}_{btc_address}_{description.key}")
+        setup_sensors(delta.added)
     
     # Listen for the signal
-    async_dispatcher_connect(hass, f"{DOMAIN}_new_workers", handle_new_workers)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, signal_workers_changed(entry.entry_id), handle_workers_changed
+        )
+    )
 
 
-class MinemonitorSensor(CoordinatorEntity, SensorEntity):
+class MinemonitorSensor(MinemonitorEntity, SensorEntity):
     """Representation of a MineMonitor sensor."""
 
     def __init__(
@@ -250,7 +482,7 @@ class MinemonitorSensor(CoordinatorEntity, SensorEntity):
         entry: ConfigEntry,
         btc_address: Optional[str],
         sensor_type: str,
-        worker_idx: Optional[int],
+        worker_key: Optional[str],
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
@@ -258,16 +490,39 @@ class MinemonitorSensor(CoordinatorEntity, SensorEntity):
         self._entry = entry
         self._btc_address = btc_address
         self._sensor_type = sensor_type
-        self._worker_idx = worker_idx
+        self._worker_key = worker_key
+        
+        # Ignore hashrate changes within the configured tolerance
+        if description.key in ("hashRate", "totalHashRate"):
+            self._state_tolerance = hashrate_tolerance(entry)
+        
+        # Worker fields copied into the attributes, the hash rate sensor is
+        # the one entity per worker that always gets them
+        allowed_attributes, hashrate_only = worker_attribute_policy(entry)
+        if sensor_type == "worker" and hashrate_only and description.key != "hashRate":
+            allowed_attributes = frozenset()
+        self._worker_attributes = allowed_attributes - {description.key}
+        if sensor_type == "worker":
+            self._volatile_attributes = VOLATILE_WORKER_ATTRIBUTES
+        self._attributes_generation: Optional[int] = None
+        self._attributes: Dict[str, Any] = {}
+        
+        # Endpoint providing the data of this sensor
+        if sensor_type in ("client", "worker") and btc_address:
+            self._endpoint = client_endpoint(btc_address)
+        elif sensor_type == "info":
+            self._endpoint = ENDPOINT_INFO
+        else:
+            self._endpoint = ENDPOINT_NETWORK
         
         # Set unique_id based on sensor type
         if sensor_type == "client" and btc_address:
             self._attr_unique_id = f"{entry.entry_id}_{btc_address}_{description.key}"
             self._attr_name = f"{btc_address[:6]}... {description.name}"
-        elif sensor_type == "worker" and btc_address and worker_idx is not None:
-            worker_data = coordinator.data["client"][btc_address]["workers"][worker_idx]
-            worker_name = worker_data.get("name", f"worker_{worker_idx}")
-            self._attr_unique_id = f"{entry.entry_id}_{btc_address}_{worker_name}_{description.key}"
+        elif sensor_type == "worker" and btc_address and worker_key is not None:
+            worker_data = coordinator.get_worker(btc_address, worker_key)
+            worker_name = (worker_data and worker_data.name) or worker_key
+            self._attr_unique_id = f"{entry.entry_id}_{btc_address}_{worker_key}_{description.key}"
             self._attr_name = f"{worker_name} {description.name}"
         elif sensor_type == "network":
             self._attr_unique_id = f"{entry.entry_id}_network_{description.key}"
@@ -280,13 +535,12 @@ class MinemonitorSensor(CoordinatorEntity, SensorEntity):
         host = entry.data[CONF_HOST]
         port = entry.data.get(CONF_PORT)
         
-        if sensor_type == "worker" and btc_address and worker_idx is not None:
-            worker_data = coordinator.data["client"][btc_address]["workers"][worker_idx]
-            worker_name = worker_data.get("name", f"worker_{worker_idx}")
-            
+        if sensor_type == "worker" and btc_address and worker_key is not None:
             # Use worker name for the device
             self._attr_device_info = DeviceInfo(
-                identifiers={(DOMAIN, f"{host}:{port}_{btc_address}_{worker_name}")},
+                identifiers={
+                    (DOMAIN, coordinator.worker_device_identifier(btc_address, worker_key))
+                },
                 name=f"Worker {worker_name}",
                 manufacturer="MineMonitor",
                 model="Mining Worker",
@@ -297,7 +551,7 @@ class MinemonitorSensor(CoordinatorEntity, SensorEntity):
             # Use a shortened BTC address for client device
             short_address = f"{btc_address[:6]}...{btc_address[-6:]}"
             self._attr_device_info = DeviceInfo(
-                identifiers={(DOMAIN, f"{host}:{port}_{btc_address}")},
+                identifiers={(DOMAIN, coordinator.address_device_identifier(btc_address))},
                 name=f"Mining Address {short_address}",
                 manufacturer="MineMonitor",
                 model="Mining Address",
@@ -314,6 +568,10 @@ class MinemonitorSensor(CoordinatorEntity, SensorEntity):
                 configuration_url=f"http://{host}:{port}/api",
             )
 
+    def _comparable_value(self) -> StateType:
+        """Compare the native value, which skips the state formatting."""
+        return self.native_value
+
     @property
     def native_value(self) -> StateType:
         """Return the state of the sensor."""
@@ -321,6 +579,25 @@ class MinemonitorSensor(CoordinatorEntity, SensorEntity):
             return None
 
         if self._sensor_type == "client" and self._btc_address:
+            # Return the average hashrate from the history
+            if self.entity_description.key in AVERAGE_HASHRATE_WINDOWS:
+                return convert_to_th_per_second(
+                    self.coordinator.average_hashrate(
+                        self._btc_address,
+                        AVERAGE_HASHRATE_WINDOWS[self.entity_description.key],
+                    )
+                )
+            
+            # Return the number of workers in a state, counted by the coordinator
+            if self.entity_description.key in WORKER_STATE_COUNTS:
+                counts = self.coordinator.worker_state_counts.get(self._btc_address)
+                return counts[WORKER_STATE_COUNTS[self.entity_description.key]] if counts else None
+            
+            # Return the precomputed hashrate total of the address
+            if self.entity_description.key == "totalHashRate":
+                totals = self.coordinator.aggregates.addresses.get(self._btc_address)
+                return convert_to_th_per_second(totals.hashrate) if totals else None
+            
             # Return client-level data
             client_data = self.coordinator.data["client"].get(self._btc_address, {})
             value = client_data.get(self.entity_description.key)
@@ -329,26 +606,42 @@ class MinemonitorSensor(CoordinatorEntity, SensorEntity):
                 return format_difficulty(value)
             return value
             
-        elif self._sensor_type == "worker" and self._btc_address and self._worker_idx is not None:
+        elif self._sensor_type == "worker" and self._btc_address and self._worker_key is not None:
+            # Return the average hashrate from the history
+            if self.entity_description.key in AVERAGE_HASHRATE_WINDOWS:
+                return convert_to_th_per_second(
+                    self.coordinator.average_hashrate(
+                        worker_series(self._btc_address, self._worker_key),
+                        AVERAGE_HASHRATE_WINDOWS[self.entity_description.key],
+                    )
+                )
+            
+            # Return the rolling statistics of the worker
+            if self.entity_description.key in WORKER_STATISTICS_KEYS:
+                stats = self.coordinator.get_worker_statistics(
+                    self._btc_address, self._worker_key
+                )
+                if stats is None:
+                    return None
+                if self.entity_description.key == "uptime":
+                    uptime = stats.uptime
+                    return round(uptime, 1) if uptime is not None else None
+                if self.entity_description.key == "hashRateEma":
+                    return convert_to_th_per_second(stats.ema)
+                return convert_to_th_per_second(
+                    stats.percentile(HASHRATE_PERCENTILES[self.entity_description.key])
+                )
+            
             # Return worker-level data
-            client_data = self.coordinator.data["client"].get(self._btc_address, {})
-            workers = client_data.get("workers", [])
+            worker_data = self.coordinator.get_worker(self._btc_address, self._worker_key)
             
-            if 0 <= self._worker_idx < len(workers):
-                worker_data = workers[self._worker_idx]
-                # Get the value
-                value = worker_data.get(self.entity_description.key)
-                
-                # Format difficulty with no decimals
+            if worker_data is not None:
+                # The record holds the numbers already converted to floats
                 if self.entity_description.key == "bestDifficulty":
-                    return format_difficulty(value)
+                    return format_difficulty(worker_data.best_difficulty)
                 # Convert hashrates from H/s to TH/s with 2 decimal places
                 elif self.entity_description.key == "hashRate":
-                    try:
-                        return convert_to_th_per_second(float(value))
-                    except (ValueError, TypeError):
-                        return value
-                return value
+                    return convert_to_th_per_second(worker_data.hashrate)
             return None
             
         elif self._sensor_type == "network":
@@ -382,13 +675,15 @@ class MinemonitorSensor(CoordinatorEntity, SensorEntity):
         """Return if entity is available."""
         if not self.coordinator.last_update_success:
             return False
+        
+        # Keep reporting the last good payload until it is stale for too long
+        if not self.coordinator.is_endpoint_available(self._endpoint):
+            return False
             
         if self._sensor_type == "client" and self._btc_address:
             return self._btc_address in self.coordinator.data.get("client", {})
-        elif self._sensor_type == "worker" and self._btc_address and self._worker_idx is not None:
-            client_data = self.coordinator.data.get("client", {}).get(self._btc_address, {})
-            workers = client_data.get("workers", [])
-            return 0 <= self._worker_idx < len(workers)
+        elif self._sensor_type == "worker" and self._btc_address and self._worker_key is not None:
+            return self.coordinator.get_worker(self._btc_address, self._worker_key) is not None
         elif self._sensor_type == "network":
             return bool(self.coordinator.data.get("network"))
         elif self._sensor_type == "info":
@@ -400,28 +695,36 @@ class MinemonitorSensor(CoordinatorEntity, SensorEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return additional state attributes for the sensor."""
+        # Attributes only change with the coordinator data
+        if self._attributes_generation == self.coordinator.generation:
+            return self._attributes
+        
         attributes = {}
         
-        if self._sensor_type == "worker" and self._btc_address and self._worker_idx is not None:
+        if self._sensor_type == "worker" and self._btc_address and self._worker_key is not None:
             # Add worker attributes
-            client_data = self.coordinator.data["client"].get(self._btc_address, {})
-            workers = client_data.get("workers", [])
+            worker_data = self.coordinator.get_worker(self._btc_address, self._worker_key)
             
-            if 0 <= self._worker_idx < len(workers):
-                worker_data = workers[self._worker_idx]
-                
-                # Add all available worker attributes
-                for key, value in worker_data.items():
-                    if key != self.entity_description.key:  # Don't duplicate the state value
+            if worker_data is not None:
+                # Add the allowed worker attributes, the state value is never duplicated
+                for key, value in worker_data.as_payload().items():
+                    if key in self._worker_attributes:
                         attributes[key] = value
                 
                 # Add BTC address to the attributes
                 attributes["btc_address"] = self._btc_address
         
+        # Flag data kept from the last successful fetch
+        status = self.coordinator.endpoint_status(self._endpoint)
+        if status is not None:
+            attributes.update(status.as_attributes())
+        
+        self._attributes_generation = self.coordinator.generation
+        self._attributes = attributes
         return attributes
 
 
-class TotalHashrateSensor(CoordinatorEntity, SensorEntity):
+class TotalHashrateSensor(MinemonitorEntity, SensorEntity):
     """Sensor for total hashrate across all workers."""
 
     def __init__(
@@ -434,6 +737,7 @@ class TotalHashrateSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self.entity_description = description
         self._entry = entry
+        self._state_tolerance = hashrate_tolerance(entry)
         
         # Set unique_id
         self._attr_unique_id = f"{entry.entry_id}_total_hashrate"
@@ -451,29 +755,18 @@ class TotalHashrateSensor(CoordinatorEntity, SensorEntity):
             configuration_url=f"http://{host}:{port}/api",
         )
 
+    def _comparable_value(self) -> StateType:
+        """Compare the native value, which skips the state formatting."""
+        return self.native_value
+
     @property
     def native_value(self) -> StateType:
         """Return the total hashrate across all workers."""
         if not self.coordinator.data:
             return None
         
-        total_hashrate = 0.0
-        
-        # Sum up hashrates from all workers across all BTC addresses
-        for btc_address in self.coordinator.btc_addresses:
-            if btc_address in self.coordinator.data["client"]:
-                client_data = self.coordinator.data["client"][btc_address]
-                workers = client_data.get("workers", [])
-                
-                for worker in workers:
-                    try:
-                        worker_hashrate = float(worker.get("hashRate", 0))
-                        total_hashrate += worker_hashrate
-                    except (ValueError, TypeError):
-                        pass
-        
         # Convert from H/s to TH/s
-        return convert_to_th_per_second(total_hashrate)
+        return convert_to_th_per_second(self.coordinator.aggregates.hashrate)
 
     @property
     def available(self) -> bool:
@@ -483,7 +776,7 @@ class TotalHashrateSensor(CoordinatorEntity, SensorEntity):
             
         # Check if we have any valid client data
         for btc_address in self.coordinator.btc_addresses:
-            if btc_address in self.coordinator.data.get("client", {}):
+            if self.coordinator.is_endpoint_available(client_endpoint(btc_address)):
                 return True
                 
         return False
@@ -491,54 +784,199 @@ class TotalHashrateSensor(CoordinatorEntity, SensorEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return additional attributes about the total hashrate."""
-        attributes = {}
+        aggregates = self.coordinator.aggregates
+        attributes = {
+            "active_workers": aggregates.active_workers,
+            "total_workers": aggregates.total_workers,
+        }
         
-        # Count active workers
-        active_workers = 0
-        total_workers = 0
+        # List addresses that currently report data kept from an earlier fetch
+        stale_addresses = [
+            btc_address
+            for btc_address in self.coordinator.btc_addresses
+            if (status := self.coordinator.endpoint_status(client_endpoint(btc_address)))
+            and status.stale
+        ]
+        if stale_addresses:
+            attributes["stale_addresses"] = stale_addresses
         
-        # Sum up workers from all BTC addresses
-        for btc_address in self.coordinator.btc_addresses:
-            if btc_address in self.coordinator.data.get("client", {}):
-                client_data = self.coordinator.data["client"][btc_address]
-                workers = client_data.get("workers", [])
-                
-                total_workers += len(workers)
-                
-                for worker in workers:
-                    # Consider a worker active if it has a non-zero hashrate
-                    try:
-                        worker_hashrate = float(worker.get("hashRate", 0))
-                        if worker_hashrate > 0:
-                            active_workers += 1
-                    except (ValueError, TypeError):
-                        pass
+        if aggregates.network_share is not None:
+            attributes["network_share"] = round(aggregates.network_share, 6)  # Percentage with 6 decimal places
+        
+        return attributes
+
+
+class WorkerSummarySensor(MinemonitorEntity, SensorEntity):
+    """Sensor with the totals and the workers of an address, for dashboards.
+
+    A card reads this single entity instead of several entities per worker.
+    Its state is the number of workers.
+    """
+
+    # The worker list changes with every refresh, it isn't worth recording
+    _unrecorded_attributes = frozenset({"workers"})
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        description: SensorEntityDescription,
+        entry: ConfigEntry,
+        btc_address: str,
+    ) -> None:
+        """Initialize the summary sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._btc_address = btc_address
+        self._endpoint = client_endpoint(btc_address)
+        self._attr_unique_id = f"{entry.entry_id}_{btc_address}_{description.key}"
+        self._attr_name = f"{btc_address[:6]}... {description.name}"
+        
+        host = entry.data[CONF_HOST]
+        port = entry.data.get(CONF_PORT)
+        short_address = f"{btc_address[:6]}...{btc_address[-6:]}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.address_device_identifier(btc_address))},
+            name=f"Mining Address {short_address}",
+            manufacturer="MineMonitor",
+            model="Mining Address",
+            via_device=(DOMAIN, f"{host}:{port}"),
+            configuration_url=f"http://{host}:{port}/api/client/{btc_address}",
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the number of workers of the address."""
+        summary = self.coordinator.worker_summary(self._btc_address)
+        return len(summary["workers"]) if summary else None
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return (
+            self.coordinator.last_update_success
+            and self.coordinator.is_endpoint_available(self._endpoint)
+            and self.coordinator.worker_summary(self._btc_address) is not None
+        )
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the totals and the compact list of workers."""
+        attributes = {"btc_address": self._btc_address}
+        summary = self.coordinator.worker_summary(self._btc_address)
+        if summary:
+            attributes.update(summary)
+        status = self.coordinator.endpoint_status(self._endpoint)
+        if status is not None:
+            attributes.update(status.as_attributes())
+        return attributes
+
+
+class MinemonitorDiagnosticSensor(MinemonitorEntity, SensorEntity):
+    """Sensor reporting the measurements of the coordinator requests."""
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        description: SensorEntityDescription,
+        entry: ConfigEntry,
+        endpoint: Optional[str] = None,
+        btc_address: Optional[str] = None,
+    ) -> None:
+        """Initialize the diagnostic sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._entry = entry
+        self._endpoint = endpoint
         
-        attributes["active_workers"] = active_workers
-        attributes["total_workers"] = total_workers
+        host = entry.data[CONF_HOST]
+        port = entry.data.get(CONF_PORT)
         
-        # Calculate network share if network hashrate is available
-        if "network" in self.coordinator.data and "networkhashps" in self.coordinator.data["network"]:
-            try:
-                network_hashrate = float(self.coordinator.data["network"]["networkhashps"])
-                if network_hashrate > 0:
-                    # Calculate percentage share (total_hashrate / network_hashrate) * 100
-                    total_hashrate_raw = 0.0
-                    for btc_address in self.coordinator.btc_addresses:
-                        if btc_address in self.coordinator.data.get("client", {}):
-                            client_data = self.coordinator.data["client"][btc_address]
-                            workers = client_data.get("workers", [])
-                            
-                            for worker in workers:
-                                try:
-                                    worker_hashrate = float(worker.get("hashRate", 0))
-                                    total_hashrate_raw += worker_hashrate
-                                except (ValueError, TypeError):
-                                    pass
-                    
-                    network_share = (total_hashrate_raw / network_hashrate) * 100
-                    attributes["network_share"] = round(network_share, 6)  # Percentage with 6 decimal places
-            except (ValueError, TypeError, ZeroDivisionError):
-                pass
+        if btc_address:
+            self._attr_unique_id = f"{entry.entry_id}_{btc_address}_{description.key}"
+            self._attr_name = f"{btc_address[:6]}... {description.name}"
+            short_address = f"{btc_address[:6]}...{btc_address[-6:]}"
+            self._attr_device_info = DeviceInfo(
+                identifiers={(DOMAIN, coordinator.address_device_identifier(btc_address))},
+                name=f"Mining Address {short_address}",
+                manufacturer="MineMonitor",
+                model="Mining Address",
+                via_device=(DOMAIN, f"{host}:{port}"),
+                configuration_url=f"http://{host}:{port}/api/client/{btc_address}",
+            )
+        else:
+            if endpoint:
+                self._attr_unique_id = f"{entry.entry_id}_{endpoint}_{description.key}"
+                self._attr_name = f"MineMonitor {endpoint.title()} {description.name}"
+            else:
+                self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+                self._attr_name = f"MineMonitor {description.name}"
+            self._attr_device_info = DeviceInfo(
+                identifiers={(DOMAIN, f"{host}:{port}")},
+                name="MineMonitor Network",
+                manufacturer="MineMonitor",
+                model="Mining Server",
+                configuration_url=f"http://{host}:{port}/api",
+            )
+
+    async def async_added_to_hass(self) -> None:
+        """Also update after the refreshes in which no data changed."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                signal_metrics_updated(self.coordinator.entry_id),
+                self._handle_coordinator_update,
+            )
+        )
+
+    @property
+    def available(self) -> bool:
+        """Measurements of failed updates are still reported."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        if self.entity_description.key == "update_duration":
+            duration = self.coordinator.last_update_duration
+            return round(duration * 1000, 1) if duration is not None else None
+        
+        if self.entity_description.key == "workers_processed":
+            return self.coordinator.workers_processed
         
+        if self.entity_description.key == "loop_time":
+            loop_time = self.coordinator.loop_time
+            return round(loop_time * 1000, 1) if loop_time is not None else None
+        
+        metrics = self.coordinator.metrics.get(self._endpoint)
+        if metrics is None or metrics.last is None:
+            return None
+        return round(metrics.last.duration * 1000, 1)
+
+    @property
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        """Return the percentiles, sizes and error counts of the endpoint."""
+        if self.entity_description.key == "loop_time":
+            offload_time = self.coordinator.offload_time
+            return {
+                "offload_mode": self.coordinator.offload_mode,
+                "offload_time_ms": (
+                    round(offload_time * 1000, 1) if offload_time is not None else None
+                ),
+            }
+        if self._endpoint is None:
+            return None
+        
+        attributes = {}
+        metrics = self.coordinator.metrics.get(self._endpoint)
+        if metrics is not None:
+            attributes.update(metrics.as_dict())
+            attributes.pop("last_duration_ms", None)
+        
+        status = self.coordinator.endpoint_status(self._endpoint)
+        if status is not None:
+            attributes["consecutive_errors"] = status.consecutive_errors
+            attributes["last_success"] = (
+                status.last_success.isoformat() if status.last_success else None
+            )
         return attributes
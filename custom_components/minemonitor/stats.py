@@ -0,0 +1,64 @@
+"""Rolling hashrate statistics for the MineMonitor integration."""
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+
+class RollingStats:
+    """Smoothed hashrate, percentiles and uptime of a worker over a sliding window.
+
+    The EMA and the uptime counters are updated in O(1) per sample. The
+    percentiles are read from a sorted copy of the window, kept up to date
+    with a binary search as samples enter and leave it, so nothing is ever
+    rescanned.
+    """
+
+    __slots__ = ("window", "time_constant", "ema", "_last_time", "_samples", "_sorted", "_up")
+
+    def __init__(self, window: float, time_constant: float) -> None:
+        """Initialize with the window length and EMA time constant in seconds."""
+        self.window = window
+        self.time_constant = time_constant
+        self.ema: Optional[float] = None
+        self._last_time: Optional[float] = None
+        self._samples: Deque[Tuple[float, float]] = deque()
+        self._sorted: List[float] = []
+        self._up = 0
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a hashrate sample, in H/s."""
+        if self.ema is None or self._last_time is None:
+            self.ema = value
+        else:
+            # Weight the sample by the time elapsed since the previous one
+            alpha = 1 - math.exp(-(timestamp - self._last_time) / self.time_constant)
+            self.ema += alpha * (value - self.ema)
+        self._last_time = timestamp
+
+        self._samples.append((timestamp, value))
+        insort(self._sorted, value)
+        if value > 0:
+            self._up += 1
+
+        while self._samples and self._samples[0][0] <= timestamp - self.window:
+            _, old = self._samples.popleft()
+            del self._sorted[bisect_left(self._sorted, old)]
+            if old > 0:
+                self._up -= 1
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Return a percentile of the window using the nearest-rank method."""
+        if not self._sorted:
+            return None
+        rank = max(math.ceil(percent / 100 * len(self._sorted)), 1)
+        return self._sorted[rank - 1]
+
+    @property
+    def uptime(self) -> Optional[float]:
+        """Return the percentage of samples in the window with a hashrate."""
+        if not self._samples:
+            return None
+        return self._up / len(self._samples) * 100
@@ -0,0 +1,20 @@
+"""Shared setup of the MineMonitor tests.
+
+The package __init__ of the integration needs Home Assistant, the modules
+tested here don't. They are imported as the "minemonitor" package, whose
+__init__ is never run, so the tests only need pytest (and aiohttp for the
+server and connection tests). The coordinator tests import the integration
+itself and are skipped without Home Assistant.
+"""
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+package = types.ModuleType("minemonitor")
+package.__path__ = [str(ROOT / "custom_components" / "minemonitor")]
+sys.modules.setdefault("minemonitor", package)
+
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
@@ -0,0 +1,54 @@
+"""Tests of the Bitcoin address validation, with the BIP 173 and BIP 350 vectors."""
+import pytest
+
+from minemonitor.address import is_valid_btc_address
+
+
+@pytest.mark.parametrize(
+    "address",
+    [
+        # Base58Check P2PKH and P2SH
+        "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
+        "1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2",
+        "3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy",
+        # Segwit version 0, Bech32
+        "BC1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T4",
+        "bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq",
+        "tb1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3q0sl5k7",
+        # Segwit version 1 and later, Bech32m
+        "bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj0",
+        "bc1pw508d6qejxtdg4y5r3zarvary0c5xw7kw508d6qejxtdg4y5r3zarvary0c5xw7kt5nd6y",
+        "BC1SW50QGDZ25J",
+        "bc1zw508d6qejxtdg4y5r3zarvaryvaxxpcs",
+    ],
+)
+def test_valid_addresses(address):
+    """Addresses with a valid checksum and program are accepted."""
+    assert is_valid_btc_address(address)
+
+
+@pytest.mark.parametrize(
+    "address",
+    [
+        # Base58Check with a wrong checksum, an invalid character, a bad length
+        "1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN3",
+        "1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN0",
+        "1BvBMSEYstWetqTFn5Au4m4GFg7xJa",
+        "",
+        # Unknown human readable part
+        "tc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vq5zuyut",
+        # Wrong checksum
+        "bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t5",
+        # Version 1 with a Bech32 checksum, version 0 with a Bech32m one
+        "bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqh2y7hd",
+        "bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kemeawh",
+        # Mixed case
+        "tb1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3q0sL5k7",
+        # Invalid character and too short data part
+        "bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3tb",
+        "bc1gmk9yu",
+    ],
+)
+def test_invalid_addresses(address):
+    """Addresses failing their checksum or structure are rejected."""
+    assert not is_valid_btc_address(address)
@@ -0,0 +1,24 @@
+"""Smoke test of the coordinator benchmark, with a tiny fleet."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+import bench_coordinator  # noqa: E402
+
+
+@pytest.mark.parametrize("extra", [["--static"], ["--error-rate", "0.2", "--no-batch"]])
+def test_benchmark_runs(extra):
+    """The benchmark sets up the sensors and completes every cycle."""
+    args = bench_coordinator.parse_args(
+        ["--addresses", "3", "--workers", "2", "--cycles", "2", *extra]
+    )
+    results = asyncio.run(bench_coordinator.async_run(args))
+    assert results["setup"]["entities"] > 0
+    assert len(results["cycles"]) == 2
+    assert all(cycle["success"] for cycle in results["cycles"])
+    if "--static" in extra:
+        # Unchanged payloads don't write the data sensors again
+        assert results["cycles"][-1]["writes"] < results["setup"]["entities"]
+    assert "peak RSS" in bench_coordinator.summarize(results)
@@ -0,0 +1,53 @@
+"""Tests of the validation done by the config flow."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import web  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.minemonitor import DATA_POOL_HOSTS  # noqa: E402
+from custom_components.minemonitor.config_flow import (  # noqa: E402
+    InvalidBTCAddress,
+    RejectedBTCAddress,
+    async_test_connection,
+)
+from stub_server import create_app  # noqa: E402
+
+VALID = "bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq"
+REJECTED = "1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2"
+
+
+def test_probe_leaves_the_shared_connection_pool_alone(tmp_path):
+    """Addresses are probed on the server without creating the shared pool."""
+
+    @web.middleware
+    async def reject(request, handler):
+        if request.path.endswith(REJECTED):
+            raise web.HTTPNotFound()
+        return await handler(request)
+
+    async def run():
+        app = create_app(1)
+        app.middlewares.append(reject)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        hass = HomeAssistant(str(tmp_path))
+        try:
+            await async_test_connection(hass, "127.0.0.1", port, [VALID])
+            with pytest.raises(RejectedBTCAddress) as err:
+                await async_test_connection(hass, "127.0.0.1", port, [VALID, REJECTED])
+            assert err.value.addresses == [REJECTED]
+            with pytest.raises(InvalidBTCAddress):
+                await async_test_connection(hass, "127.0.0.1", port, ["bc1qnotanaddress"])
+            assert not hass.data.get(DATA_POOL_HOSTS)
+        finally:
+            await hass.async_stop(force=True)
+            await runner.cleanup()
+
+    asyncio.run(run())
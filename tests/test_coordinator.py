@@ -0,0 +1,448 @@
+"""Tests of the coordinator requests, against a local aiohttp server."""
+import asyncio
+import json
+import os
+import tempfile
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import web  # noqa: E402
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.const import CONF_HOST, CONF_PORT, EVENT_HOMEASSISTANT_CLOSE  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.exceptions import ConfigEntryNotReady  # noqa: E402
+from homeassistant.helpers import device_registry as dr  # noqa: E402
+from homeassistant.helpers import issue_registry as ir  # noqa: E402
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE  # noqa: E402
+import homeassistant.util.dt as dt_util  # noqa: E402
+
+from custom_components.minemonitor import (  # noqa: E402
+    CONF_BTC_ADDRESSES,
+    CONF_OFFLOAD_MODE,
+    CONF_OFFLOAD_THRESHOLD,
+    CONF_STALE_TIMEOUT,
+    DATA_PROCESS_POOL,
+    DOMAIN,
+    ENDPOINT_INFO,
+    ENDPOINT_NETWORK,
+    OFFLOAD_PROCESS,
+    STREAM_THRESHOLD,
+    WORKER_ONLINE,
+    WORKER_WARNING,
+    BitcoinMiningUpdateCoordinator,
+    async_get_pool_host,
+    async_get_process_pool,
+    async_release_pool_host,
+    async_setup_entry,
+    client_endpoint,
+)
+from stub_server import client_payload  # noqa: E402
+
+ADDRESS = "bc1qagkj53kpkjndtnng8jxu2v27rnnul2u0052qha"
+OTHER_ADDRESS = "3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy"
+
+NETWORK = {"blocks": 850000, "difficulty": 83148355189239.77}
+
+
+def _expire_shared_cache(coordinator, endpoint):
+    """Make the next fetch of a shared endpoint request it again."""
+    cache = coordinator.pool_host._cache
+    cache[endpoint] = (cache[endpoint][0] - 3600, cache[endpoint][1])
+
+
+async def _async_run_with_server(routes, test, options=None):
+    """Serve the routes on an ephemeral port and run the test with a coordinator."""
+    app = web.Application()
+    for path, handler in routes.items():
+        app.router.add_get(path, handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await dr.async_load(hass)
+        await ir.async_load(hass)
+        pool_host = async_get_pool_host(hass, "127.0.0.1", port)
+        coordinator = BitcoinMiningUpdateCoordinator(
+            hass,
+            {CONF_HOST: "127.0.0.1", CONF_PORT: port, CONF_BTC_ADDRESSES: [ADDRESS], **(options or {})},
+            entry_id="test",
+            pool_host=pool_host,
+        )
+        try:
+            await test(coordinator)
+        finally:
+            await pool_host.async_close()
+            await hass.async_stop(force=True)
+            await runner.cleanup()
+
+
+def test_shared_fetch_sends_etag_of_cached_response():
+    """A second fetch of a shared endpoint is conditional and keeps the data."""
+    requests = []
+
+    async def network(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.json_response(NETWORK, headers={"ETag": '"v1"'})
+
+    async def test(coordinator):
+        assert await coordinator._fetch_endpoint(ENDPOINT_NETWORK) is True
+        _expire_shared_cache(coordinator, ENDPOINT_NETWORK)
+        assert await coordinator._fetch_endpoint(ENDPOINT_NETWORK) is False
+        status = coordinator.endpoints[ENDPOINT_NETWORK]
+        assert status.consecutive_errors == 0
+        assert status.data == NETWORK
+        assert status.etag == '"v1"'
+
+    asyncio.run(_async_run_with_server({"/api/network": network}, test))
+    assert requests == [None, '"v1"']
+
+
+def test_unchanged_large_body_is_not_decoded():
+    """A large client body identical to the previous one skips the parser."""
+    body = json.dumps(client_payload(ADDRESS, 500, jitter=False)).encode()
+    assert len(body) > STREAM_THRESHOLD
+    endpoint = client_endpoint(ADDRESS)
+
+    async def client(request):
+        return web.Response(body=body, content_type="application/json")
+
+    async def test(coordinator):
+        decoded = []
+        make_worker = coordinator._make_worker
+
+        def counting_make_worker(worker):
+            decoded.append(worker)
+            return make_worker(worker)
+
+        coordinator._make_worker = counting_make_worker
+        assert await coordinator._fetch_endpoint(endpoint) is True
+        assert len(decoded) == 500
+        assert len(coordinator.endpoints[endpoint].data["workers"]) == 500
+        assert await coordinator._fetch_endpoint(endpoint) is False
+        assert len(decoded) == 500
+        assert coordinator.metrics[endpoint].last.decode_time == 0.0
+
+    asyncio.run(_async_run_with_server({"/api/client/{address}": client}, test))
+
+
+def test_broken_process_pool_falls_back_to_inline_decoding():
+    """A dead decoding process fails neither the request nor the next one."""
+    endpoint = client_endpoint(ADDRESS)
+
+    async def client(request):
+        return web.json_response(client_payload(ADDRESS, 5))
+
+    async def test(coordinator):
+        hass = coordinator.hass
+        pool = async_get_process_pool(hass)
+        with pytest.raises(BrokenProcessPool):
+            await hass.loop.run_in_executor(pool, os._exit, 1)
+
+        assert await coordinator._fetch_endpoint(endpoint) is True
+        assert coordinator.endpoints[endpoint].consecutive_errors == 0
+        # The broken pool was replaced
+        assert hass.data.get(DATA_PROCESS_POOL) is not pool
+        assert await coordinator._fetch_endpoint(endpoint) is True
+        assert coordinator.metrics[endpoint].last.offloaded
+        hass.data.pop(DATA_PROCESS_POOL).shutdown()
+
+    asyncio.run(
+        _async_run_with_server(
+            {"/api/client/{address}": client},
+            test,
+            {CONF_OFFLOAD_MODE: OFFLOAD_PROCESS, CONF_OFFLOAD_THRESHOLD: 0},
+        )
+    )
+
+
+def test_pool_host_grows_and_closes_with_home_assistant():
+    """A second entry with a higher concurrency gets a larger session."""
+
+    async def run():
+        hass = HomeAssistant("/tmp")
+        first = async_get_pool_host(hass, "127.0.0.1", 3334, 4)
+        small = first.get_session()
+        assert small.headers["User-Agent"] == SERVER_SOFTWARE
+        second = async_get_pool_host(hass, "127.0.0.1", 3334, 16)
+        assert second is first
+        large = first.get_session()
+        assert large.connector.limit == 16
+        # The smaller session is closed once its requests had time to finish
+        assert not small.closed
+        async_release_pool_host(hass, first)
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+        await hass.async_block_till_done()
+        assert small.closed and large.closed
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+async def _client(request):
+    """Answer the client endpoint of any address with two workers."""
+    return web.json_response(client_payload(request.match_info["address"], 2, jitter=False))
+
+
+async def _network(request):
+    return web.json_response(NETWORK)
+
+
+POOL_ROUTES = {
+    "/api/client/{address}": _client,
+    "/api/network": _network,
+    "/api/info": _network,
+}
+
+
+def test_add_and_remove_addresses_in_place():
+    """Added addresses are fetched, removed ones leave no state behind."""
+
+    async def test(coordinator):
+        await coordinator.async_refresh()
+        assert list(coordinator.data["client"]) == [ADDRESS]
+
+        await coordinator.async_set_addresses([ADDRESS, OTHER_ADDRESS])
+        assert list(coordinator.data["client"]) == [ADDRESS, OTHER_ADDRESS]
+        assert coordinator.config[CONF_BTC_ADDRESSES] == [ADDRESS, OTHER_ADDRESS]
+        assert coordinator.aggregates.total_workers == 4
+
+        await coordinator.async_set_addresses([OTHER_ADDRESS])
+        assert list(coordinator.data["client"]) == [OTHER_ADDRESS]
+        assert client_endpoint(ADDRESS) not in coordinator.endpoints
+        assert client_endpoint(ADDRESS) not in coordinator.schedules
+        assert all(key[0] == OTHER_ADDRESS for key in coordinator.worker_index)
+        assert ADDRESS not in coordinator.history
+
+    asyncio.run(_async_run_with_server(POOL_ROUTES, test))
+
+
+def _blocking_routes(blocked, released):
+    """Return the pool routes with a bulk endpoint that waits to be released."""
+
+    async def clients(request):
+        blocked.set()
+        await released.wait()
+        return web.Response(status=404)
+
+    return {**POOL_ROUTES, "/api/clients": clients}
+
+
+def test_address_removed_during_refresh_is_not_restored():
+    """A refresh in progress finishes before an address is removed."""
+    blocked, released = asyncio.Event(), asyncio.Event()
+
+    async def test(coordinator):
+        refresh = asyncio.create_task(coordinator.async_refresh())
+        await blocked.wait()
+        remove = asyncio.create_task(coordinator.async_set_addresses([ADDRESS]))
+        await asyncio.sleep(0.01)
+        # The removal waits for the refresh
+        assert not remove.done()
+        released.set()
+        await refresh
+        await remove
+        assert list(coordinator.data["client"]) == [ADDRESS]
+        assert client_endpoint(OTHER_ADDRESS) not in coordinator.endpoints
+        assert client_endpoint(OTHER_ADDRESS) not in coordinator.schedules
+
+    asyncio.run(
+        _async_run_with_server(
+            _blocking_routes(blocked, released),
+            test,
+            {CONF_BTC_ADDRESSES: [ADDRESS, OTHER_ADDRESS]},
+        )
+    )
+
+
+def test_address_added_during_refresh_is_fetched():
+    """An address added while a refresh runs is fetched after it."""
+    blocked, released = asyncio.Event(), asyncio.Event()
+    third = "1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2"
+
+    async def test(coordinator):
+        refresh = asyncio.create_task(coordinator.async_refresh())
+        await blocked.wait()
+        add = asyncio.create_task(
+            coordinator.async_set_addresses([ADDRESS, OTHER_ADDRESS, third])
+        )
+        await asyncio.sleep(0.01)
+        assert not add.done()
+        released.set()
+        await refresh
+        await add
+        assert list(coordinator.data["client"]) == [ADDRESS, OTHER_ADDRESS, third]
+        assert coordinator.endpoints[client_endpoint(third)].has_data
+
+    asyncio.run(
+        _async_run_with_server(
+            _blocking_routes(blocked, released),
+            test,
+            {CONF_BTC_ADDRESSES: [ADDRESS, OTHER_ADDRESS]},
+        )
+    )
+
+
+def _failing_routes(failing):
+    """Return the pool routes, answering with an error while failing is set."""
+
+    def wrap(handler):
+        async def wrapped(request):
+            if failing.is_set():
+                return web.Response(status=500)
+            return await handler(request)
+
+        return wrapped
+
+    return {path: wrap(handler) for path, handler in POOL_ROUTES.items()}
+
+
+def _restoring_coordinator(coordinator):
+    """Return a coordinator of the same entry, like after a restart."""
+    return BitcoinMiningUpdateCoordinator(
+        coordinator.hass,
+        coordinator.config,
+        entry_id=coordinator.entry_id,
+        pool_host=coordinator.pool_host,
+    )
+
+
+def test_restored_snapshot_goes_stale_from_its_last_success():
+    """Restored data is kept until a failed refresh, then the stale timeout applies."""
+    failing = asyncio.Event()
+    endpoint = client_endpoint(ADDRESS)
+
+    async def test(coordinator):
+        await coordinator.async_refresh()
+        snapshot = coordinator._snapshot_data()
+        fetched = dt_util.utcnow() - timedelta(seconds=600)
+        snapshot["endpoints"][endpoint]["last_success"] = fetched.isoformat()
+        await coordinator._snapshot_store.async_save(snapshot)
+
+        restored = _restoring_coordinator(coordinator)
+        assert await restored.async_restore_snapshot()
+        status = restored.endpoints[endpoint]
+        assert status.last_success == fetched
+        assert status.as_attributes()["restored"] is True
+        assert len(restored.data["client"][ADDRESS]["workers"]) == 2
+        assert restored.worker_index.keys() == coordinator.worker_index.keys()
+        # Older than the stale timeout, but not refreshed yet
+        assert restored.is_endpoint_available(endpoint)
+
+        failing.set()
+        for shared in (ENDPOINT_NETWORK, ENDPOINT_INFO):
+            _expire_shared_cache(restored, shared)
+        await restored.async_refresh()
+        assert restored.last_update_success
+        assert status.consecutive_errors == 1 and status.restored
+        assert not restored.is_endpoint_available(endpoint)
+        # The network data was fetched a moment ago
+        assert restored.is_endpoint_available(ENDPOINT_NETWORK)
+
+        # The next successful refresh clears the flags, a manual one doesn't
+        # wait for the retry delay
+        failing.clear()
+        await restored.async_refresh_all()
+        assert not status.stale
+        assert status.as_attributes() == {}
+        assert restored.is_endpoint_available(endpoint)
+
+    asyncio.run(
+        _async_run_with_server(_failing_routes(failing), test, {CONF_STALE_TIMEOUT: 300})
+    )
+
+
+@pytest.mark.parametrize(
+    "snapshot",
+    [
+        {"endpoints": []},
+        {"endpoints": {client_endpoint(ADDRESS): {"data": {"workers": []}}}},
+        {
+            "endpoints": {
+                client_endpoint(ADDRESS): {"data": {"workers": []}, "last_success": "yesterday"}
+            }
+        },
+        {
+            "endpoints": {
+                ENDPOINT_NETWORK: {"data": NETWORK, "last_success": "2024-01-01T00:00:00+00:00"}
+            }
+        },
+        None,
+    ],
+)
+def test_unreadable_snapshot_is_not_restored(snapshot):
+    """A snapshot without readable client data restores nothing."""
+
+    async def test(coordinator):
+        store = coordinator._snapshot_store
+        if snapshot is None:
+            # A corrupt file
+            os.makedirs(os.path.dirname(store.path), exist_ok=True)
+            with open(store.path, "w", encoding="utf-8") as file:
+                file.write('{"version": 1, "data": {"endpoints"')
+        else:
+            await store.async_save(snapshot)
+        assert not await coordinator.async_restore_snapshot()
+        assert coordinator.data is None
+        assert coordinator.endpoints == {}
+
+    asyncio.run(_async_run_with_server(POOL_ROUTES, test))
+
+
+def test_setup_without_snapshot_waits_for_the_server():
+    """Without a snapshot, the entry isn't set up until the server answers."""
+    failing = asyncio.Event()
+    failing.set()
+
+    async def test(coordinator):
+        hass = coordinator.hass
+        hass.data.setdefault(DOMAIN, {})
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="MineMonitor",
+            data=coordinator.config,
+            source="user",
+        )
+        with pytest.raises(ConfigEntryNotReady):
+            await async_setup_entry(hass, entry)
+        assert entry.entry_id not in hass.data[DOMAIN]
+
+    asyncio.run(_async_run_with_server(_failing_routes(failing), test))
+
+
+def test_worker_state_change_over_time_bumps_generation():
+    """Unchanged payloads still notify when workers change state as time passes."""
+    # The static payloads were last seen at midnight
+    midnight = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    async def test(coordinator):
+        with patch.object(dt_util, "utcnow", return_value=midnight + timedelta(minutes=5)):
+            await coordinator.async_refresh()
+        assert set(coordinator.worker_states.values()) == {WORKER_ONLINE}
+        data, generation = coordinator.data, coordinator.generation
+
+        with patch.object(dt_util, "utcnow", return_value=midnight + timedelta(minutes=15)):
+            await coordinator.async_refresh()
+        assert coordinator.last_fetched[client_endpoint(ADDRESS)] is False
+        assert coordinator.data is data
+        assert set(coordinator.worker_states.values()) == {WORKER_WARNING}
+        assert coordinator.generation == generation + 1
+
+        # Nothing changes a few minutes later
+        with patch.object(dt_util, "utcnow", return_value=midnight + timedelta(minutes=20)):
+            await coordinator.async_refresh()
+        assert coordinator.generation == generation + 1
+
+    asyncio.run(_async_run_with_server(POOL_ROUTES, test))
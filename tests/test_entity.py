@@ -0,0 +1,103 @@
+"""Tests of the state write suppression of the MineMonitor entities."""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.minemonitor.entity import MinemonitorEntity  # noqa: E402
+
+
+class _Entity(MinemonitorEntity):
+    """Entity whose state and attributes are set by the test."""
+
+    _state_tolerance = 0.05
+    _volatile_attributes = frozenset({"lastSeen"})
+
+    def __init__(self) -> None:
+        super().__init__(SimpleNamespace(last_update_success=True))
+        self.writes = 0
+        self._attr_state = 100.0
+        self._attr_extra_state_attributes = {"name": "bitaxe", "lastSeen": "12:00"}
+
+    def async_write_ha_state(self) -> None:
+        self.writes += 1
+
+
+def _written(entity):
+    """Run a coordinator update and return whether the state was written."""
+    writes = entity.writes
+    entity._handle_coordinator_update()
+    return entity.writes > writes
+
+
+def test_first_update_writes():
+    """Nothing was written yet, so the first update always writes."""
+    assert _written(_Entity())
+
+
+def test_change_inside_the_deadband_is_not_written():
+    """Moving by at most the tolerance, relative to the last write, is ignored."""
+    entity = _Entity()
+    _written(entity)
+    entity._attr_state = 104.0
+    assert not _written(entity)
+    entity._attr_state = 95.0
+    assert not _written(entity)
+    # The deadband is relative to the last written value, not the last seen one
+    entity._attr_state = 105.0
+    assert not _written(entity)
+
+
+def test_change_outside_the_deadband_is_written():
+    """Moving by more than the tolerance writes, and becomes the new reference."""
+    entity = _Entity()
+    _written(entity)
+    entity._attr_state = 106.0
+    assert _written(entity)
+    entity._attr_state = 110.0
+    assert not _written(entity)
+    entity._attr_state = 94.0
+    assert _written(entity)
+
+
+def test_non_numeric_values_ignore_the_tolerance():
+    """Any change of a value that isn't a number is written."""
+    entity = _Entity()
+    entity._attr_state = "online"
+    _written(entity)
+    entity._attr_state = "offline"
+    assert _written(entity)
+    entity._attr_state = None
+    assert _written(entity)
+
+
+def test_availability_change_alone_is_written():
+    """An entity becoming unavailable or available again writes its state."""
+    entity = _Entity()
+    _written(entity)
+    entity.coordinator.last_update_success = False
+    assert _written(entity)
+    assert not _written(entity)
+    entity.coordinator.last_update_success = True
+    assert _written(entity)
+
+
+def test_volatile_attributes_alone_are_not_written():
+    """Volatile attributes only change along with another change."""
+    entity = _Entity()
+    _written(entity)
+    entity._attr_extra_state_attributes = {"name": "bitaxe", "lastSeen": "12:01"}
+    assert not _written(entity)
+    entity._attr_extra_state_attributes = {"name": "bitaxe 2", "lastSeen": "12:02"}
+    assert _written(entity)
+
+
+def test_without_tolerance_every_change_is_written():
+    """The deadband is off by default."""
+    entity = _Entity()
+    entity._state_tolerance = 0.0
+    _written(entity)
+    entity._attr_state = 100.5
+    assert _written(entity)
+    assert not _written(entity)
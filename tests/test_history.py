@@ -0,0 +1,117 @@
+"""Tests of the in-memory hashrate history."""
+import math
+from array import array
+
+import pytest
+
+from minemonitor.history import HashrateHistory, _decode, _encode, worker_series
+
+WINDOWS = (60, 300)  # seconds
+
+
+def _filled(capacity, samples, keys=("a", "b")):
+    """Return a history with one sample per minute of the given values."""
+    history = HashrateHistory(capacity, WINDOWS)
+    for index in range(samples):
+        history.append(
+            index * 60.0,
+            {key: float(index + offset) for offset, key in enumerate(keys)},
+        )
+    return history
+
+
+def test_window_means():
+    """The means only cover the samples within each window."""
+    history = _filled(10, 6)
+    # The 60 s window holds the last sample, the 300 s one the last five
+    assert history.mean("a", 0) == 5.0
+    assert history.mean("a", 1) == pytest.approx((1 + 2 + 3 + 4 + 5) / 5)
+    assert history.mean("b", 1) == pytest.approx((2 + 3 + 4 + 5 + 6) / 5)
+    assert history.mean("missing", 0) is None
+
+
+def test_missing_samples_are_skipped():
+    """Series missing from a sample, or added later, average what they have."""
+    history = HashrateHistory(10, WINDOWS)
+    history.append(0.0, {"a": 1.0})
+    history.append(60.0, {"b": 4.0})
+    history.append(120.0, {"a": 3.0, "b": 6.0})
+    assert history.mean("a", 1) == pytest.approx(2.0)
+    assert history.mean("b", 1) == pytest.approx(5.0)
+    assert history.samples("b", 0) == [(60.0, 4.0), (120.0, 6.0)]
+    assert len(history) == 3
+    assert history.last_time == 120.0
+
+
+def test_ring_overwrites_oldest_samples():
+    """Samples beyond the capacity replace the oldest ones."""
+    history = _filled(4, 10)
+    assert len(history) == 4
+    assert [value for _, value in history.samples("a", 0)] == [6.0, 7.0, 8.0, 9.0]
+    assert history.mean("a", 1) == pytest.approx((6 + 7 + 8 + 9) / 4)
+
+
+def test_remove_series():
+    """Removed series have no samples nor mean."""
+    history = _filled(10, 3)
+    history.remove("a")
+    assert "a" not in history
+    assert history.mean("a", 0) is None
+    assert history.samples("a", 0) == []
+    assert "b" in history
+
+
+def test_restore_matches_appended_history():
+    """A restored history has the samples and running sums of the original."""
+    original = _filled(20, 15, keys=("a", "b", worker_series("addr", "w1")))
+    original.append(15 * 60.0, {"a": 100.0})
+    restored = HashrateHistory(20, WINDOWS)
+    restored.restore(original.as_dict())
+    for key in ("a", "b", worker_series("addr", "w1")):
+        assert restored.samples(key, 0) == original.samples(key, 0)
+        for window in range(len(WINDOWS)):
+            assert restored.mean(key, window) == pytest.approx(original.mean(key, window))
+    # Appending keeps evicting the right samples
+    for history in (original, restored):
+        history.append(16 * 60.0, {"a": 1.0, "b": 2.0})
+    assert restored.mean("a", 1) == pytest.approx(original.mean("a", 1))
+    assert restored.mean("b", 1) == pytest.approx(original.mean("b", 1))
+
+
+def test_restore_into_smaller_capacity():
+    """Only the newest samples that fit are restored."""
+    original = _filled(20, 12)
+    restored = HashrateHistory(5, WINDOWS)
+    restored.restore(original.as_dict())
+    assert len(restored) == 5
+    assert [value for _, value in restored.samples("a", 0)] == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert restored.mean("a", 1) == pytest.approx((7 + 8 + 9 + 10 + 11) / 5)
+    restored.append(12 * 60.0, {"a": 12.0})
+    assert [value for _, value in restored.samples("a", 0)] == [8.0, 9.0, 10.0, 11.0, 12.0]
+
+
+def test_restore_double_precision_history():
+    """Histories saved with double precision samples are still read."""
+    stored = {
+        "times": _encode(array("d", [0.0, 60.0])),
+        "series": {
+            "a": _encode(array("d", [1.5e12, math.nan])),
+            "empty": _encode(array("d", [math.nan, math.nan])),
+        },
+    }
+    history = HashrateHistory(10, WINDOWS)
+    history.restore(stored)
+    # Samples are kept in single precision
+    assert history.samples("a", 0) == [(0.0, pytest.approx(1.5e12, rel=1e-7))]
+    assert "empty" not in history
+    assert history.as_dict()["typecode"] == "f"
+    assert _decode("f", history.as_dict()["series"]["a"])[0] == pytest.approx(1.5e12, rel=1e-7)
+
+
+def test_restore_empty_history():
+    """A history saved without samples restores to an empty one."""
+    history = HashrateHistory(10, WINDOWS)
+    history.restore(HashrateHistory(10, WINDOWS).as_dict())
+    assert len(history) == 0
+    assert history.last_time is None
+
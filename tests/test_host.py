@@ -0,0 +1,111 @@
+"""Tests of the resources shared per mining server."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from minemonitor.host import PoolHost  # noqa: E402
+from minemonitor.models import FetchResult, FetchTiming  # noqa: E402
+
+
+def test_fetch_receives_cached_result_with_validators():
+    """The second fetch gets the cached result, and a 304 keeps its data."""
+    received = []
+
+    async def fetch(cached):
+        received.append(cached)
+        if cached is None:
+            return FetchResult(
+                data={"blocks": 1},
+                etag='"v1"',
+                last_modified="Mon, 01 Jan 2024 00:00:00 GMT",
+                content_hash=b"hash",
+                timing=FetchTiming(0.01, 100, 0.001),
+            )
+        # What the coordinator does with the cached result
+        assert cached.etag == '"v1"'
+        assert cached.last_modified == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert cached.content_hash == b"hash"
+        return FetchResult(
+            etag=cached.etag,
+            last_modified=cached.last_modified,
+            content_hash=cached.content_hash,
+            not_modified=True,
+            timing=FetchTiming(0.01, 0, 0.0),
+        )
+
+    async def run():
+        host = PoolHost("http://127.0.0.1:3334/api")
+        first = await host.async_fetch("network", fetch, 0)
+        second = await host.async_fetch("network", fetch, 0)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert received[0] is None
+    assert isinstance(received[1], FetchResult)
+    assert received[1].timing is None
+    assert second.data is first.data
+    assert second.timing.size == 0
+
+
+def test_fetch_shares_cache_and_inflight_request():
+    """Callers within the max age, or while a request runs, share it."""
+    calls = 0
+
+    async def fetch(cached):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return FetchResult(data={"calls": calls})
+
+    async def run():
+        host = PoolHost("http://127.0.0.1:3334/api")
+        results = await asyncio.gather(
+            *(host.async_fetch("info", fetch, 60) for _ in range(3))
+        )
+        results.append(await host.async_fetch("info", fetch, 60))
+        return results
+
+    results = asyncio.run(run())
+    assert calls == 1
+    assert all(result.data == {"calls": 1} for result in results)
+
+
+def test_connection_limit_follows_users():
+    """The limit grows with the users, a lingering session is resized."""
+
+    async def run():
+        host = PoolHost("http://127.0.0.1:3334/api", headers={"User-Agent": "test"})
+        assert host.request_limit(8) is None
+        host.users += 1
+        first = host.get_session()
+        assert first.connector.limit == 8
+        assert first.headers["User-Agent"] == "test"
+        # Another user needs more connections, it gets a new session while
+        # the first one is left to finish its requests
+        assert host.request_limit(16) is first
+        assert not first.closed
+        host.users += 1
+        second = host.get_session()
+        assert second.connector.limit == 16
+        await host.async_close_retired(first)
+        assert first.closed
+        # A smaller limit doesn't shrink the session in use
+        assert host.request_limit(4) is None
+        assert host.get_session() is second
+        # A reload with a smaller limit gets a session of its own size
+        host.users = 0
+        assert host.request_limit(4) is second
+        await host.async_close_retired(second)
+        host.users += 1
+        third = host.get_session()
+        assert third.connector.limit == 4
+        # The same limit keeps the lingering session
+        host.users = 0
+        assert host.request_limit(4) is None
+        assert host.get_session() is third
+        await host.async_close()
+        assert third.closed
+
+    asyncio.run(run())
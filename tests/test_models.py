@@ -0,0 +1,104 @@
+"""Tests of the adaptive polling schedule of the endpoints."""
+from datetime import datetime, timedelta, timezone
+
+from minemonitor.models import PollSchedule
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+MINUTE = timedelta(minutes=1)
+
+
+def _schedule(adaptive=True):
+    """Return the schedule of an endpoint polled every minute, up to every 8."""
+    return PollSchedule(MINUTE, 8 * MINUTE, adaptive)
+
+
+def test_new_schedule_is_due_at_the_base_interval():
+    """An endpoint never fetched is due straight away."""
+    schedule = _schedule()
+    assert schedule.interval == MINUTE
+    assert schedule.is_due(NOW)
+
+
+def test_unchanged_data_widens_the_interval_up_to_the_maximum():
+    """Each unchanged response doubles the interval, clamped to max_interval."""
+    schedule = _schedule()
+    intervals = []
+    for _ in range(6):
+        schedule.record(NOW, changed=False)
+        intervals.append(schedule.interval)
+    assert intervals == [2 * MINUTE, 4 * MINUTE, 8 * MINUTE, 8 * MINUTE, 8 * MINUTE, 8 * MINUTE]
+    assert schedule.next_due == NOW + 8 * MINUTE
+    assert not schedule.is_due(NOW + 8 * MINUTE - timedelta(seconds=1))
+    assert schedule.is_due(NOW + 8 * MINUTE)
+
+
+def test_changed_data_resets_the_interval():
+    """A changed response brings the interval back to base_interval."""
+    schedule = _schedule()
+    for _ in range(3):
+        schedule.record(NOW, changed=False)
+    schedule.record(NOW, changed=True)
+    assert schedule.interval == MINUTE
+    assert schedule.next_due == NOW + MINUTE
+
+
+def test_without_adaptive_polling_the_interval_stays_fixed():
+    """Unchanged responses and failures don't slow a fixed schedule down."""
+    schedule = _schedule(adaptive=False)
+    for _ in range(3):
+        schedule.record(NOW, changed=False)
+    assert schedule.interval == MINUTE
+    for _ in range(3):
+        schedule.record_failure(NOW)
+    assert schedule.next_due == NOW + MINUTE
+
+
+def test_max_age_delays_the_next_fetch():
+    """The next fetch waits for the max-age of the response, even past max_interval."""
+    schedule = _schedule()
+    schedule.record(NOW, changed=True, max_age=300)
+    assert schedule.interval == MINUTE
+    assert schedule.next_due == NOW + timedelta(seconds=300)
+    schedule.record(NOW, changed=True, max_age=3600)
+    assert schedule.next_due == NOW + timedelta(hours=1)
+    # A max-age shorter than the interval doesn't bring the fetch forward
+    schedule.record(NOW, changed=True, max_age=10)
+    assert schedule.next_due == NOW + MINUTE
+
+
+def test_failures_back_off_up_to_the_maximum():
+    """Consecutive failures double the retry delay, clamped to max_interval."""
+    schedule = _schedule()
+    for _ in range(3):
+        schedule.record(NOW, changed=False)
+    delays = []
+    for _ in range(6):
+        schedule.record_failure(NOW)
+        delays.append(schedule.next_due - NOW)
+    # The first retry is made at the base interval, whatever the interval was
+    assert delays == [MINUTE, 2 * MINUTE, 4 * MINUTE, 8 * MINUTE, 8 * MINUTE, 8 * MINUTE]
+    assert schedule.interval == MINUTE
+
+
+def test_success_after_failures_polls_at_the_base_interval():
+    """A success ends the backoff, the next failure is retried quickly again."""
+    schedule = _schedule()
+    for _ in range(4):
+        schedule.record_failure(NOW)
+    schedule.record(NOW, changed=True)
+    assert schedule.next_due == NOW + MINUTE
+    schedule.record_failure(NOW)
+    assert schedule.next_due == NOW + MINUTE
+
+
+def test_reset_makes_the_endpoint_due():
+    """A manual refresh fetches every endpoint and forgets the backoff."""
+    schedule = _schedule()
+    schedule.record(NOW, changed=False)
+    schedule.record_failure(NOW)
+    schedule.record_failure(NOW)
+    schedule.reset()
+    assert schedule.interval == MINUTE
+    assert schedule.is_due(NOW)
+    schedule.record_failure(NOW)
+    assert schedule.next_due == NOW + MINUTE
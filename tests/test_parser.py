@@ -0,0 +1,98 @@
+"""Tests of the incremental client payload decoding."""
+import json
+
+import pytest
+
+from minemonitor.parser import ClientPayloadParser, decode_body, project_client
+
+CLIENT = {
+    "bestDifficulty": "123456.78",
+    "workersCount": 3,
+    "workers": [
+        {"name": "bitaxe1", "sessionId": "a1", "hashRate": 512345678901.25, "extra": [1, {"x": None}]},
+        {"name": "bitaxé2", "sessionId": "b2", "hashRate": 1e12, "lastSeen": "2024-01-01T00:00:00Z"},
+        {"name": "skip", "sessionId": "c3", "hashRate": -0.5},
+    ],
+    "nested": {"workers": [1, 2]},
+}
+
+
+def _make_worker(worker):
+    """Keep the name and hashrate of workers, drop the ones named skip."""
+    if worker["name"] == "skip":
+        return None
+    return (worker["name"], worker.get("hashRate"))
+
+
+def _feed(body, chunk_size, batch=False):
+    """Decode a body fed in chunks of the given size."""
+    parser = ClientPayloadParser(_make_worker, batch)
+    for start in range(0, len(body), chunk_size):
+        parser.feed(body[start:start + chunk_size])
+    return parser.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 10_000])
+def test_chunks_decode_like_a_whole_body(chunk_size):
+    """Any chunking, even inside numbers and multi-byte characters, gives the same payload."""
+    body = json.dumps(CLIENT, ensure_ascii=False, indent=1).encode()
+    expected = project_client(json.loads(body), _make_worker)
+    assert _feed(body, chunk_size) == expected
+    assert expected["workers"] == [("bitaxe1", 512345678901.25), ("bitaxé2", 1e12)]
+    # Only the workers array of the client is converted
+    assert expected["nested"] == {"workers": [1, 2]}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 10_000])
+def test_batch_payload(chunk_size):
+    """With batch, every address of the object is a client payload."""
+    payload = {"bc1qa": CLIENT, "bc1qb": {"workers": []}}
+    body = json.dumps(payload).encode()
+    result = _feed(body, chunk_size, batch=True)
+    assert result == ClientPayloadParser(_make_worker, batch=True).project(payload)
+    assert result["bc1qb"] == {"workers": []}
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"",
+        b"[]",
+        b'{"workers": [',
+        b'{"workers": [{"name": "a"}',
+        b'{"a" 1}',
+        b'{"a": 1 "b": 2}',
+        b'{"a": 1}}',
+        b'{"a": tru}',
+        b'{1: 2}',
+        b'{"workers": [{"name": "a"} {"name": "b"}]}',
+    ],
+)
+def test_malformed_payloads_raise_value_error(body):
+    """Truncated or invalid bodies raise ValueError, like json.loads."""
+    with pytest.raises(ValueError):
+        _feed(body, 1)
+    with pytest.raises(ValueError):
+        _feed(body, 10_000)
+
+
+def test_number_at_end_of_chunk_waits_for_more():
+    """A number cut at the end of a chunk isn't decoded until it's complete."""
+    parser = ClientPayloadParser(_make_worker)
+    parser.feed(b'{"bestDifficulty": 12')
+    parser.feed(b'34.5, "workers": []}')
+    assert parser.close() == {"bestDifficulty": 1234.5, "workers": []}
+
+
+def test_decode_body_skips_unchanged_bodies():
+    """A body with the previous hash isn't decoded."""
+    body = json.dumps(CLIENT).encode()
+    content_hash, payload = decode_body(body, None, json.loads, _make_worker)
+    assert payload == project_client(CLIENT, _make_worker)
+
+    def fail(_raw):
+        raise AssertionError("decoded an unchanged body")
+
+    assert decode_body(body, content_hash, fail, _make_worker) == (content_hash, None)
+    other_hash, _ = decode_body(body + b" ", content_hash, json.loads)
+    assert other_hash != content_hash
@@ -0,0 +1,45 @@
+"""Tests of the services of the integration."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.auth import auth_manager_from_config  # noqa: E402
+from homeassistant.auth.const import GROUP_ID_ADMIN, GROUP_ID_USER  # noqa: E402
+from homeassistant.core import Context, HomeAssistant  # noqa: E402
+from homeassistant.exceptions import Unauthorized  # noqa: E402
+from homeassistant.helpers import device_registry as dr  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+
+from custom_components.minemonitor import DOMAIN, async_setup  # noqa: E402
+
+
+def test_refresh_data_requires_an_admin(tmp_path):
+    """Only admins, or calls without a user, may refresh the entries."""
+
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        # The auth store reads the registries
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        hass.auth = await auth_manager_from_config(hass, [], [])
+        admin = await hass.auth.async_create_user("admin", group_ids=[GROUP_ID_ADMIN])
+        user = await hass.auth.async_create_user("user", group_ids=[GROUP_ID_USER])
+        await async_setup(hass, {})
+        try:
+            for context in (Context(), Context(user_id=admin.id)):
+                response = await hass.services.async_call(
+                    DOMAIN, "refresh_data", {}, blocking=True,
+                    context=context, return_response=True,
+                )
+                assert response == {"entries": {}}
+            with pytest.raises(Unauthorized):
+                await hass.services.async_call(
+                    DOMAIN, "refresh_data", {}, blocking=True,
+                    context=Context(user_id=user.id),
+                )
+        finally:
+            await hass.async_stop(force=True)
+
+    asyncio.run(run())
@@ -0,0 +1,66 @@
+"""Tests of the rolling hashrate statistics."""
+import math
+
+import pytest
+
+from minemonitor.stats import RollingStats
+
+
+def test_empty_statistics():
+    """Without samples there is nothing to report."""
+    stats = RollingStats(3600, 900)
+    assert stats.ema is None
+    assert stats.percentile(50) is None
+    assert stats.uptime is None
+
+
+def test_ema_weights_samples_by_elapsed_time():
+    """The EMA starts at the first sample and moves by 1 - exp(-dt / tau)."""
+    stats = RollingStats(3600, 900)
+    stats.add(0, 100.0)
+    assert stats.ema == 100.0
+    stats.add(900, 200.0)
+    expected = 100.0 + (1 - math.exp(-1)) * 100.0
+    assert stats.ema == pytest.approx(expected)
+    # A longer gap moves it closer to the new sample
+    stats.add(900 + 9000, 0.0)
+    assert stats.ema == pytest.approx(expected * math.exp(-10))
+
+
+def test_percentiles_use_nearest_rank():
+    """Percentiles are values of the window, by nearest rank."""
+    stats = RollingStats(3600, 900)
+    for index, value in enumerate([5.0, 1.0, 4.0, 2.0, 3.0]):
+        stats.add(index * 60, value)
+    assert stats.percentile(0) == 1.0
+    assert stats.percentile(5) == 1.0
+    assert stats.percentile(50) == 3.0
+    assert stats.percentile(95) == 5.0
+    assert stats.percentile(100) == 5.0
+
+
+def test_window_drops_old_samples():
+    """Samples older than the window leave the percentiles and the uptime."""
+    stats = RollingStats(300, 60)
+    stats.add(0, 0.0)
+    stats.add(60, 10.0)
+    stats.add(120, 20.0)
+    assert stats.uptime == pytest.approx(200 / 3)
+    assert stats.percentile(0) == 0.0
+    # The sample at 0 is now exactly one window old
+    stats.add(300, 30.0)
+    assert stats.uptime == 100.0
+    assert stats.percentile(0) == 10.0
+    assert stats.percentile(100) == 30.0
+
+
+def test_duplicate_values_are_evicted_once():
+    """Evicting a value repeated in the window only removes one copy."""
+    stats = RollingStats(120, 60)
+    stats.add(0, 5.0)
+    stats.add(60, 5.0)
+    stats.add(120, 7.0)
+    assert stats.percentile(0) == 5.0
+    assert stats.percentile(100) == 7.0
+    stats.add(180, 7.0)
+    assert stats.percentile(0) == 7.0
@@ -0,0 +1,68 @@
+"""Smoke tests of the stub pool server used by the benchmarks."""
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from aiohttp import web  # noqa: E402
+from stub_server import client_payload, create_app  # noqa: E402
+
+
+async def _async_get_all(app, paths):
+    """Serve the app on an ephemeral port and return the status and body of each path."""
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    results = []
+    try:
+        async with aiohttp.ClientSession() as session:
+            for path in paths:
+                async with session.get(f"http://127.0.0.1:{port}{path}") as resp:
+                    body = await resp.json() if resp.status == 200 else None
+                    results.append((resp.status, body))
+    finally:
+        await runner.cleanup()
+    return results
+
+
+def test_stub_serves_every_endpoint():
+    """The per-address, bulk, network and info endpoints answer."""
+    client, clients, network, info = asyncio.run(
+        _async_get_all(
+            create_app(3),
+            [
+                "/api/client/bc1qa",
+                "/api/clients?addresses=bc1qa,bc1qb",
+                "/api/network",
+                "/api/info",
+            ],
+        )
+    )
+    assert client[0] == 200
+    assert client[1]["workersCount"] == 3
+    assert len(client[1]["workers"]) == 3
+    assert clients[0] == 200
+    assert set(clients[1]) == {"bc1qa", "bc1qb"}
+    assert network[0] == 200 and "difficulty" in network[1]
+    assert info[0] == 200 and info[1]["highScores"]
+
+
+def test_stub_without_batch_and_with_errors():
+    """The bulk endpoint can be left out, and every request can fail."""
+    (clients,) = asyncio.run(
+        _async_get_all(create_app(1, batch=False), ["/api/clients?addresses=bc1qa"])
+    )
+    assert clients[0] == 404
+    (client,) = asyncio.run(
+        _async_get_all(create_app(1, error_rate=1.0), ["/api/client/bc1qa"])
+    )
+    assert client[0] == 500
+
+
+def test_static_payloads_are_stable():
+    """Without jitter the same address always gets the same payload."""
+    assert client_payload("bc1qa", 5, jitter=False) == client_payload("bc1qa", 5, jitter=False)
+    assert client_payload("bc1qa", 5, jitter=False) != client_payload("bc1qb", 5, jitter=False)
@@ -0,0 +1,238 @@
+"""Tests of the worker tracking of the coordinator: states and removal."""
+import asyncio
+import tempfile
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.config_entries import ConfigEntries, ConfigEntry  # noqa: E402
+from homeassistant.const import CONF_HOST  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant import loader  # noqa: E402, I100
+from homeassistant.helpers import device_registry as dr  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+from homeassistant.helpers.dispatcher import async_dispatcher_connect  # noqa: E402
+import homeassistant.util.dt as dt_util  # noqa: E402
+
+from custom_components.minemonitor import (  # noqa: E402
+    CONF_BTC_ADDRESSES,
+    CONF_WORKER_OFFLINE_AFTER,
+    CONF_WORKER_REMOVAL_GRACE,
+    CONF_WORKER_WARNING_AFTER,
+    DOMAIN,
+    ENDPOINT_INFO,
+    ENDPOINT_NETWORK,
+    WORKER_OFFLINE,
+    WORKER_ONLINE,
+    WORKER_WARNING,
+    BitcoinMiningUpdateCoordinator,
+    client_endpoint,
+    signal_workers_changed,
+)
+from custom_components.minemonitor.host import PoolHost  # noqa: E402
+from custom_components.minemonitor.models import EndpointStatus  # noqa: E402
+from custom_components.minemonitor.parser import project_client  # noqa: E402
+
+ADDRESS = "bc1qagkj53kpkjndtnng8jxu2v27rnnul2u0052qha"
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _worker(name, seen_ago=None, hashrate=1e12):
+    """Return a worker of a client payload, last seen some time before NOW."""
+    worker = {"name": name, "sessionId": f"id-{name}", "hashRate": hashrate}
+    if seen_ago is not None:
+        worker["lastSeen"] = (NOW - seen_ago).isoformat().replace("+00:00", "Z")
+    return worker
+
+
+def _update(coordinator, workers, now=NOW):
+    """Build the data of the coordinator from a client payload fetched at now."""
+    status = coordinator.endpoints.setdefault(client_endpoint(ADDRESS), EndpointStatus())
+    status.record_success(
+        project_client({"workers": workers}, coordinator._make_worker), now
+    )
+    for endpoint in (ENDPOINT_NETWORK, ENDPOINT_INFO):
+        coordinator.endpoints.setdefault(endpoint, EndpointStatus())
+    with patch.object(dt_util, "utcnow", return_value=now):
+        coordinator.data = coordinator._async_build_data()
+
+
+async def _async_run_with_coordinator(test, options=None):
+    """Run the test with a coordinator of one address that never polls."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        loader.async_setup(hass)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        hass.config_entries = ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+        # The devices need an entry, of an integration that isn't set up
+        entry = ConfigEntry(
+            version=1, minor_version=1, domain="test", title="MineMonitor", data={}, source="user"
+        )
+        await hass.config_entries.async_add(entry)
+        coordinator = BitcoinMiningUpdateCoordinator(
+            hass,
+            {CONF_HOST: "127.0.0.1", CONF_BTC_ADDRESSES: [ADDRESS], **(options or {})},
+            entry_id=entry.entry_id,
+            pool_host=PoolHost("http://127.0.0.1:3334/api"),
+        )
+        try:
+            await test(coordinator)
+        finally:
+            await coordinator.pool_host.async_close()
+            await hass.async_stop(force=True)
+
+
+def test_worker_states_follow_the_thresholds():
+    """Workers are online under 10 minutes, warning under 30, then offline."""
+
+    async def test(coordinator):
+        _update(
+            coordinator,
+            [
+                _worker("fresh", timedelta(0)),
+                _worker("online", timedelta(minutes=10) - timedelta(seconds=1)),
+                _worker("warning", timedelta(minutes=10)),
+                _worker("late", timedelta(minutes=30) - timedelta(seconds=1)),
+                _worker("offline", timedelta(minutes=30)),
+            ],
+        )
+        assert coordinator.worker_states == {
+            (ADDRESS, "fresh"): WORKER_ONLINE,
+            (ADDRESS, "online"): WORKER_ONLINE,
+            (ADDRESS, "warning"): WORKER_WARNING,
+            (ADDRESS, "late"): WORKER_WARNING,
+            (ADDRESS, "offline"): WORKER_OFFLINE,
+        }
+        assert coordinator.worker_state_counts == {
+            ADDRESS: {WORKER_ONLINE: 2, WORKER_WARNING: 2, WORKER_OFFLINE: 1}
+        }
+
+    asyncio.run(_async_run_with_coordinator(test))
+
+
+def test_worker_states_follow_configured_thresholds():
+    """The thresholds are options, in minutes."""
+
+    async def test(coordinator):
+        _update(
+            coordinator,
+            [_worker("a", timedelta(minutes=2)), _worker("b", timedelta(minutes=5))],
+        )
+        assert coordinator.worker_states == {
+            (ADDRESS, "a"): WORKER_WARNING,
+            (ADDRESS, "b"): WORKER_OFFLINE,
+        }
+
+    asyncio.run(
+        _async_run_with_coordinator(
+            test, {CONF_WORKER_WARNING_AFTER: 1, CONF_WORKER_OFFLINE_AFTER: 5}
+        )
+    )
+
+
+def test_workers_without_last_seen_use_their_hashrate():
+    """Without a readable lastSeen, a worker is online while it has a hashrate."""
+
+    async def test(coordinator):
+        hashing = _worker("hashing")
+        idle = _worker("idle", hashrate=0)
+        unknown = _worker("unknown", hashrate=None)
+        unreadable = {**_worker("unreadable"), "lastSeen": "yesterday"}
+        _update(coordinator, [hashing, idle, unknown, unreadable])
+        assert coordinator.worker_states == {
+            (ADDRESS, "hashing"): WORKER_ONLINE,
+            (ADDRESS, "idle"): WORKER_OFFLINE,
+            (ADDRESS, "unknown"): WORKER_OFFLINE,
+            (ADDRESS, "unreadable"): WORKER_ONLINE,
+        }
+
+    asyncio.run(_async_run_with_coordinator(test))
+
+
+def test_workers_gone_from_the_pool_are_offline():
+    """A worker the pool stopped reporting is offline, and counted as such."""
+
+    async def test(coordinator):
+        _update(coordinator, [_worker("a", timedelta(0)), _worker("b", timedelta(0))])
+        assert coordinator.worker_state_counts[ADDRESS][WORKER_ONLINE] == 2
+
+        _update(coordinator, [_worker("a", timedelta(0))])
+        assert coordinator.worker_states[(ADDRESS, "b")] == WORKER_OFFLINE
+        assert coordinator.worker_state_counts == {
+            ADDRESS: {WORKER_ONLINE: 1, WORKER_WARNING: 0, WORKER_OFFLINE: 1}
+        }
+        summary = coordinator.worker_summary(ADDRESS)
+        assert summary["workers_offline"] == 1
+        assert {"key": "b", "name": "b", "status": WORKER_OFFLINE, "hashrate": None,
+                "best_difficulty": None, "last_seen": None} in summary["workers"]
+
+    asyncio.run(_async_run_with_coordinator(test))
+
+
+def test_gone_workers_are_removed_after_the_grace_period():
+    """A gone worker keeps its device and entities until the grace period expires."""
+    deltas = []
+
+    async def test(coordinator):
+        hass = coordinator.hass
+        async_dispatcher_connect(
+            hass, signal_workers_changed(coordinator.entry_id), deltas.append
+        )
+        device_registry = dr.async_get(hass)
+        entity_registry = er.async_get(hass)
+        entry = hass.config_entries.async_get_entry(coordinator.entry_id)
+        devices = {}
+        for key in ("a", "b", "c"):
+            devices[key] = device_registry.async_get_or_create(
+                config_entry_id=entry.entry_id,
+                identifiers={(DOMAIN, coordinator.worker_device_identifier(ADDRESS, key))},
+            )
+            entity_registry.async_get_or_create(
+                "sensor", DOMAIN, f"{ADDRESS}_{key}_hashrate",
+                config_entry=entry, device_id=devices[key].id,
+            )
+
+        def tick(minutes, workers):
+            now = NOW + timedelta(minutes=minutes)
+            _update(coordinator, [_worker(name, timedelta(0)) for name in workers], now)
+            with patch.object(dt_util, "utcnow", return_value=now):
+                coordinator._async_expire_workers()
+                coordinator._async_update_worker_states()
+
+        tick(0, "abc")
+        # b and c disappear, c comes back and leaves again
+        tick(10, "a")
+        tick(40, "ac")
+        tick(50, "a")
+        tick(59, "a")
+        await hass.async_block_till_done()
+        assert deltas == []
+        assert coordinator.worker_states[(ADDRESS, "b")] == WORKER_OFFLINE
+        assert device_registry.async_get(devices["b"].id) is not None
+
+        # b was last reported an hour ago
+        tick(61, "a")
+        await hass.async_block_till_done()
+        assert [delta.removed for delta in deltas] == [{(ADDRESS, "b")}]
+        assert (ADDRESS, "b") not in coordinator.worker_states
+        assert device_registry.async_get(devices["b"].id) is None
+        assert entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{ADDRESS}_b_hashrate"
+        ) is None
+        # The grace period of c started over when it came back
+        assert coordinator.worker_states[(ADDRESS, "c")] == WORKER_OFFLINE
+        assert device_registry.async_get(devices["c"].id) is not None
+
+        tick(101, "a")
+        await hass.async_block_till_done()
+        assert [delta.removed for delta in deltas] == [{(ADDRESS, "b")}, {(ADDRESS, "c")}]
+        assert device_registry.async_get(devices["c"].id) is None
+        assert device_registry.async_get(devices["a"].id) is not None
+        assert coordinator.worker_states.keys() == {(ADDRESS, "a")}
+
+    asyncio.run(_async_run_with_coordinator(test, {CONF_WORKER_REMOVAL_GRACE: 1}))
@@ -12,6 +12,8 @@ class MineMonitorServerCard extends HTMLElement {
     super();
     this._hass = null;
     this._config = null;
+    this._renderKey = null;
+    this._elements = null;
     this.attachShadow({ mode: 'open' });
   }
 
@@ -26,13 +28,18 @@ class MineMonitorServerCard extends HTMLElement {
     if (!config.address) {
       throw new Error('You need to define a bitcoin address');
     }
-    if (!config.workers_count_entity) {
-      throw new Error('You need to define a workers_count_entity');
-    }
-    if (!config.best_difficulty_entity) {
-      throw new Error('You need to define a best_difficulty_entity');
+    // The summary entity replaces the individual entities
+    if (!config.summary_entity) {
+      if (!config.workers_count_entity) {
+        throw new Error('You need to define a summary_entity or a workers_count_entity');
+      }
+      if (!config.best_difficulty_entity) {
+        throw new Error('You need to define a summary_entity or a best_difficulty_entity');
+      }
     }
     this._config = config;
+    this._renderKey = null;
+    this._elements = null;
     this._updateContent();
   }
 
@@ -63,14 +70,27 @@ class MineMonitorServerCard extends HTMLElement {
     let totalHashrate = 0;
     this._config.worker_hashrate_entities.forEach(entity => {
       const state = this._hass.states[entity];
-      if (state && !isNaN(state.state)) {
-        totalHashrate += parseFloat(state.state);
+      if (state) {
+        totalHashrate += this._toHashesPerSecond(state);
       }
     });
     
     return totalHashrate;
   }
 
+  // Convert the state of a hash rate sensor to H/s using its unit
+  _toHashesPerSecond(stateObj) {
+    const value = parseFloat(stateObj.state);
+    if (isNaN(value)) return 0;
+    const scales = {
+      'H/s': 1, 'KH/s': 1e3, 'kH/s': 1e3, 'MH/s': 1e6, 'GH/s': 1e9,
+      'TH/s': 1e12, 'PH/s': 1e15, 'EH/s': 1e18
+    };
+    // The hash rate sensors of the integration report TH/s
+    const scale = scales[stateObj.attributes.unit_of_measurement];
+    return value * (scale !== undefined ? scale : 1e12);
+  }
+
   // Format hashrate
   _formatHashRate(hashrate) {
     if (!hashrate) return '0 H/s';
@@ -89,6 +109,19 @@ class MineMonitorServerCard extends HTMLElement {
 
   // Get worker status data
   _getWorkerStatusData() {
+    // Counts computed by the integration on every refresh
+    if (this._config.workers_online_entity || this._config.workers_warning_entity || this._config.workers_offline_entity) {
+      const count = (entity) => {
+        const state = entity && this._hass.states[entity];
+        return state && !isNaN(state.state) ? parseInt(state.state, 10) : 0;
+      };
+      return {
+        online: count(this._config.workers_online_entity),
+        warning: count(this._config.workers_warning_entity),
+        offline: count(this._config.workers_offline_entity)
+      };
+    }
+
     if (!this._config.worker_hashrate_entities || !Array.isArray(this._config.worker_hashrate_entities)) {
       return { online: 0, warning: 0, offline: 0 };
     }
@@ -99,9 +132,10 @@ class MineMonitorServerCard extends HTMLElement {
       const state = this._hass.states[entity];
       if (!state) return;
       
-      // Check if the worker has a last_seen attribute
-      if (state.attributes.last_seen) {
-        const lastSeen = new Date(state.attributes.last_seen);
+      // Check if the worker has a lastSeen attribute
+      const lastSeenAttr = state.attributes.lastSeen || state.attributes.last_seen;
+      if (lastSeenAttr) {
+        const lastSeen = new Date(lastSeenAttr);
         const now = new Date();
         const diffMs = now - lastSeen;
         const diffMins = Math.floor(diffMs / 60000);
@@ -114,7 +148,7 @@ class MineMonitorServerCard extends HTMLElement {
           statusData.offline++;
         }
       } else if (state.state && parseFloat(state.state) > 0) {
-        // If no last_seen attribute, but hashrate is positive, consider online
+        // If no lastSeen attribute, but hashrate is positive, consider online
         statusData.online++;
       } else {
         statusData.offline++;
@@ -124,58 +158,68 @@ class MineMonitorServerCard extends HTMLElement {
     return statusData;
   }
 
-  // Update card content
-  _updateContent() {
-    if (!this._hass || !this._config) {
-      return;
+  // Entities read by the card
+  _watchedEntities() {
+    const config = this._config;
+    if (config.summary_entity) {
+      return [config.summary_entity, config.network_difficulty_entity, config.network_blocks_entity];
     }
+    return [
+      config.workers_count_entity,
+      config.best_difficulty_entity,
+      ...(Array.isArray(config.worker_hashrate_entities) ? config.worker_hashrate_entities : []),
+      config.workers_online_entity,
+      config.workers_warning_entity,
+      config.workers_offline_entity,
+      config.network_difficulty_entity,
+      config.network_blocks_entity
+    ].filter(entity => entity);
+  }
 
-    const address = this._config.address;
-    const workersCountEntity = this._config.workers_count_entity;
-    const bestDifficultyEntity = this._config.best_difficulty_entity;
-    
-    const workersCountState = this._hass.states[workersCountEntity];
-    const bestDifficultyState = this._hass.states[bestDifficultyEntity];
-    
-    if (!workersCountState || !bestDifficultyState) {
-      this.shadowRoot.innerHTML = `
-        <ha-card>
-          <div class="card-content">
-            <div class="not-found">Server entities not found</div>
-          </div>
-        </ha-card>
-      `;
-      return;
-    }
-    
-    // Get server data
-    const title = this._config.title || `Mining Address: ${address}`;
-    const workersCount = workersCountState.state;
-    const bestDifficulty = this._formatDifficulty(bestDifficultyState.state);
-    const totalHashrate = this._calculateTotalHashrate();
-    const formattedHashrate = this._formatHashRate(totalHashrate);
-    
-    // Get worker status
-    const workerStatus = this._getWorkerStatusData();
-    
-    // Get network entity if provided
-    let networkDifficulty = null;
-    let networkBlocks = null;
-    
-    if (this._config.network_difficulty_entity) {
-      const networkDiffState = this._hass.states[this._config.network_difficulty_entity];
-      if (networkDiffState) {
-        networkDifficulty = parseFloat(networkDiffState.state).toLocaleString();
-      }
-    }
+  // Last update of every entity read by the card
+  _getRenderKey() {
+    return this._watchedEntities()
+      .map(entity => {
+        const state = entity && this._hass.states[entity];
+        return state ? state.last_updated : '';
+      })
+      .join('|');
+  }
+
+  // Get the server data from the summary entity of the address
+  _getSummaryData() {
+    const summaryState = this._hass.states[this._config.summary_entity];
+    if (!summaryState) return null;
     
-    if (this._config.network_blocks_entity) {
-      const networkBlocksState = this._hass.states[this._config.network_blocks_entity];
-      if (networkBlocksState) {
-        networkBlocks = networkBlocksState.state;
+    const attributes = summaryState.attributes;
+    return {
+      workersCount: summaryState.state,
+      hashrate: attributes.total_hashrate,
+      bestDifficulty: attributes.best_difficulty,
+      workerStatus: {
+        online: attributes.workers_online || 0,
+        warning: attributes.workers_warning || 0,
+        offline: attributes.workers_offline || 0
       }
-    }
+    };
+  }
+
+  // Get the server data from the individual entities
+  _getEntitiesData() {
+    const workersCountState = this._hass.states[this._config.workers_count_entity];
+    const bestDifficultyState = this._hass.states[this._config.best_difficulty_entity];
+    if (!workersCountState || !bestDifficultyState) return null;
     
+    return {
+      workersCount: workersCountState.state,
+      hashrate: this._calculateTotalHashrate(),
+      bestDifficulty: bestDifficultyState.state,
+      workerStatus: this._getWorkerStatusData()
+    };
+  }
+
+  // Build the elements of the card once, updates only change their text
+  _buildCard() {
     this.shadowRoot.innerHTML = `
       <ha-card>
         <style>
@@ -270,57 +314,146 @@ class MineMonitorServerCard extends HTMLElement {
         </style>
         
         <div class="card-header">
-          <div class="card-title">${title}</div>
-          <div class="address">${address}</div>
+          <div class="card-title"></div>
+          <div class="address"></div>
         </div>
         
         <div class="card-content">
           <div class="main-stats">
             <div class="stat-box">
-              <div class="stat-value">${workersCount}</div>
+              <div class="stat-value workers-count"></div>
               <div class="stat-label">Workers</div>
             </div>
             <div class="stat-box">
-              <div class="stat-value">${formattedHashrate}</div>
+              <div class="stat-value total-hashrate"></div>
               <div class="stat-label">Total Hashrate</div>
             </div>
             <div class="stat-box">
-              <div class="stat-value">${bestDifficulty}</div>
+              <div class="stat-value best-difficulty"></div>
               <div class="stat-label">Best Difficulty</div>
             </div>
           </div>
           
           <div class="status-grid">
             <div class="status-box online">
-              <div>${workerStatus.online} Online</div>
+              <div class="online-count"></div>
             </div>
             <div class="status-box warning">
-              <div>${workerStatus.warning} Warning</div>
+              <div class="warning-count"></div>
             </div>
             <div class="status-box offline">
-              <div>${workerStatus.offline} Offline</div>
+              <div class="offline-count"></div>
             </div>
           </div>
           
-          ${(networkDifficulty || networkBlocks) ? `
           <div class="network-info">
-            ${networkDifficulty ? `
-            <div class="network-box">
+            <div class="network-box network-difficulty-box">
               <div class="network-label">Network Difficulty</div>
-              <div class="network-value">${networkDifficulty}</div>
+              <div class="network-value network-difficulty"></div>
             </div>
-            ` : ''}
-            ${networkBlocks ? `
-            <div class="network-box">
+            <div class="network-box network-blocks-box">
               <div class="network-label">Block Height</div>
-              <div class="network-value">${networkBlocks}</div>
+              <div class="network-value network-blocks"></div>
             </div>
-            ` : ''}
           </div>
-          ` : ''}
         </div>
       </ha-card>
     `;
+    
+    const root = this.shadowRoot;
+    this._elements = {};
+    [
+      'card-title', 'address', 'workers-count', 'total-hashrate', 'best-difficulty',
+      'online-count', 'warning-count', 'offline-count', 'network-info',
+      'network-difficulty-box', 'network-difficulty', 'network-blocks-box', 'network-blocks'
+    ].forEach(name => {
+      this._elements[name] = root.querySelector(`.${name}`);
+    });
+  }
+
+  // Change the text of an element only when it differs
+  _setText(name, text) {
+    const element = this._elements[name];
+    if (element.textContent !== text) {
+      element.textContent = text;
+    }
+  }
+
+  // Show or hide an element
+  _setVisible(name, visible) {
+    const display = visible ? '' : 'none';
+    const element = this._elements[name];
+    if (element.style.display !== display) {
+      element.style.display = display;
+    }
+  }
+
+  // Update card content
+  _updateContent() {
+    if (!this._hass || !this._config) {
+      return;
+    }
+
+    // Other entities changing doesn't change the card
+    const renderKey = this._getRenderKey();
+    if (renderKey === this._renderKey) {
+      return;
+    }
+    this._renderKey = renderKey;
+
+    const data = this._config.summary_entity ? this._getSummaryData() : this._getEntitiesData();
+    
+    if (!data) {
+      this._elements = null;
+      this.shadowRoot.innerHTML = `
+        <ha-card>
+          <div class="card-content">
+            <div class="not-found">Server entities not found</div>
+          </div>
+        </ha-card>
+      `;
+      return;
+    }
+    
+    if (!this._elements) {
+      this._buildCard();
+    }
+    
+    // Get server data
+    const address = this._config.address;
+    const title = this._config.title || `Mining Address: ${address}`;
+    
+    // Get network entity if provided
+    let networkDifficulty = null;
+    let networkBlocks = null;
+    
+    if (this._config.network_difficulty_entity) {
+      const networkDiffState = this._hass.states[this._config.network_difficulty_entity];
+      if (networkDiffState) {
+        networkDifficulty = parseFloat(networkDiffState.state).toLocaleString();
+      }
+    }
+    
+    if (this._config.network_blocks_entity) {
+      const networkBlocksState = this._hass.states[this._config.network_blocks_entity];
+      if (networkBlocksState) {
+        networkBlocks = networkBlocksState.state;
+      }
+    }
+    
+    this._setText('card-title', title);
+    this._setText('address', address);
+    this._setText('workers-count', String(data.workersCount));
+    this._setText('total-hashrate', this._formatHashRate(data.hashrate));
+    this._setText('best-difficulty', this._formatDifficulty(data.bestDifficulty));
+    this._setText('online-count', `${data.workerStatus.online} Online`);
+    this._setText('warning-count', `${data.workerStatus.warning} Warning`);
+    this._setText('offline-count', `${data.workerStatus.offline} Offline`);
+    this._setText('network-difficulty', networkDifficulty || '');
+    this._setText('network-blocks', networkBlocks || '');
+    this._setVisible('network-difficulty-box', Boolean(networkDifficulty));
+    this._setVisible('network-blocks-box', Boolean(networkBlocks));
+    this._setVisible('network-info', Boolean(networkDifficulty || networkBlocks));
   }
 }
 
@@ -12,6 +12,10 @@ class MineMonitorWorkerCard extends HTMLElement {
     super();
     this._hass = null;
     this._config = null;
+    this._renderKey = null;
+    this._elements = null;
+    this._lastSeen = null;
+    this._timer = null;
     this.attachShadow({ mode: 'open' });
   }
 
@@ -21,18 +25,39 @@ class MineMonitorWorkerCard extends HTMLElement {
     this._updateContent();
   }
 
+  // "Last seen" is relative to now, so it's refreshed even without a new state
+  connectedCallback() {
+    if (!this._timer) {
+      this._timer = setInterval(() => this._updateLastSeen(), 60000);
+    }
+  }
+
+  disconnectedCallback() {
+    clearInterval(this._timer);
+    this._timer = null;
+  }
+
   // Set card configuration
   setConfig(config) {
-    if (!config.worker_entity) {
-      throw new Error('You need to define a worker_entity');
-    }
-    if (!config.hashrate_entity) {
-      throw new Error('You need to define a hashrate_entity');
-    }
-    if (!config.difficulty_entity) {
-      throw new Error('You need to define a difficulty_entity');
+    // The summary entity of the address replaces the individual entities
+    if (config.summary_entity) {
+      if (!config.worker) {
+        throw new Error('You need to define the worker to show from the summary_entity');
+      }
+    } else {
+      if (!config.worker_entity) {
+        throw new Error('You need to define a worker_entity');
+      }
+      if (!config.hashrate_entity) {
+        throw new Error('You need to define a hashrate_entity');
+      }
+      if (!config.difficulty_entity) {
+        throw new Error('You need to define a difficulty_entity');
+      }
     }
     this._config = config;
+    this._renderKey = null;
+    this._elements = null;
     this._updateContent();
   }
 
@@ -41,6 +66,19 @@ class MineMonitorWorkerCard extends HTMLElement {
     return 3;
   }
 
+  // Convert the state of a hash rate sensor to H/s using its unit
+  _toHashesPerSecond(stateObj) {
+    const value = parseFloat(stateObj.state);
+    if (isNaN(value)) return 0;
+    const scales = {
+      'H/s': 1, 'KH/s': 1e3, 'kH/s': 1e3, 'MH/s': 1e6, 'GH/s': 1e9,
+      'TH/s': 1e12, 'PH/s': 1e15, 'EH/s': 1e18
+    };
+    // The hash rate sensors of the integration report TH/s
+    const scale = scales[stateObj.attributes.unit_of_measurement];
+    return value * (scale !== undefined ? scale : 1e12);
+  }
+
   // Calculate human-readable hash rate
   _formatHashRate(hashrate) {
     if (!hashrate) return '0 H/s';
@@ -76,6 +114,16 @@ class MineMonitorWorkerCard extends HTMLElement {
     return `${diffDays} day${diffDays > 1 ? 's' : ''} ago`;
   }
 
+  // Get worker status class from the status computed by the integration
+  _getStatusClassFromEntity(statusState) {
+    const classes = {
+      online: 'status-active',
+      warning: 'status-warning',
+      offline: 'status-offline'
+    };
+    return classes[statusState.attributes.status] || 'status-unknown';
+  }
+
   // Get worker status class
   _getStatusClass(lastSeenStr) {
     if (!lastSeenStr) return 'status-unknown';
@@ -90,43 +138,79 @@ class MineMonitorWorkerCard extends HTMLElement {
     return 'status-offline';
   }
 
-  // Update card content
-  _updateContent() {
-    if (!this._hass || !this._config) {
-      return;
+  // Entities read by the card
+  _watchedEntities() {
+    const config = this._config;
+    if (config.summary_entity) {
+      return [config.summary_entity];
     }
+    return [
+      config.worker_entity,
+      config.hashrate_entity,
+      config.difficulty_entity,
+      config.status_entity
+    ].filter(entity => entity);
+  }
 
-    const workerEntity = this._config.worker_entity;
-    const hashrateEntity = this._config.hashrate_entity;
-    const difficultyEntity = this._config.difficulty_entity;
-    
-    const workerState = this._hass.states[workerEntity];
-    const hashrateState = this._hass.states[hashrateEntity];
-    const difficultyState = this._hass.states[difficultyEntity];
-    
-    if (!workerState || !hashrateState || !difficultyState) {
-      this.shadowRoot.innerHTML = `
-        <ha-card>
-          <div class="card-content">
-            <div class="not-found">Worker entities not found</div>
-          </div>
-        </ha-card>
-      `;
-      return;
-    }
+  // Last update of every entity read by the card
+  _getRenderKey() {
+    return this._watchedEntities()
+      .map(entity => {
+        const state = this._hass.states[entity];
+        return state ? state.last_updated : '';
+      })
+      .join('|');
+  }
+
+  // Get the worker data from the summary entity of its address
+  _getSummaryData() {
+    const summaryState = this._hass.states[this._config.summary_entity];
+    if (!summaryState || !Array.isArray(summaryState.attributes.workers)) return null;
     
-    // Get worker data
-    const workerName = this._config.title || workerState.attributes.worker_name || 'Worker';
-    const hashrate = this._formatHashRate(hashrateState.state);
-    const difficulty = parseFloat(difficultyState.state).toLocaleString();
-    const lastSeen = workerState.attributes.last_seen;
-    const timeSince = this._formatTimeSince(lastSeen);
-    const statusClass = this._getStatusClass(lastSeen);
+    const worker = summaryState.attributes.workers.find(
+      item => item.key === this._config.worker || item.name === this._config.worker
+    );
+    if (!worker) return null;
     
-    // Calculate percentage of hashrate compared to max value
-    const maxHashrate = this._config.max_hashrate || 1000000000000; // 1 TH/s default
-    const hashratePercent = Math.min(100, (parseFloat(hashrateState.state) / maxHashrate) * 100);
+    const statusClasses = {
+      online: 'status-active',
+      warning: 'status-warning',
+      offline: 'status-offline'
+    };
+    return {
+      name: worker.name,
+      hashrate: worker.hashrate,
+      difficulty: worker.best_difficulty,
+      lastSeen: worker.last_seen,
+      statusClass: statusClasses[worker.status] || 'status-unknown',
+      statusFromLastSeen: false
+    };
+  }
+
+  // Get the worker data from the individual entities
+  _getEntitiesData() {
+    const workerState = this._hass.states[this._config.worker_entity];
+    const hashrateState = this._hass.states[this._config.hashrate_entity];
+    const difficultyState = this._hass.states[this._config.difficulty_entity];
+    if (!workerState || !hashrateState || !difficultyState) return null;
     
+    // Worker fields are only added to the hash rate sensor by default
+    const lastSeen = workerState.attributes.lastSeen || hashrateState.attributes.lastSeen;
+    const statusState = this._config.status_entity ? this._hass.states[this._config.status_entity] : null;
+    return {
+      name: workerState.attributes.worker_name,
+      hashrate: this._toHashesPerSecond(hashrateState),
+      difficulty: difficultyState.state,
+      lastSeen: lastSeen,
+      statusClass: statusState
+        ? this._getStatusClassFromEntity(statusState)
+        : this._getStatusClass(lastSeen),
+      statusFromLastSeen: !statusState
+    };
+  }
+
+  // Build the elements of the card once, updates only change their content
+  _buildCard() {
     this.shadowRoot.innerHTML = `
       <ha-card>
         <style>
@@ -191,7 +275,7 @@ class MineMonitorWorkerCard extends HTMLElement {
           .hashrate-fill {
             height: 100%;
             background-color: var(--primary-color);
-            width: ${hashratePercent}%;
+            width: 0%;
             transition: width 0.5s ease-in-out;
           }
           .last-seen {
@@ -203,10 +287,10 @@ class MineMonitorWorkerCard extends HTMLElement {
         </style>
         
         <div class="card-header">
-          <div class="worker-name">${workerName}</div>
+          <div class="worker-name"></div>
           <div class="status-indicator">
-            <div class="status-dot ${statusClass}"></div>
-            <div>${statusClass === 'status-active' ? 'Online' : statusClass === 'status-warning' ? 'Warning' : 'Offline'}</div>
+            <div class="status-dot"></div>
+            <div class="status-text"></div>
           </div>
         </div>
         
@@ -214,11 +298,11 @@ class MineMonitorWorkerCard extends HTMLElement {
           <div class="stats-grid">
             <div class="stat-item">
               <div class="stat-label">Hash Rate</div>
-              <div class="stat-value">${hashrate}</div>
+              <div class="stat-value hashrate"></div>
             </div>
             <div class="stat-item">
               <div class="stat-label">Best Difficulty</div>
-              <div class="stat-value">${difficulty}</div>
+              <div class="stat-value difficulty"></div>
             </div>
           </div>
           
@@ -226,10 +310,104 @@ class MineMonitorWorkerCard extends HTMLElement {
             <div class="hashrate-fill"></div>
           </div>
           
-          <div class="last-seen">Last seen: ${timeSince}</div>
+          <div class="last-seen"></div>
         </div>
       </ha-card>
     `;
+    
+    const root = this.shadowRoot;
+    this._elements = {};
+    ['worker-name', 'status-dot', 'status-text', 'hashrate', 'difficulty', 'hashrate-fill', 'last-seen']
+      .forEach(name => {
+        this._elements[name] = root.querySelector(`.${name}`);
+      });
+  }
+
+  // Change the text of an element only when it differs
+  _setText(name, text) {
+    const element = this._elements[name];
+    if (element.textContent !== text) {
+      element.textContent = text;
+    }
+  }
+
+  // Change the status dot and text
+  _setStatus(statusClass) {
+    const statusText = {
+      'status-active': 'Online',
+      'status-warning': 'Warning',
+      'status-offline': 'Offline'
+    }[statusClass] || 'Unknown';
+    this._setText('status-text', statusText);
+    const statusDot = this._elements['status-dot'];
+    if (statusDot.className !== `status-dot ${statusClass}`) {
+      statusDot.className = `status-dot ${statusClass}`;
+    }
+  }
+
+  // Refresh the time since the worker was last seen, and the status derived from it
+  _updateLastSeen() {
+    if (!this._elements || !this._lastSeen) return;
+    const { lastSeen, statusFromLastSeen } = this._lastSeen;
+    this._setText('last-seen', `Last seen: ${this._formatTimeSince(lastSeen)}`);
+    if (statusFromLastSeen) {
+      this._setStatus(this._getStatusClass(lastSeen));
+    }
+  }
+
+  // Update card content
+  _updateContent() {
+    if (!this._hass || !this._config) {
+      return;
+    }
+
+    // Other entities changing doesn't change the card
+    const renderKey = this._getRenderKey();
+    if (renderKey === this._renderKey) {
+      this._updateLastSeen();
+      return;
+    }
+    this._renderKey = renderKey;
+
+    const data = this._config.summary_entity ? this._getSummaryData() : this._getEntitiesData();
+    
+    if (!data) {
+      this._elements = null;
+      this._lastSeen = null;
+      this.shadowRoot.innerHTML = `
+        <ha-card>
+          <div class="card-content">
+            <div class="not-found">Worker entities not found</div>
+          </div>
+        </ha-card>
+      `;
+      return;
+    }
+    
+    if (!this._elements) {
+      this._buildCard();
+    }
+    
+    // Get worker data
+    const workerName = this._config.title || data.name || 'Worker';
+    const hashrate = this._formatHashRate(data.hashrate);
+    const difficulty = parseFloat(data.difficulty).toLocaleString();
+    
+    // Calculate percentage of hashrate compared to max value
+    const maxHashrate = this._config.max_hashrate || 1000000000000; // 1 TH/s default
+    const hashratePercent = Math.min(100, (parseFloat(data.hashrate) / maxHashrate) * 100) || 0;
+    
+    this._setText('worker-name', workerName);
+    this._setText('hashrate', hashrate);
+    this._setText('difficulty', difficulty);
+    this._setStatus(data.statusClass);
+    this._lastSeen = { lastSeen: data.lastSeen, statusFromLastSeen: data.statusFromLastSeen };
+    this._updateLastSeen();
+    
+    const hashrateFill = this._elements['hashrate-fill'];
+    if (hashrateFill.style.width !== `${hashratePercent}%`) {
+      hashrateFill.style.width = `${hashratePercent}%`;
+    }
   }
 }
 